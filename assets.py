@@ -0,0 +1,110 @@
+"""
+Module: assets
+Loads the game's image files once and hands out shared, display-converted surfaces.
+
+Modules declare the images they use when imported; preload() loads the declared ones on a
+background thread (decoding and scaling run outside the GIL), so by the time the game asks for
+them, e.g. when entering a station, they are a dictionary lookup. Anything not loaded yet is
+loaded on demand instead.
+
+Relative paths are resolved against the game folder, whatever the working directory.
+"""
+
+import os
+import threading
+import pygame
+
+ROOT = os.path.dirname(os.path.abspath(__file__))  # Game folder, relative asset paths start here
+
+
+def _key(path, size, alpha):
+    """Cache key of an image: its resolved path, target size and alpha mode."""
+    return (os.path.normpath(os.path.join(ROOT, path)), tuple(size) if size else None, alpha)
+
+
+class AssetManager:
+    def __init__(self):
+        """Initialize an empty manager; nothing is loaded until requested or preloaded."""
+        self.images = {}      # (path, size, alpha) -> converted Surface
+        self.manifest = []    # Declared (path, size, alpha) keys, in declaration order
+        self.lock = threading.Lock()  # Held while an image loads, so it is never loaded twice
+        self.thread = None
+        self.preloaded = 0
+        self.loaded_on_demand = 0
+
+    def declare(self, path, size=None, alpha=True):
+        """
+        Declare an image to be preloaded; the arguments are those of image().
+
+        :param path: Image file path, absolute or relative to the game folder.
+        :param size: Size the image is scaled to, or None to keep its own.
+        :param alpha: Keep per-pixel alpha (convert_alpha) or not (convert, faster to blit).
+        """
+        key = _key(path, size, alpha)
+        if key not in self.manifest:
+            self.manifest.append(key)
+
+    def image(self, path, size=None, alpha=True):
+        """
+        Return the shared surface of an image, loading it if it is not loaded yet.
+
+        Callers must not draw on the returned surface; copy it first.
+
+        :param path: Image file path, absolute or relative to the game folder.
+        :param size: Size the image is scaled to, or None to keep its own.
+        :param alpha: Keep per-pixel alpha (convert_alpha) or not (convert, faster to blit).
+        :return: pygame.Surface converted to the display format.
+        """
+        key = _key(path, size, alpha)
+        image = self.images.get(key)
+        if image is None:
+            image = self._load(key, on_demand=True)
+        return image
+
+    def _load(self, key, on_demand=False):
+        with self.lock:
+            image = self.images.get(key)
+            if image is None:
+                path, size, alpha = key
+                image = pygame.image.load(path)
+                if size is not None and image.get_size() != size:
+                    image = pygame.transform.scale(image, size)
+                image = image.convert_alpha() if alpha else image.convert()
+                self.images[key] = image
+                if on_demand:
+                    self.loaded_on_demand += 1
+                else:
+                    self.preloaded += 1
+            return image
+
+    def preload(self):
+        """
+        Start loading the declared images on a background thread.
+
+        Needs the display to be open, as the images are converted to its format.
+        """
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._preload_loop, daemon=True)
+            self.thread.start()
+
+    def _preload_loop(self):
+        for key in list(self.manifest):
+            try:
+                self._load(key)
+            except (pygame.error, OSError) as e:
+                # Reported again if the game asks for the image
+                print(f"Could not preload {key[0]}: {e}")
+
+    def wait(self):
+        """Wait until the preload thread has finished."""
+        if self.thread is not None:
+            self.thread.join()
+
+    def stats(self):
+        """Return the number of images loaded, declared and loaded by each path."""
+        return {"images": len(self.images), "declared": len(self.manifest), "preloaded": self.preloaded,
+                "loaded_on_demand": self.loaded_on_demand}
+
+
+# Shared asset manager for the sprites, backgrounds and icons.
+assets = AssetManager()
@@ -0,0 +1,266 @@
+"""
+Module: benchmark
+Headless frame-time benchmark. Runs scripted scenarios through the real game loop under SDL's
+dummy video driver and reports frame-time percentiles, allocations and cache statistics as JSON.
+
+Usage:
+    python benchmark.py [--scenarios cruise_boost,dense_planets] [--frames 600] [--render-scale 0.75]
+                        [--adaptive] [--renderer texture-software] [--capture png] [--output bench.json]
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+SCENARIOS = ("cruise_boost", "dense_planets", "land_takeoff", "hub_menu")
+DEFAULT_FRAMES = 600
+WARMUP_FRAMES = 30       # First frames of a run (cold caches) are left out of the statistics.
+BENCH_SEED = 1234
+MIN_SPRITE_HIT_RATE = 0.9  # Below this the sprite cache is thrashing: it scales sprites every frame.
+MIN_CHECKED_LOOKUPS = 1000  # Fewer sprite cache lookups than this are mostly first-time misses.
+
+
+def make_world(save_folder, planet_count, spread=None):
+    """Create a world: catalog and star systems (seeded through the random module)."""
+    from classes.planet_catalog import PlanetCatalog
+    from classes.star_systems import StarSystems
+    from utils import STAR_FIELD_RANGE
+    catalog = PlanetCatalog.generate(planet_count, save_folder, spread or STAR_FIELD_RANGE)
+    star_systems = StarSystems.generate()
+    star_systems.assign_orbits(catalog)
+    return catalog, star_systems
+
+
+def run_game_scenario(name, frames, save_folder, renderer):
+    """Drive run_game with scripted input for one scenario."""
+    import pygame
+    from utils import WIDTH, HEIGHT, PLANET_COUNT
+    from game import run_game
+    from game_input import ScriptedInput
+    from display_backend import display
+    from assets import assets
+
+    screen = display.open((WIDTH, HEIGHT), 0, renderer)
+    # The game preloads its assets while the main menu is shown
+    assets.preload()
+    assets.wait()
+    start_scene = None
+    if name == "cruise_boost":
+        # Boost diagonally across many chunk boundaries
+        catalog, star_systems = make_world(save_folder, PLANET_COUNT)
+        start = (0, 0)
+        script = [(0, "hold", [pygame.K_d, pygame.K_s, pygame.K_SPACE])]
+    elif name == "dense_planets":
+        # A thousand planets packed around the flight path (about 30 on screen at a time)
+        catalog, star_systems = make_world(save_folder, 1000, spread=4000)
+        start = (-4000, -4000)
+        script = [(0, "hold", [pygame.K_d, pygame.K_s])]
+    elif name == "hub_menu":
+        # Sit in the hub menu with notifications showing, then leave with Escape
+        import game
+        from classes.hub_ship import hub_ship
+        catalog, star_systems = make_world(save_folder, PLANET_COUNT)
+        start = (0, 0)
+        start_scene = hub_ship((0, 0), [catalog.view(0), catalog]).menu_scene()
+        for i in range(4):
+            game.notification_system.add_popup(f"Notification {i + 1}", "Benchmark notification")
+        script = [(frames, "press", [pygame.K_ESCAPE])]
+    else:  # land_takeoff
+        # Start on a planet that does not orbit, then land, fly around and take off repeatedly
+        catalog, star_systems = make_world(save_folder, PLANET_COUNT)
+        orbiting = set(star_systems.orbiting.tolist())
+        index = next(i for i in range(len(catalog)) if i not in orbiting)
+        start = (catalog.planet_x(index), catalog.planet_y(index))
+        script = []
+        for cycle_start in range(0, frames, 120):
+            script += [
+                (cycle_start + 5, "press", [pygame.K_q]),
+                (cycle_start + 10, "hold", [pygame.K_w, pygame.K_d]),
+                (cycle_start + 70, "release", [pygame.K_w, pygame.K_d]),
+                (cycle_start + 90, "press", [pygame.K_q]),
+                (cycle_start + 91, "release", [pygame.K_q]),
+            ]
+    spaceship_data = {"x": start[0], "y": start[1], "missions": []}
+    run_game(screen, catalog, spaceship_data, save_folder, star_systems, realtime=False,
+             input_source=ScriptedInput(script, frames), start_scene=start_scene)
+    return catalog
+
+
+def cache_stats(catalog):
+    """Collect the sizes and counters of the game's caches."""
+    import world
+    from text_service import text_cache_stats
+    from classes.sprite_cache import sprite_cache, minimap_cache
+    from classes.sprite_bank import sprite_bank
+    from render_queue import render_queue
+    from classes.particles import particles
+    from display_backend import display
+    from assets import assets
+    return {
+        "sprites": sprite_cache.stats(),
+        "minimap": minimap_cache.stats(),
+        "text": dict(text_cache_stats),
+        "sprite_bank": {"scaled": len(sprite_bank.scaled), "rotated": len(sprite_bank.rotated)},
+        "chunks": len(world.chunk_cache),
+        "planet_views": len(catalog.views),
+        "render_queue": render_queue.stats(),
+        "particles": particles.stats(),
+        "display": display.stats(),
+        "assets": assets.stats(),
+    }
+
+
+def run_child(name, frames, trace, render_scale, adaptive, renderer, capture_format):
+    """Run one scenario in this process and print its measurements as JSON."""
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    random.seed(BENCH_SEED)
+    import numpy as np
+    np.random.seed(BENCH_SEED)
+    import pygame
+    pygame.init()
+    from profiler import profiler
+    from quality import governor
+    governor.set_max_render_scale(render_scale)
+    governor.set_enabled(adaptive)
+
+    profiler.reset(frames + 1)
+    profiler.set_enabled(True)
+    if trace:
+        import tracemalloc
+        tracemalloc.start()
+
+    save_folder = tempfile.mkdtemp(prefix="ih_bench_")
+    from frame_capture import capture
+    if capture_format:
+        # Measures what capturing costs the game loop; the frames go to the temporary folder
+        capture.start(os.path.join(save_folder, "capture"), capture_format)
+    started = time.perf_counter()
+    try:
+        catalog = run_game_scenario(name, frames, save_folder, renderer)
+    finally:
+        shutil.rmtree(save_folder, ignore_errors=True)
+
+    count = min(profiler.count, profiler.history)
+    recorded = slice(min(WARMUP_FRAMES, max(0, count - 1)), count)
+    if trace:
+        result = {
+            "alloc_kb_per_frame": float(np.mean(profiler.alloc_bytes[recorded])) / 1024,
+            "alloc_blocks_per_frame": float(np.mean(profiler.alloc_blocks[recorded])),
+        }
+    else:
+        frame_ms = profiler.frame_times[recorded] * 1000
+        stage_ms = profiler.stage_times[recorded].mean(axis=0) * 1000
+        result = {
+            "frames": int(len(frame_ms)),
+            "wall_seconds": round(time.perf_counter() - started, 2),
+            "p50_ms": float(np.percentile(frame_ms, 50)),
+            "p95_ms": float(np.percentile(frame_ms, 95)),
+            "p99_ms": float(np.percentile(frame_ms, 99)),
+            "mean_ms": float(frame_ms.mean()),
+            "stages_ms": dict(zip(profiler.stages, stage_ms.tolist())),
+            "caches": cache_stats(catalog),
+            "quality": governor.stats(),
+            "capture": capture.stats(),
+        }
+    # Own line, as planet generation threads may still be printing
+    print("\nBENCH_RESULT " + json.dumps(result), flush=True)
+
+
+def run_scenario(name, frames, render_scale, adaptive, renderer, capture_format):
+    """Run a scenario twice in fresh processes: once timed, once with allocation tracing."""
+    result = {}
+    for trace in (False, True):
+        command = [sys.executable, os.path.abspath(__file__), "--child", name, "--frames", str(frames),
+                   "--render-scale", str(render_scale), "--renderer", renderer]
+        if adaptive:
+            command.append("--adaptive")
+        if capture_format:
+            command += ["--capture", capture_format]
+        if trace:
+            command.append("--trace")
+        output = subprocess.run(command, capture_output=True, text=True)
+        lines = [line for line in output.stdout.splitlines() if line.startswith("BENCH_RESULT ")]
+        if not lines:
+            print(f"Scenario {name} failed:\n{output.stderr[-2000:]}", file=sys.stderr)
+            return None
+        result.update(json.JSONDecoder().raw_decode(lines[-1][len("BENCH_RESULT "):])[0])
+    return result
+
+
+def check_result(result):
+    """Return warnings about a scenario's result that point at a broken cache rather than slow drawing."""
+    warnings = []
+    sprites = result["caches"]["sprites"]
+    hit_rate = sprites["hit_rate"]
+    if sprites["hits"] + sprites["misses"] >= MIN_CHECKED_LOOKUPS and hit_rate < MIN_SPRITE_HIT_RATE:
+        warnings.append(f"sprite cache hit rate {hit_rate:.1%} is below {MIN_SPRITE_HIT_RATE:.0%}")
+    return warnings
+
+
+def git_revision():
+    """Return the current commit hash, or None outside a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless frame-time benchmark for Infinite Horizons.")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help="Comma-separated scenarios to run: " + ", ".join(SCENARIOS))
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES, help="Frames per scenario.")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout.")
+    parser.add_argument("--render-scale", type=float, default=1.0, help="Resolution of the world view (0.5-1.0).")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="Let the quality governor adapt to the frame times (quality is fixed otherwise).")
+    parser.add_argument("--renderer", choices=("surface", "texture", "texture-software"), default="surface",
+                        help="Display backend to draw with.")
+    parser.add_argument("--capture", choices=("png", "raw"), help="Capture the frames while measuring.")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--trace", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Sprites and saves are found relative to the game folder
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    if args.child:
+        run_child(args.child, args.frames, args.trace, args.render_scale, args.adaptive, args.renderer, args.capture)
+        return
+
+    report = {"revision": git_revision(), "frames": args.frames, "warmup_frames": WARMUP_FRAMES,
+              "render_scale": args.render_scale, "adaptive_quality": args.adaptive, "renderer": args.renderer,
+              "capture": args.capture, "scenarios": {}}
+    for name in args.scenarios.split(","):
+        if name not in SCENARIOS:
+            parser.error(f"unknown scenario: {name}")
+        print(f"Running {name}...", file=sys.stderr)
+        result = run_scenario(name, args.frames, args.render_scale, args.adaptive, args.renderer, args.capture)
+        if result is not None:
+            sprites = result["caches"]["sprites"]
+            if sprites["hit_rate"] is not None:
+                print(f"  sprite cache: {sprites['hit_rate']:.1%} hits, {sprites['overruns']} overruns "
+                      f"(peak {sprites['peak_bytes'] / 2 ** 20:.0f} MB, target {sprites['target'] / 2 ** 20:.0f} MB, "
+                      f"limit {sprites['limit'] / 2 ** 20:.0f} MB)", file=sys.stderr)
+            result["warnings"] = check_result(result)
+            for warning in result["warnings"]:
+                print(f"Warning ({name}): {warning}", file=sys.stderr)
+        report["scenarios"][name] = result
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Module: asteroids
+Defines the AsteroidField class which simulates and draws asteroid belts in bulk.
+Rock state lives in NumPy arrays; visible rocks are culled in bulk and queued as one batch
+of premultiplied-alpha frames.
+"""
+
+import math
+import random
+import numpy as np
+import pygame
+from classes.planet import PLANET_RES
+from render_queue import LAYER_ASTEROIDS
+from quality import governor
+
+ROTATION_FRAMES = 36              # Pre-rotated frames per rock shape (10 degree steps).
+ROCK_SIZES = (14, 22, 34)         # Base diameters of the rock shapes, in pixels.
+SHAPES_PER_SIZE = 2               # Distinct silhouettes generated for each size.
+BELT_CHANCE = 0.35                # Chance that a planet is surrounded by a belt.
+ROCKS_PER_BELT = (800, 2000)      # Range for the number of rocks in a belt.
+BELT_ANGULAR_SPEED = 0.0025       # Angular speed (radians per tick) at a belt's inner edge.
+MAX_BELTS = 16                    # Upper bound on belts, so large catalogs keep a bounded rock count.
+GOLDEN_RATIO_FRACTION = 0.6180339887  # Spreads the rock indices evenly over [0, 1) for thinning out.
+
+
+def _make_rock_surface(diameter, rnd):
+    """Draw an irregular rock silhouette on a transparent surface."""
+    surface = pygame.Surface((diameter, diameter), pygame.SRCALPHA)
+    center = diameter / 2
+    points = []
+    vertex_count = rnd.randint(7, 11)
+    for i in range(vertex_count):
+        theta = 2 * math.pi * i / vertex_count
+        radius = center * rnd.uniform(0.65, 0.98)
+        points.append((center + radius * math.cos(theta), center + radius * math.sin(theta)))
+    shade = rnd.randint(90, 140)
+    pygame.draw.polygon(surface, (shade, shade - 10, shade - 25), points)
+    pygame.draw.polygon(surface, (shade - 40, shade - 45, shade - 50), points, 1)
+    return surface
+
+
+class AsteroidField:
+    _frames = None       # Class variable holding the pre-rotated frame bank (premultiplied alpha).
+    _half_sizes = None   # Class variable holding (half_width, half_height) per frame.
+    _scaled_banks = {}   # Render scale -> (frames, half sizes), for rendering below full resolution.
+
+    def __init__(self):
+        """
+        Initialize an empty asteroid field.
+
+        Rocks are added per belt with add_belt and all belts share the same arrays,
+        so the whole field is updated and drawn in one pass.
+        """
+        if AsteroidField._frames is None:
+            AsteroidField._build_frame_bank()
+
+        self.centers = np.zeros((0, 2))
+        self.anchors = np.zeros(0, dtype=np.int32)
+        self.pos = np.zeros((0, 2))
+        self.vel = np.zeros((0, 2))
+        self.angle = np.zeros(0)
+        self.spin = np.zeros(0)
+        self.omega_sq = np.zeros(0)
+        self.belt = np.zeros(0, dtype=np.int32)
+        self.frame_base = np.zeros(0, dtype=np.int32)
+
+    @classmethod
+    def _build_frame_bank(cls):
+        """Render every rock shape once and pre-rotate it into ROTATION_FRAMES frames."""
+        rnd = random.Random(2024)
+        frames = []
+        half_sizes = []
+        for diameter in ROCK_SIZES:
+            for _ in range(SHAPES_PER_SIZE):
+                base = _make_rock_surface(diameter, rnd).convert_alpha()
+                for i in range(ROTATION_FRAMES):
+                    rotated = pygame.transform.rotate(base, i * 360 / ROTATION_FRAMES)
+                    frames.append(rotated.premul_alpha())
+                    half_sizes.append((rotated.get_width() // 2, rotated.get_height() // 2))
+        cls._frames = frames
+        cls._half_sizes = np.array(half_sizes, dtype=np.int32)
+
+    @classmethod
+    def _frame_bank(cls, scale):
+        """Return the frames and half sizes for a render scale, scaling the bank on first use."""
+        if scale == 1.0:
+            return cls._frames, cls._half_sizes
+        if scale not in cls._scaled_banks:
+            frames = [pygame.transform.smoothscale(frame, (max(1, int(frame.get_width() * scale)),
+                                                           max(1, int(frame.get_height() * scale))))
+                      for frame in cls._frames]
+            half_sizes = np.array([(frame.get_width() // 2, frame.get_height() // 2) for frame in frames],
+                                  dtype=np.int32)
+            cls._scaled_banks[scale] = (frames, half_sizes)
+        return cls._scaled_banks[scale]
+
+    @classmethod
+    def from_catalog(cls, catalog):
+        """
+        Create a field with belts around a deterministic subset of the planets.
+
+        :param catalog: PlanetCatalog holding the planets.
+        :return: A new AsteroidField instance.
+        """
+        field = cls()
+        for index in range(len(catalog)):
+            if len(field.centers) >= MAX_BELTS:
+                break
+            rnd = random.Random(index * 7919 + 17)
+            if rnd.random() >= BELT_CHANCE:
+                continue
+            planet_radius = PLANET_RES * float(catalog.scale[index]) / 2
+            inner = planet_radius * 1.4 + 100
+            outer = inner + rnd.uniform(300, 900)
+            center = (catalog.planet_x(index), catalog.planet_y(index))
+            field.add_belt(center, inner, outer, rnd.randint(*ROCKS_PER_BELT), rnd, anchor=index)
+        return field
+
+    def add_belt(self, center, inner_radius, outer_radius, count, rnd=None, anchor=-1):
+        """
+        Add a ring of rocks orbiting a point.
+
+        :param center: (x, y) world position the belt orbits.
+        :param inner_radius: Inner radius of the belt.
+        :param outer_radius: Outer radius of the belt.
+        :param count: Number of rocks in the belt.
+        :param rnd: Optional random.Random used to seed the belt layout.
+        :param anchor: Index of the planet the belt follows, or -1 for a fixed belt.
+        """
+        rng = np.random.default_rng(rnd.getrandbits(32) if rnd else None)
+        belt_id = len(self.centers)
+        self.centers = np.vstack([self.centers, np.asarray(center, dtype=float)])
+        self.anchors = np.append(self.anchors, np.int32(anchor))
+
+        radius = np.sqrt(rng.uniform(inner_radius ** 2, outer_radius ** 2, count))
+        theta = rng.uniform(0, 2 * math.pi, count)
+        direction = np.column_stack([np.cos(theta), np.sin(theta)])
+        pos = np.asarray(center, dtype=float) + direction * radius[:, None]
+
+        # Outer rocks orbit more slowly; a small velocity jitter gives eccentric orbits.
+        omega = BELT_ANGULAR_SPEED * (inner_radius / radius) ** 1.5
+        tangent = np.column_stack([-direction[:, 1], direction[:, 0]])
+        vel = tangent * (omega * radius)[:, None] * rng.uniform(0.97, 1.03, count)[:, None]
+
+        self.pos = np.vstack([self.pos, pos])
+        self.vel = np.vstack([self.vel, vel])
+        self.omega_sq = np.concatenate([self.omega_sq, omega ** 2])
+        self.angle = np.concatenate([self.angle, rng.uniform(0, 360, count)])
+        self.spin = np.concatenate([self.spin, rng.uniform(-2, 2, count)])
+        self.belt = np.concatenate([self.belt, np.full(count, belt_id, dtype=np.int32)])
+        # Favour small rocks: roughly half small, a third medium, the rest large.
+        size = rng.choice(len(ROCK_SIZES), count, p=[0.5, 0.33, 0.17])
+        variant = rng.integers(0, SHAPES_PER_SIZE, count)
+        shape = size * SHAPES_PER_SIZE + variant
+        self.frame_base = np.concatenate([self.frame_base, (shape * ROTATION_FRAMES).astype(np.int32)])
+
+    def __len__(self):
+        return len(self.pos)
+
+    def follow(self, xs, ys):
+        """
+        Move anchored belts, together with their rocks, to the current position of their planet.
+
+        :param xs: Array of planet X coordinates, indexed like the planets list.
+        :param ys: Array of planet Y coordinates, indexed like the planets list.
+        """
+        anchored = self.anchors >= 0
+        if not anchored.any():
+            return
+        new_centers = self.centers.copy()
+        new_centers[anchored, 0] = xs[self.anchors[anchored]]
+        new_centers[anchored, 1] = ys[self.anchors[anchored]]
+        self.pos += (new_centers - self.centers)[self.belt]
+        self.centers = new_centers
+
+    def update(self, dt=1.0):
+        """
+        Advance every rock by dt ticks.
+
+        Each rock is pulled towards its belt center (semi-implicit Euler keeps the orbits stable).
+
+        :param dt: Number of ticks to advance.
+        """
+        if not len(self.pos):
+            return
+        offset = self.pos - self.centers[self.belt]
+        self.vel -= offset * (self.omega_sq * dt)[:, None]
+        self.pos += self.vel * dt
+        self.angle = (self.angle + self.spin * dt) % 360
+
+    def submit(self, queue, camera_x, camera_y):
+        """
+        Queue the rocks that fall inside the camera rect.
+
+        :param queue: RenderQueue of the frame.
+        :param camera_x: Camera X offset.
+        :param camera_y: Camera Y offset.
+        """
+        if not len(self.pos):
+            return
+        _, _, width, height = queue.viewport
+        margin = ROCK_SIZES[-1]
+        screen_x = (self.pos[:, 0] - camera_x) * queue.scale
+        screen_y = (self.pos[:, 1] - camera_y) * queue.scale
+        visible = np.nonzero((screen_x > -margin) & (screen_x < width + margin) &
+                             (screen_y > -margin) & (screen_y < height + margin))[0]
+        if not visible.size:
+            return
+        budget = governor.settings["rock_budget"]
+        if budget is not None and visible.size > budget:
+            # Keep an evenly spread subset; a rock's rank depends only on its index, so the same
+            # rocks stay visible from frame to frame
+            rank = (visible * GOLDEN_RATIO_FRACTION) % 1.0
+            visible = visible[rank < budget / visible.size]
+
+        step = (self.angle[visible] * (ROTATION_FRAMES / 360)).astype(np.int32) % ROTATION_FRAMES
+        frame = self.frame_base[visible] + step
+        frames, half_sizes = AsteroidField._frame_bank(queue.scale)
+        half = half_sizes[frame]
+        dest_x = (screen_x[visible] - half[:, 0]).astype(np.int32).tolist()
+        dest_y = (screen_y[visible] - half[:, 1]).astype(np.int32).tolist()
+        blend = pygame.BLEND_PREMULTIPLIED
+        queue.extend(LAYER_ASTEROIDS, [(frames[f], (x, y), None, blend)
+                                       for f, x, y in zip(frame.tolist(), dest_x, dest_y)])
@@ -6,16 +6,43 @@ Defines the comm_ship class which handles movement, boosting, and drawing.
 import pygame
 import random
 import math
+from bisect import bisect_right
 from utils import WIDTH, HEIGHT
 from classes.missions import Mission, MissionStep, TaskDeliverPassenger
 from classes.player import Player
+from scenes import Scene
+from text_service import render_text
+from classes.sprite_bank import sprite_bank
+from classes.station_menu import StationMenuScene
+from render_queue import LAYER_STATIONS
+from assets import assets
+from classes.sprite_cache import SpriteCache
 
 MARGIN = 200
+SPRITE_PATH = "sprites/communications_ship.png"
+BACKGROUND_PATH = "sprites/comm_room.jpg"
+assets.declare(SPRITE_PATH)
+assets.declare(BACKGROUND_PATH, (WIDTH, HEIGHT), alpha=False)
 
-class comm_ship:
-    _original_sprite = None  # Class variable to store the default sprite.
-    _sprite_boost = None     # Class variable to store the boost sprite.
+DIALOG_FONT = (None, 32)
+DIALOG_SMALL_FONT = (None, 28)
+
+# Mission list layout
+CARD_HEIGHT = 80
+CARD_EXPANDED_HEIGHT = 140
+CARD_SPACING = 20
+SCROLL_STEP = 60                       # Pixels scrolled per mouse wheel step
+CARD_CACHE_BUDGET = 32 * 1024 * 1024   # Bytes of rendered cards kept per mission list
 
+# Predefined communications dialogue
+DIALOGUE = [
+    "Greetings, Commander!",
+    "Your first mission is to smuggle refugees",
+    "out of the war-torn sector.",
+    "Proceed with caution and good luck!"
+]
+
+class comm_ship:
     def __init__(self, loc, data, scale_factor=0.5):
         """
         Initialize the ship.
@@ -24,9 +51,6 @@ class comm_ship:
         :param y: Y coordinate.
         :param scale_factor: Scaling factor for the comm_ship sprite.
         """
-        if comm_ship._original_sprite is None:
-            comm_ship._original_sprite = pygame.image.load("sprites/communications_ship.png").convert_alpha()
-
         self.x = loc[0]
         self.y = loc[1]
         self.width = 480
@@ -34,31 +58,35 @@ class comm_ship:
         self.angle =  0
         self.border_radius = 200
         self.scale_factor = scale_factor
-        self.sprite = self.get_scaled_sprite(comm_ship._original_sprite)
+        self.sprite = sprite_bank.get_scaled(SPRITE_PATH, self.scale_factor)
         self.planet = data[0]
         self.missions = self.planet.missions
-        self.planets = data[1]
+        self.catalog = data[1]
 
-    def get_scaled_sprite(self, base_sprite):
-        """Return a scaled version of the provided sprite."""
-        width = int(base_sprite.get_width() * self.scale_factor)
-        height = int(base_sprite.get_height() * self.scale_factor)
-        return pygame.transform.scale(base_sprite, (width, height))
         
-    def draw(self, screen, camera_x, camera_y):
+    def submit(self, queue, camera_x, camera_y):
         """
-        Draw the comm_ship on the screen.
+        Queue the comm_ship sprite on the station layer of a RenderQueue.
         
-        :param screen: Pygame display surface.
+        :param queue: RenderQueue of the frame.
         :param camera_x: Camera X offset.
         :param camera_y: Camera Y offset.
         """
         screen_pos = (self.x - camera_x, self.y - camera_y)
-        rotated_image = pygame.transform.rotate(self.sprite, self.angle)
-        rotated_rect = rotated_image.get_rect(center=screen_pos)
-        screen.blit(rotated_image, rotated_rect.topleft)
+        sprite_bank.submit_rotated(queue, LAYER_STATIONS, SPRITE_PATH, self.scale_factor, self.angle, screen_pos)
+
+    def draw_border(self, screen, camera_x, camera_y, scale=1.0):
+        """
+        Draw the interaction border around the comm_ship, over its sprite.
+        
+        :param screen: Pygame display surface.
+        :param camera_x: Camera X offset.
+        :param camera_y: Camera Y offset.
+        :param scale: Render scale of the surface drawn on.
+        """
+        screen_pos = ((self.x - camera_x) * scale, (self.y - camera_y) * scale)
         # Draw a white circular border around the ship (1px stroke)
-        pygame.draw.circle(screen, (255, 255, 255), screen_pos, self.border_radius, 3)
+        pygame.draw.circle(screen, (255, 255, 255), screen_pos, self.border_radius * scale, max(1, round(3 * scale)))
 
     def check_border(self, player_x, player_y):
         """
@@ -71,133 +99,13 @@ class comm_ship:
         distance = math.sqrt((player_x - self.x) ** 2 + (player_y - self.y) ** 2)
         return distance <= self.border_radius
     
-    def comm_menu(self, screen, player, update_player_missions):
-        # Load background image (comm_room.jpg)
-        background = pygame.image.load("sprites/comm_room.jpg").convert()
-        background = pygame.transform.scale(background, (WIDTH, HEIGHT))
-        
-        running_menu = True
-        # Use a monospaced, terminal-like font (Courier New or similar)
-        font_name = pygame.font.match_font("courier")  # returns a path to a courier-like font
-        font = pygame.font.Font(font_name, 32)
-        small_font = pygame.font.Font(font_name, 28)
-        smaller_font = pygame.font.Font(font_name, 20)
-        
-        font.set_bold(True)
-        small_font.set_bold(True)
-        smaller_font.set_bold(True)
-        
-        # Define green color (bright terminal green)
-        terminal_green = (0, 255, 0)
-        
-        mission_data = [self.planet, "comm"]
-        
-        comms_button = pygame.Rect(455, 515, 135, 120)   # Communications
-        missions_button = pygame.Rect(875, 540, 185, 132)  # Missions
-        exit_button = pygame.Rect(1600, 395, 64, 100)      # Exit
-
-        while running_menu:
-            try:
-                # Get current time for notifications
-                current_time = pygame.time.get_ticks()
-                
-                screen.blit(background, (0, 0))
-                
-                # Draw semi-transparent overlay (optional, for button contrast)
-                overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-                overlay.fill((0, 0, 0, 100))  # Black with alpha 100
-                screen.blit(overlay, (0, 0))
-
-                # Add text to buttons
-                comms_text = font.render("Comms", True, terminal_green)
-                update_rect = comms_text.get_rect(center=(comms_button.centerx, comms_button.centery - 5))
-                missions_text = font.render("Missions", True, terminal_green)
-                exit_text = smaller_font.render("Exit", True, terminal_green)
-                screen.blit(comms_text, update_rect)
-                screen.blit(missions_text, missions_text.get_rect(center=missions_button.center))
-                screen.blit(exit_text, exit_text.get_rect(center=exit_button.center))
-                
-                update_player_missions(mission_data[0], mission_data[1])
-                
-                # Get the global notification system safely
-                try:
-                    from game import notification_system
-                    notification_system.update(current_time)
-                    notification_system.render(screen, current_time)
-                except Exception as e:
-                    print(f"Error rendering notifications: {e}")
-                
-                pygame.display.flip()
-                
-            except Exception as e:
-                print(f"Error in communications menu: {e}")
-            
-            # Event loop for menu
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    exit()
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    # Check if any button was clicked
-                    mouse_pos = pygame.mouse.get_pos()
-                    if comms_button.collidepoint(mouse_pos):
-                        # Show predefined communications dialogue
-                        self.show_communications_dialog(screen, player)
-                    elif missions_button.collidepoint(mouse_pos):
-                        # Show hardcoded missions list
-                        self.show_missions(screen, player)
-                    elif exit_button.collidepoint(mouse_pos):
-                        running_menu = False
-                        return "planet"
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        running_menu = False
-                        return "planet"
-
-    def show_communications_dialog(self, screen, player):
-        """Display predefined communications dialogue."""
-        font = pygame.font.Font(None, 32)
-        dialogue = [
-            "Greetings, Commander!",
-            "Your first mission is to smuggle refugees",
-            "out of the war-torn sector.",
-            "Proceed with caution and good luck!"
-        ]
-        running_dialog = True
-        while running_dialog:
-            current_time = pygame.time.get_ticks()
-            
-            screen.fill((0, 0, 0))
-            for idx, line in enumerate(dialogue):
-                line_surface = font.render(line, True, (255, 255, 255))
-                line_rect = line_surface.get_rect(center=(WIDTH // 2, 100 + idx * 40))
-                screen.blit(line_surface, line_rect)
-            
-            prompt_surface = font.render("Press any key to return", True, (255, 255, 255))
-            prompt_rect = prompt_surface.get_rect(center=(WIDTH // 2, HEIGHT - 50))
-            screen.blit(prompt_surface, prompt_rect)
-            
-            # Get the global notification system
-            from game import notification_system
-            notification_system.update(current_time)
-            notification_system.render(screen, current_time)
-            
-            pygame.display.flip()
-            
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    exit()
-                elif event.type == pygame.KEYDOWN:
-                    running_dialog = False
-
-    def show_missions(self, screen, player):
-        """Display hardcoded missions list with individual mission sections."""
-        # Import or assume WIDTH and HEIGHT are defined in your utils module
-        font = pygame.font.Font(None, 32)
-        small_font = pygame.font.Font(None, 28)
-        
-        planet_names = [p.name for p in self.planets]
+    def menu_scene(self, player):
+        """Return the scene of the ship's menu, shown while the player is docked."""
+        return StationMenuScene(BACKGROUND_PATH, "comm", DIALOGUE, lambda: self.missions_scene(player))
+
+    def missions_scene(self, player):
+        """Return the scene listing the missions offered here, adding an example mission if there are none."""
+        planet_names = self.catalog.planet_names()
         
         for mission in self.missions:
             if mission.completed:
@@ -225,113 +133,170 @@ class comm_ship:
                 )
             )
         
-        missions = self.missions
-        
-        # Initialize show_details list to track which missions have expanded details
-        show_details = []
-        
-        running_missions = True
-        while running_missions:
-            current_time = pygame.time.get_ticks()
-            
-            screen.fill((0, 0, 0))
-            
-            # Draw the header
-            header_surface = font.render("Missions", True, (255, 255, 255))
-            header_rect = header_surface.get_rect(center=(WIDTH // 2, 50))
-            screen.blit(header_surface, header_rect)
-            
-            # Starting y position for the first mission card
-            base_y = 100  
-            card_spacing = 20  
-            card_width = WIDTH - 200  
-            card_x = 100
-            
-            # Draw each mission as a card
-            for idx, mission in enumerate(missions):
-                # Determine card height based on whether details are shown
-                if mission.id in show_details:
-                    card_height = 140
-                else:
-                    card_height = 80
-                card_y = base_y + idx * (card_height + card_spacing)
-                
-                # Draw the card background and border
-                card_rect = pygame.Rect(card_x, card_y, card_width, card_height)
-                pygame.draw.rect(screen, (50, 50, 50), card_rect)  # Dark gray card
-                pygame.draw.rect(screen, (255, 255, 255), card_rect, 2)  # White border
-                
-                # Draw the mission title
-                title_surface = font.render(mission.title, True, (255, 255, 255))
-                screen.blit(title_surface, (card_x + 10, card_y + 10))
-                
-                # Draw "Details" button
-                details_button_rect = pygame.Rect(card_x + card_width - 240, card_y + 10, 100, 30)
-                pygame.draw.rect(screen, (80, 80, 80), details_button_rect)
-                pygame.draw.rect(screen, (255, 255, 255), details_button_rect, 1)
-                details_text = small_font.render("Details", True, (255, 255, 255))
-                details_text_rect = details_text.get_rect(center=details_button_rect.center)
-                screen.blit(details_text, details_text_rect)
-                
-                # Draw "Accept/Drop" button
-                accept_button_rect = pygame.Rect(card_x + card_width - 130, card_y + 10, 100, 30)
-                pygame.draw.rect(screen, (80, 80, 80), accept_button_rect)
-                pygame.draw.rect(screen, (255, 255, 255), accept_button_rect, 1)
-                if mission in player.missions:
-                    accept_text = small_font.render("Drop", True, (255, 255, 255))
-                else:
-                    accept_text = small_font.render("Accept", True, (255, 255, 255))
-                accept_text_rect = accept_text.get_rect(center=accept_button_rect.center)
-                screen.blit(accept_text, accept_text_rect)
-                
-                # If details are toggled, display description and reward
-                if mission.id in show_details:
-                    description_surface = small_font.render("Desc: " + mission.description, True, (200, 200, 200))
-                    reward_surface = small_font.render("Reward: " + str(mission.reward), True, (200, 200, 200))
-                    screen.blit(description_surface, (card_x + 10, card_y + 50))
-                    screen.blit(reward_surface, (card_x + 10, card_y + 80))
-                
-                # Store button rectangles for event handling
-                mission.details_button_rect = details_button_rect
-                mission.accept_button_rect = accept_button_rect
-            
-            # Draw prompt text at the bottom
-            prompt_surface = font.render("Press any key to return", True, (255, 255, 255))
-            prompt_rect = prompt_surface.get_rect(center=(WIDTH // 2, HEIGHT - 50))
-            screen.blit(prompt_surface, prompt_rect)
-            
-            # Get the global notification system
-            from game import notification_system
-            notification_system.update(current_time)
-            notification_system.render(screen, current_time)
-            
-            pygame.display.flip()
-            
-            # Handle events
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    exit()
-                elif event.type == pygame.KEYDOWN:
-                    running_missions = False
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    pos = pygame.mouse.get_pos()
-                    for mission in missions:
-                        if hasattr(mission, 'details_button_rect') and mission.details_button_rect.collidepoint(pos):
-                            # Toggle the details view for this mission
-                            if mission.id in show_details:
-                                show_details.remove(mission.id)
-                            else:
-                                show_details.append(mission.id)
-                            # Redraw the screen immediately to reflect the change
-                            break
-                            
-                        if hasattr(mission, 'accept_button_rect') and mission.accept_button_rect.collidepoint(pos):
-                            # Toggle accepted status for this mission
-                            if mission in player.missions:
-                                player.missions.remove(mission)
-                            else:
-                                player.missions.append(mission)
-                            # Redraw the screen immediately to reflect the change
-                            break
+        return MissionsScene(self.missions, player)
+
+
+class MissionsScene(Scene):
+    def __init__(self, missions, player):
+        """
+        Initialize the mission list: one card per mission, with Details and Accept/Drop buttons.
+
+        The list is virtualized: only the cards inside the viewport are drawn, from card surfaces
+        cached by (mission id, expanded), so boards with thousands of missions scroll smoothly.
+
+        :param missions: Missions offered by the ship.
+        :param player: Player accepting or dropping them.
+        """
+        super().__init__()
+        self.missions = missions
+        self.player = player
+        self.show_details = set()  # Ids of the missions whose cards are expanded
+        self.cards = SpriteCache(CARD_CACHE_BUDGET)
+        self.viewport = pygame.Rect(0, 0, 0, 0)  # Screen area the cards scroll in
+        self.offsets = []      # Top of each card, relative to the top of the list
+        self.list_height = 0
+        self.scroll = 0        # Pixels scrolled from the top of the list
+        self.visible = []      # (mission, card rect on the screen) of the cards drawn, possibly cut by the viewport
+        self.cards_changed = True
+        self._layout()
+
+    def _layout(self):
+        """Compute the card positions; done when cards are expanded or collapsed, not per frame."""
+        self.offsets = []
+        y = 0
+        for mission in self.missions:
+            self.offsets.append(y)
+            y += (CARD_EXPANDED_HEIGHT if mission.id in self.show_details else CARD_HEIGHT) + CARD_SPACING
+        self.list_height = y
+        self._scroll_to(self.scroll)
+
+    def _scroll_to(self, scroll):
+        self.scroll = max(0, min(scroll, self.list_height - self.viewport.height))
+        self.cards_changed = True
+
+    def _card(self, mission, expanded):
+        """Return the rendered card of a mission, rendering it on a cache miss."""
+        key = (mission.id, expanded)
+        card = self.cards.get(key)
+        if card is None:
+            card = self._render_card(mission, expanded)
+            self.cards.put(key, card)
+        return card
+
+    def _render_card(self, mission, expanded):
+        card_width = self.viewport.width
+        card = pygame.Surface((card_width, CARD_EXPANDED_HEIGHT if expanded else CARD_HEIGHT))
+
+        # Draw the card background and border
+        card.fill((50, 50, 50))  # Dark gray card
+        pygame.draw.rect(card, (255, 255, 255), card.get_rect(), 2)  # White border
+
+        # Draw the mission title
+        title_surface = render_text(mission.title, DIALOG_FONT, (255, 255, 255))
+        card.blit(title_surface, (10, 10))
+
+        # Draw "Details" button
+        details_button_rect = _details_button(card.get_rect())
+        pygame.draw.rect(card, (80, 80, 80), details_button_rect)
+        pygame.draw.rect(card, (255, 255, 255), details_button_rect, 1)
+        details_text = render_text("Details", DIALOG_SMALL_FONT, (255, 255, 255))
+        card.blit(details_text, details_text.get_rect(center=details_button_rect.center))
+
+        # Draw "Accept/Drop" button
+        accept_button_rect = _accept_button(card.get_rect())
+        pygame.draw.rect(card, (80, 80, 80), accept_button_rect)
+        pygame.draw.rect(card, (255, 255, 255), accept_button_rect, 1)
+        if mission in self.player.missions:
+            accept_text = render_text("Drop", DIALOG_SMALL_FONT, (255, 255, 255))
+        else:
+            accept_text = render_text("Accept", DIALOG_SMALL_FONT, (255, 255, 255))
+        card.blit(accept_text, accept_text.get_rect(center=accept_button_rect.center))
+
+        # If details are toggled, display description and reward
+        if expanded:
+            description_surface = render_text("Desc: " + mission.description, DIALOG_SMALL_FONT, (200, 200, 200))
+            reward_surface = render_text("Reward: " + str(mission.reward), DIALOG_SMALL_FONT, (200, 200, 200))
+            card.blit(description_surface, (10, 50))
+            card.blit(reward_surface, (10, 80))
+        return card
+
+    def _draw_cards(self, page):
+        """Draw the cards inside the viewport on the page, clipped to it."""
+        page.fill((0, 0, 0), self.viewport)
+        page.set_clip(self.viewport)
+        self.visible = []
+        # Only the cards overlapping the viewport are looked at
+        index = max(0, bisect_right(self.offsets, self.scroll) - 1)
+        bottom = self.scroll + self.viewport.height
+        while index < len(self.missions) and self.offsets[index] < bottom:
+            mission = self.missions[index]
+            card = self._card(mission, mission.id in self.show_details)
+            rect = card.get_rect(topleft=(self.viewport.x, self.viewport.y + self.offsets[index] - self.scroll))
+            page.blit(card, rect)
+            self.visible.append((mission, rect))
+            index += 1
+        page.set_clip(None)
+        self.cards_changed = False
+
+    def compose(self, size):
+        width, height = size
+        self.viewport = pygame.Rect(100, 100, width - 200, height - 200)
+        self._scroll_to(self.scroll)
+        page = pygame.Surface(size)
+        page.fill((0, 0, 0))
+
+        # Draw the header
+        header_surface = render_text("Missions", DIALOG_FONT, (255, 255, 255))
+        page.blit(header_surface, header_surface.get_rect(center=(width // 2, 50)))
+
+        # Draw prompt text at the bottom
+        prompt_surface = render_text("Press any key to return", DIALOG_FONT, (255, 255, 255))
+        page.blit(prompt_surface, prompt_surface.get_rect(center=(width // 2, height - 50)))
+
+        self._draw_cards(page)
+        return page
+
+    def draw(self, screen, tracker):
+        if self.frame is not None and self.cards_changed:
+            # Scrolled or toggled: only the list area is drawn and sent to the display
+            self._draw_cards(self.frame)
+            if not tracker.full:
+                tracker.erase_overlay(screen, self.frame)
+                screen.blit(self.frame, self.viewport, self.viewport)
+                tracker.mark(self.viewport)
+                return
+        super().draw(screen, tracker)
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            self.close()
+        elif event.type == pygame.MOUSEWHEEL:
+            self._scroll_to(self.scroll - event.y * SCROLL_STEP)
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and self.viewport.collidepoint(event.pos):
+            for mission, card_rect in self.visible:
+                if not card_rect.collidepoint(event.pos):
+                    continue
+                if _details_button(card_rect).collidepoint(event.pos):
+                    # Toggle the details view for this mission
+                    self.show_details ^= {mission.id}
+                    self._layout()
+                elif _accept_button(card_rect).collidepoint(event.pos):
+                    # Toggle accepted status for this mission; its cards show the other label now
+                    if mission in self.player.missions:
+                        self.player.missions.remove(mission)
+                    else:
+                        self.player.missions.append(mission)
+                    self.cards.discard((mission.id, False))
+                    self.cards.discard((mission.id, True))
+                    self.cards_changed = True
+                break
+
+
+def _details_button(card_rect):
+    """Return the rect of a card's Details button."""
+    return pygame.Rect(card_rect.right - 240, card_rect.y + 10, 100, 30)
+
 
+def _accept_button(card_rect):
+    """Return the rect of a card's Accept/Drop button."""
+    return pygame.Rect(card_rect.right - 130, card_rect.y + 10, 100, 30)
@@ -0,0 +1,156 @@
+"""
+Module: exploration
+Defines the ExploredMap class which records where the player has been as a packed bitset.
+The bitset drives a cached fog raster used to mask unexplored areas on the maps.
+"""
+
+import base64
+import math
+import zlib
+import numpy as np
+import pygame
+from utils import STAR_FIELD_RANGE
+
+EXPLORE_CELL_SIZE = 512                 # World pixels covered by one bit.
+EXPLORE_RANGE = 2 * STAR_FIELD_RANGE    # Tracked region extends this far from the origin on each axis.
+REVEAL_RADIUS = 3                       # Cells revealed around the ship, in cells.
+FOG_COLOR = (0, 0, 0, 200)
+
+
+class ExploredMap:
+    def __init__(self, cell_size=EXPLORE_CELL_SIZE, explore_range=EXPLORE_RANGE, bits=None):
+        """
+        Initialize the explored-area map.
+
+        :param cell_size: World pixels covered by one cell.
+        :param explore_range: Half-width of the tracked square region, centered on the origin.
+        :param bits: Optional packed bit array restored from a save.
+        """
+        self.cell_size = cell_size
+        self.cells_per_axis = int(math.ceil(2 * explore_range / cell_size))
+        self.origin = -self.cells_per_axis * cell_size / 2
+        byte_count = (self.cells_per_axis * self.cells_per_axis + 7) // 8
+        self.bits = np.zeros(byte_count, dtype=np.uint8)
+        if bits is not None and len(bits) == byte_count:
+            self.bits[:] = bits
+        self.last_cell = None
+        self.version = 0  # Incremented whenever a cell is revealed.
+
+        # Offsets of the cells within REVEAL_RADIUS of the ship's cell.
+        self._disk = [(dx, dy)
+                      for dx in range(-REVEAL_RADIUS, REVEAL_RADIUS + 1)
+                      for dy in range(-REVEAL_RADIUS, REVEAL_RADIUS + 1)
+                      if dx * dx + dy * dy <= REVEAL_RADIUS * REVEAL_RADIUS]
+        self.raster = None
+
+    @classmethod
+    def from_save_data(cls, data):
+        """
+        Restore an explored map from saved data.
+
+        :param data: Dictionary produced by to_save_data, or None.
+        :return: A new ExploredMap instance.
+        """
+        if not data:
+            return cls()
+        packed = np.frombuffer(zlib.decompress(base64.b64decode(data["bits"])), dtype=np.uint8)
+        return cls(data["cell_size"], data["range"], packed)
+
+    def to_save_data(self):
+        """Convert the map to a compact serializable dictionary (zlib-compressed, base64 bits)."""
+        return {
+            "cell_size": self.cell_size,
+            "range": -self.origin,
+            "bits": base64.b64encode(zlib.compress(self.bits.tobytes(), 9)).decode("ascii"),
+        }
+
+    def _cell_of(self, x, y):
+        return (int((x - self.origin) // self.cell_size), int((y - self.origin) // self.cell_size))
+
+    def is_explored(self, cell_x, cell_y):
+        """Return True if the cell has been revealed (cells outside the region never are)."""
+        if not (0 <= cell_x < self.cells_per_axis and 0 <= cell_y < self.cells_per_axis):
+            return False
+        index = cell_y * self.cells_per_axis + cell_x
+        return bool(self.bits[index >> 3] & (1 << (index & 7)))
+
+    def reveal(self, x, y):
+        """
+        Reveal the cells around a world position.
+
+        Nothing is done while the ship stays in the same cell; otherwise only the cells of the
+        reveal disk are tested and only the newly revealed ones are written to the raster.
+
+        :param x: World X coordinate.
+        :param y: World Y coordinate.
+        :return: List of newly revealed (cell_x, cell_y) cells.
+        """
+        cell = self._cell_of(x, y)
+        if cell == self.last_cell:
+            return []
+        self.last_cell = cell
+        revealed = []
+        for dx, dy in self._disk:
+            cell_x, cell_y = cell[0] + dx, cell[1] + dy
+            if not (0 <= cell_x < self.cells_per_axis and 0 <= cell_y < self.cells_per_axis):
+                continue
+            index = cell_y * self.cells_per_axis + cell_x
+            mask = 1 << (index & 7)
+            if not self.bits[index >> 3] & mask:
+                self.bits[index >> 3] |= mask
+                revealed.append((cell_x, cell_y))
+        if revealed:
+            self.version += 1
+            if self.raster is not None:
+                for cell_x, cell_y in revealed:
+                    self.raster.set_at((cell_x, cell_y), (0, 0, 0, 0))
+        return revealed
+
+    def get_raster(self):
+        """
+        Return the fog raster: one pixel per cell, fog-colored where unexplored.
+
+        The raster is built from the bitset once and then kept in sync by reveal().
+        """
+        if self.raster is None:
+            count = self.cells_per_axis * self.cells_per_axis
+            explored = np.unpackbits(self.bits, bitorder="little")[:count].reshape(
+                self.cells_per_axis, self.cells_per_axis)
+            self.raster = pygame.Surface((self.cells_per_axis, self.cells_per_axis), pygame.SRCALPHA)
+            self.raster.fill(FOG_COLOR)
+            alpha = pygame.surfarray.pixels_alpha(self.raster)
+            alpha[explored.T.astype(bool)] = 0
+            del alpha
+        return self.raster
+
+    def fog_for_region(self, left, top, width, height, size):
+        """
+        Return a fog overlay for a world rectangle, scaled to `size`.
+
+        :param left: World X of the region's left edge.
+        :param top: World Y of the region's top edge.
+        :param width: World width of the region.
+        :param height: World height of the region.
+        :param size: (width, height) of the returned surface in pixels.
+        :return: SRCALPHA surface to blit over the region.
+        """
+        raster = self.get_raster()
+        # Cut the covered cells out of the raster; anything outside the tracked region stays fogged.
+        cell_left = (left - self.origin) / self.cell_size
+        cell_top = (top - self.origin) / self.cell_size
+        x0, y0 = math.floor(cell_left), math.floor(cell_top)
+        x1 = math.ceil(cell_left + width / self.cell_size)
+        y1 = math.ceil(cell_top + height / self.cell_size)
+        piece = pygame.Surface((max(1, x1 - x0), max(1, y1 - y0)), pygame.SRCALPHA)
+        piece.fill(FOG_COLOR)
+        piece.blit(raster, (-x0, -y0), special_flags=pygame.BLEND_RGBA_MIN)
+
+        # Scale the whole cells, then crop so the fog lines up with the partial cells at the edges.
+        scale_x = size[0] / (width / self.cell_size)
+        scale_y = size[1] / (height / self.cell_size)
+        scaled = pygame.transform.scale(piece, (max(1, int(piece.get_width() * scale_x)),
+                                                max(1, int(piece.get_height() * scale_y))))
+        offset = (int((cell_left - x0) * scale_x), int((cell_top - y0) * scale_y))
+        fog = pygame.Surface(size, pygame.SRCALPHA)
+        fog.blit(scaled, (-offset[0], -offset[1]))
+        return fog
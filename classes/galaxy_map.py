@@ -0,0 +1,312 @@
+"""
+Module: galaxy_map
+Defines the full-screen galaxy map with hierarchical level-of-detail clustering.
+Planets are aggregated in a quadtree, and each zoom band is drawn from cached raster tiles.
+"""
+
+import math
+import time
+from collections import OrderedDict
+import numpy as np
+import pygame
+from utils import WIDTH, HEIGHT, WHITE, STAR_FIELD_RANGE
+from text_service import get_font, render_text
+
+MAP_FONT = (None, 18)
+HUD_FONT = (None, 28)
+
+MAX_DEPTH = 16                  # Deepest quadtree level (65536 cells per axis).
+GLYPH_CELL = 24                 # Minimum on-screen size (pixels) of a clustering cell.
+SECTOR_WORLD_SIZE = 7680        # World width shown at the closest zoom band.
+TILE_SIZE = 512                 # Side of a cached raster tile, in pixels.
+MAX_CACHED_TILES = 48           # Tiles kept across all zoom bands (about 1 MB each).
+TILE_BUDGET_MS = 6              # Time per frame spent rendering missing tiles.
+PAN_SPEED = 18                  # Keyboard panning speed in screen pixels per frame.
+
+BACKGROUND = (5, 5, 15)
+PLANET_COLOR = (120, 180, 255)
+CLUSTER_COLOR = (255, 200, 90)
+PLAYER_COLOR = (255, 0, 0)
+
+
+class PlanetQuadtree:
+    def __init__(self, xs, ys, extra_points=(), max_depth=MAX_DEPTH):
+        """
+        Build an implicit quadtree over the given points.
+
+        Every level stores its non-empty cells as sorted keys together with the number of
+        points in the cell and their centroid, so a level can be drawn as one aggregate
+        marker per cell.
+
+        :param xs: Array of X coordinates.
+        :param ys: Array of Y coordinates.
+        :param extra_points: Additional (x, y) positions that should fit in the tree bounds.
+        :param max_depth: Deepest level of the tree.
+        """
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        self.max_depth = max_depth
+
+        bounds_x = np.concatenate([xs, [p[0] for p in extra_points]])
+        bounds_y = np.concatenate([ys, [p[1] for p in extra_points]])
+        if len(bounds_x):
+            left, right = bounds_x.min(), bounds_x.max()
+            top, bottom = bounds_y.min(), bounds_y.max()
+        else:
+            left = top = -STAR_FIELD_RANGE
+            right = bottom = STAR_FIELD_RANGE
+        self.size = max(right - left, bottom - top, 1.0) * 1.1
+        self.left = (left + right) / 2 - self.size / 2
+        self.top = (top + bottom) / 2 - self.size / 2
+
+        # Leaf cells first, then every coarser level aggregates the level below it.
+        cells_per_axis = 1 << max_depth
+        cell_x = np.clip(((xs - self.left) / self.size * cells_per_axis).astype(np.int64), 0, cells_per_axis - 1)
+        cell_y = np.clip(((ys - self.top) / self.size * cells_per_axis).astype(np.int64), 0, cells_per_axis - 1)
+        counts = np.ones(len(xs), dtype=np.int64)
+        sum_x, sum_y = xs, ys
+        first = np.arange(len(xs), dtype=np.int64)
+
+        self.levels = [None] * (max_depth + 1)
+        for level in range(max_depth, -1, -1):
+            keys = (cell_y << level) | cell_x
+            unique_keys, start, inverse = np.unique(keys, return_index=True, return_inverse=True)
+            node_counts = np.bincount(inverse, weights=counts, minlength=len(unique_keys)).astype(np.int64)
+            node_sum_x = np.bincount(inverse, weights=sum_x, minlength=len(unique_keys))
+            node_sum_y = np.bincount(inverse, weights=sum_y, minlength=len(unique_keys))
+            self.levels[level] = {
+                "keys": unique_keys,
+                "count": node_counts,
+                "x": node_sum_x / np.maximum(node_counts, 1),
+                "y": node_sum_y / np.maximum(node_counts, 1),
+                "index": first[start],
+            }
+            cell_x = cell_x[start] >> 1
+            cell_y = cell_y[start] >> 1
+            counts, sum_x, sum_y, first = node_counts, node_sum_x, node_sum_y, first[start]
+
+    def query(self, level, left, top, right, bottom):
+        """
+        Return the node indices of `level` whose cell overlaps the world rectangle.
+
+        :return: Array of indices into the level's node arrays.
+        """
+        nodes = self.levels[level]
+        cells_per_axis = 1 << level
+        cell_size = self.size / cells_per_axis
+        x0 = max(0, int((left - self.left) // cell_size))
+        x1 = min(cells_per_axis - 1, int((right - self.left) // cell_size))
+        y0 = max(0, int((top - self.top) // cell_size))
+        y1 = min(cells_per_axis - 1, int((bottom - self.top) // cell_size))
+        if x0 > x1 or y0 > y1:
+            return np.zeros(0, dtype=np.int64)
+        keys = nodes["keys"]
+        rows = np.arange(y0, y1 + 1, dtype=np.int64) << level
+        starts = np.searchsorted(keys, rows | x0)
+        ends = np.searchsorted(keys, rows | x1, side="right")
+        return np.concatenate([np.arange(s, e) for s, e in zip(starts.tolist(), ends.tolist())])
+
+
+class GalaxyMap:
+    def __init__(self, width=WIDTH, height=HEIGHT):
+        """
+        Initialize the galaxy map.
+
+        :param width: Width of the map view in pixels.
+        :param height: Height of the map view in pixels.
+        """
+        self.width = width
+        self.height = height
+        self.tree = None
+        self.stars = []
+        self.explored = None
+        self.band = 0
+        self.max_band = 0
+        self.center_x = 0.0
+        self.center_y = 0.0
+        self.dragging = False
+        self.tiles = OrderedDict()  # (band, tile_x, tile_y) -> Surface
+
+    def open(self, xs, ys, stars, center, explored=None):
+        """
+        Snapshot the body positions and open the map at sector level around `center`.
+
+        :param xs: Array of planet X coordinates.
+        :param ys: Array of planet Y coordinates.
+        :param stars: List of (x, y, radius, color) tuples for the suns.
+        :param center: (x, y) world position to center the view on.
+        :param explored: Optional ExploredMap used to mask unexplored regions.
+        """
+        self.stars = list(stars)
+        self.explored = explored
+        self.tree = PlanetQuadtree(xs, ys, [(s[0], s[1]) for s in self.stars] + [center])
+        fit_scale = min(self.width, self.height) / self.tree.size
+        sector_scale = min(self.width, self.height) / SECTOR_WORLD_SIZE
+        self.max_band = max(0, math.ceil(math.log2(max(sector_scale / fit_scale, 1.0))))
+        self.band = self.max_band
+        self.center_x, self.center_y = center
+        self.dragging = False
+        self.tiles.clear()
+
+    def scale(self, band=None):
+        """Return the pixels-per-world-unit factor of a zoom band."""
+        band = self.band if band is None else band
+        return min(self.width, self.height) / self.tree.size * (2 ** band)
+
+    def level_for_band(self, band):
+        """Return the quadtree level whose cells are at least GLYPH_CELL pixels wide in `band`."""
+        cell_pixels = self.scale(band) * self.tree.size
+        return max(0, min(self.tree.max_depth, int(math.log2(max(cell_pixels / GLYPH_CELL, 1)))))
+
+    def zoom(self, steps, anchor=None):
+        """
+        Change the zoom band, keeping the world point under `anchor` in place.
+
+        :param steps: Positive to zoom in, negative to zoom out.
+        :param anchor: Screen position to zoom around (defaults to the view center).
+        """
+        new_band = max(0, min(self.max_band, self.band + steps))
+        if new_band == self.band:
+            return
+        ax, ay = anchor if anchor else (self.width / 2, self.height / 2)
+        old_scale = self.scale()
+        world_x = self.center_x + (ax - self.width / 2) / old_scale
+        world_y = self.center_y + (ay - self.height / 2) / old_scale
+        self.band = new_band
+        new_scale = self.scale()
+        self.center_x = world_x - (ax - self.width / 2) / new_scale
+        self.center_y = world_y - (ay - self.height / 2) / new_scale
+
+    def handle_event(self, event):
+        """
+        Handle an input event.
+
+        :param event: Pygame event.
+        :return: False when the map should be closed, otherwise True.
+        """
+        if event.type == pygame.KEYDOWN:
+            if event.key in (pygame.K_m, pygame.K_ESCAPE):
+                return False
+            if event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+                self.zoom(1)
+            elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                self.zoom(-1)
+        elif event.type == pygame.MOUSEWHEEL:
+            self.zoom(1 if event.y > 0 else -1, pygame.mouse.get_pos())
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            self.dragging = True
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            self.dragging = False
+        elif event.type == pygame.MOUSEMOTION and self.dragging:
+            scale = self.scale()
+            self.center_x -= event.rel[0] / scale
+            self.center_y -= event.rel[1] / scale
+        return True
+
+    def update(self, keys):
+        """
+        Pan the view with the movement keys.
+
+        :param keys: Current key presses.
+        """
+        dx = keys[pygame.K_d] - keys[pygame.K_a]
+        dy = keys[pygame.K_s] - keys[pygame.K_w]
+        if dx or dy:
+            scale = self.scale()
+            self.center_x += dx * PAN_SPEED / scale
+            self.center_y += dy * PAN_SPEED / scale
+
+    def _render_tile(self, band, tile_x, tile_y):
+        """Rasterize the aggregate markers of one tile of a zoom band."""
+        tree = self.tree
+        scale = self.scale(band)
+        level = self.level_for_band(band)
+        tile = pygame.Surface((TILE_SIZE, TILE_SIZE)).convert()
+        tile.fill(BACKGROUND)
+
+        origin_x = tile_x * TILE_SIZE
+        origin_y = tile_y * TILE_SIZE
+        # Markers near the border spill into the neighbouring tile, so query with a margin.
+        margin = 2 * GLYPH_CELL / scale
+        left = tree.left + origin_x / scale
+        top = tree.top + origin_y / scale
+        right = left + TILE_SIZE / scale
+        bottom = top + TILE_SIZE / scale
+
+        for x, y, radius, color in self.stars:
+            if left - radius <= x <= right + radius and top - radius <= y <= bottom + radius:
+                center = (int((x - tree.left) * scale) - origin_x, int((y - tree.top) * scale) - origin_y)
+                pygame.draw.circle(tile, color, center, max(3, int(radius * scale)))
+
+        nodes = tree.levels[level]
+        found = tree.query(level, left - margin, top - margin, right + margin, bottom + margin)
+        if not len(found):
+            return tile
+        px = ((nodes["x"][found] - tree.left) * scale).astype(np.int64) - origin_x
+        py = ((nodes["y"][found] - tree.top) * scale).astype(np.int64) - origin_y
+        counts = nodes["count"][found]
+        max_radius = GLYPH_CELL // 2 - 1
+        for x, y, count in zip(px.tolist(), py.tolist(), counts.tolist()):
+            if count == 1:
+                pygame.draw.circle(tile, PLANET_COLOR, (x, y), 2)
+                continue
+            radius = min(max_radius, 3 + int(2 * math.log2(count)))
+            pygame.draw.circle(tile, CLUSTER_COLOR, (x, y), radius, 1)
+            if radius >= 7:
+                label = render_text(str(count) if count < 1000 else f"{count // 1000}k", MAP_FONT, WHITE)
+                tile.blit(label, label.get_rect(center=(x, y)))
+            else:
+                pygame.draw.circle(tile, CLUSTER_COLOR, (x, y), 2)
+        return tile
+
+    def _get_tile(self, band, tile_x, tile_y, deadline):
+        """Return a cached tile, rendering it if there is still time in this frame."""
+        key = (band, tile_x, tile_y)
+        tile = self.tiles.get(key)
+        if tile is not None:
+            self.tiles.move_to_end(key)
+            return tile
+        if time.perf_counter() > deadline:
+            return None
+        tile = self._render_tile(band, tile_x, tile_y)
+        if self.explored is not None:
+            scale = self.scale(band)
+            fog = self.explored.fog_for_region(self.tree.left + tile_x * TILE_SIZE / scale,
+                                               self.tree.top + tile_y * TILE_SIZE / scale,
+                                               TILE_SIZE / scale, TILE_SIZE / scale, (TILE_SIZE, TILE_SIZE))
+            tile.blit(fog, (0, 0))
+        self.tiles[key] = tile
+        if len(self.tiles) > MAX_CACHED_TILES:
+            self.tiles.popitem(last=False)
+        return tile
+
+    def draw(self, surface, player_x, player_y):
+        """
+        Draw the map view and the player's position.
+
+        :param surface: Pygame surface to draw on.
+        :param player_x: Player X coordinate.
+        :param player_y: Player Y coordinate.
+        """
+        surface.fill(BACKGROUND)
+        tree = self.tree
+        scale = self.scale()
+        view_x = (self.center_x - tree.left) * scale - self.width / 2
+        view_y = (self.center_y - tree.top) * scale - self.height / 2
+
+        # Tiles that miss the per-frame budget are filled in on the next frames.
+        deadline = time.perf_counter() + TILE_BUDGET_MS / 1000
+        for tile_y in range(math.floor(view_y / TILE_SIZE), math.floor((view_y + self.height) / TILE_SIZE) + 1):
+            for tile_x in range(math.floor(view_x / TILE_SIZE), math.floor((view_x + self.width) / TILE_SIZE) + 1):
+                tile = self._get_tile(self.band, tile_x, tile_y, deadline)
+                if tile is not None:
+                    surface.blit(tile, (int(tile_x * TILE_SIZE - view_x), int(tile_y * TILE_SIZE - view_y)))
+
+        player_pos = (int((player_x - tree.left) * scale - view_x), int((player_y - tree.top) * scale - view_y))
+        pygame.draw.circle(surface, PLAYER_COLOR, player_pos, 5)
+        pygame.draw.circle(surface, WHITE, player_pos, 8, 1)
+
+        visible_width = self.width / scale
+        hud = get_font(*HUD_FONT).render(f"Galaxy map - {int(visible_width)} units across   "
+                              "[wheel/+/-] zoom   [drag/WASD] pan   [M] close", True, WHITE)
+        surface.blit(hud, (20, self.height - 40))
@@ -2,6 +2,10 @@ import pygame
 import random
 import math
 from utils import WIDTH, HEIGHT
+from classes.sprite_bank import sprite_bank
+from classes.station_menu import StationMenuScene
+from render_queue import LAYER_STATIONS
+from assets import assets
 
 """
 Module: hub_ship
@@ -10,11 +14,20 @@ Defines the hub_ship class which handles movement and interactions at a central
 
 
 MARGIN = 200
+SPRITE_PATH = "sprites/hub_ship.png"
+BACKGROUND_PATH = "sprites/hub_main_room.jpg"
+assets.declare(SPRITE_PATH)
+assets.declare(BACKGROUND_PATH, (WIDTH, HEIGHT), alpha=False)
 
-class hub_ship:
-    _original_sprite = None  # Class variable to store the default sprite.
-    _sprite_active = None    # Class variable to store the active sprite.
+# Predefined communications dialogue
+DIALOGUE = [
+    "Welcome to the Hub!",
+    "Here you can transfer passengers and cargo",
+    "between your ship and the station.",
+    "Missions can be completed here."
+]
 
+class hub_ship:
     def __init__(self, loc, data, scale_factor=1):
         """
         Initialize the hub ship.
@@ -24,9 +37,6 @@ class hub_ship:
         :param data: Game data containing current planet and other information.
         :param scale_factor: Scaling factor for the hub_ship sprite.
         """
-        if hub_ship._original_sprite is None:
-            hub_ship._original_sprite = pygame.image.load("sprites/hub_ship.png").convert_alpha()
-
         self.x = loc[0]
         self.y = loc[1]
         self.width = 469
@@ -34,29 +44,33 @@ class hub_ship:
         self.angle = 0
         self.border_radius = 200
         self.scale_factor = scale_factor
-        self.sprite = self.get_scaled_sprite(hub_ship._original_sprite)
+        self.sprite = sprite_bank.get_scaled(SPRITE_PATH, self.scale_factor)
         self.planet = data[0]
 
         
-    def get_scaled_sprite(self, base_sprite):
-        """Return a scaled version of the provided sprite."""
-        width = int(base_sprite.get_width() * self.scale_factor)
-        height = int(base_sprite.get_height() * self.scale_factor)
-        return pygame.transform.scale(base_sprite, (width, height))
     
-    def draw(self, screen, camera_x, camera_y):
+    def submit(self, queue, camera_x, camera_y):
         """
-        Draw the hub_ship on the screen.
+        Queue the hub_ship sprite on the station layer of a RenderQueue.
         
-        :param screen: Pygame display surface.
+        :param queue: RenderQueue of the frame.
         :param camera_x: Camera X offset.
         :param camera_y: Camera Y offset.
         """
         screen_pos = (self.x - camera_x, self.y - camera_y)
-        rotated_image = pygame.transform.rotate(self.sprite, self.angle)
-        rotated_rect = rotated_image.get_rect(center=screen_pos)
-        screen.blit(rotated_image, rotated_rect.topleft)
-        pygame.draw.circle(screen, (255, 255, 255), screen_pos, self.border_radius, 3)
+        sprite_bank.submit_rotated(queue, LAYER_STATIONS, SPRITE_PATH, self.scale_factor, self.angle, screen_pos)
+
+    def draw_border(self, screen, camera_x, camera_y, scale=1.0):
+        """
+        Draw the interaction border around the hub_ship, over its sprite.
+        
+        :param screen: Pygame display surface.
+        :param camera_x: Camera X offset.
+        :param camera_y: Camera Y offset.
+        :param scale: Render scale of the surface drawn on.
+        """
+        screen_pos = ((self.x - camera_x) * scale, (self.y - camera_y) * scale)
+        pygame.draw.circle(screen, (255, 255, 255), screen_pos, self.border_radius * scale, max(1, round(3 * scale)))
 
     def check_border(self, player_x, player_y):
         """
@@ -83,131 +97,6 @@ class hub_ship:
         """
         pass
 
-    def hub_menu(self, screen, player, update_player_missions):
-        # Load background image (comm_room.jpg)
-        background = pygame.image.load("sprites/hub_main_room.jpg").convert()
-        background = pygame.transform.scale(background, (WIDTH, HEIGHT))
-        
-        running_menu = True
-        # Use a monospaced, terminal-like font (Courier New or similar)
-        font_name = pygame.font.match_font("courier")  # returns a path to a courier-like font
-        font = pygame.font.Font(font_name, 32)
-        small_font = pygame.font.Font(font_name, 28)
-        smaller_font = pygame.font.Font(font_name, 20)
-        
-        font.set_bold(True)
-        small_font.set_bold(True)
-        smaller_font.set_bold(True)
-        
-        # Define green color (bright terminal green)
-        terminal_green = (0, 255, 0)
-        
-        mission_data = [self.planet, "hub"]
-        
-        
-        comms_button = pygame.Rect(455, 515, 135, 120)   # Communications
-        missions_button = pygame.Rect(875, 540, 185, 132)  # Missions
-        exit_button = pygame.Rect(1600, 395, 64, 100)      # Exit
-
-        while running_menu:
-            try:
-                # Get current time for notifications
-                current_time = pygame.time.get_ticks()
-                
-                screen.blit(background, (0, 0))
-                
-                # Draw semi-transparent overlay (optional, for button contrast)
-                overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-                overlay.fill((0, 0, 0, 100))  # Black with alpha 100
-                screen.blit(overlay, (0, 0))
-                
-                # Update notifications
-                update_player_missions(mission_data[0], mission_data[1])
-
-                # Get the global notification system
-                from game import notification_system
-                notification_system.update(current_time)
-                notification_system.render(screen, current_time)
-
-                # Add text to buttons
-                comms_text = font.render("Comms", True, terminal_green)
-                update_rect = comms_text.get_rect(center=(comms_button.centerx, comms_button.centery - 5))
-                missions_text = font.render("Missions", True, terminal_green)
-                exit_text = smaller_font.render("Exit", True, terminal_green)
-                screen.blit(comms_text, update_rect)
-                screen.blit(missions_text, missions_text.get_rect(center=missions_button.center))
-                screen.blit(exit_text, exit_text.get_rect(center=exit_button.center))
-                
-            except Exception as e:
-                print(f"Error in hub menu: {e}")
-            
-            pygame.display.flip()
-            
-            # Event loop for menu
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    exit()
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    # Check if any button was clicked
-                    mouse_pos = pygame.mouse.get_pos()
-                    if comms_button.collidepoint(mouse_pos):
-                        # Show predefined communications dialogue
-                        self.show_communications_dialog(screen, player)
-                    elif missions_button.collidepoint(mouse_pos):
-                        # Show hardcoded missions list
-                        self.show_missions(screen, player)
-                    elif exit_button.collidepoint(mouse_pos):
-                        running_menu = False
-                        return "planet"
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        running_menu = False
-                        return "planet"
-
-    def show_communications_dialog(self, screen, player):
-        """Display predefined communications dialogue."""
-        font = pygame.font.Font(None, 32)
-        dialogue = [
-            "Welcome to the Hub!",
-            "Here you can transfer passengers and cargo",
-            "between your ship and the station.",
-            "Missions can be completed here."
-        ]
-        running_dialog = True
-        while running_dialog:
-            try:
-                current_time = pygame.time.get_ticks()
-                
-                screen.fill((0, 0, 0))
-                for idx, line in enumerate(dialogue):
-                    line_surface = font.render(line, True, (255, 255, 255))
-                    line_rect = line_surface.get_rect(center=(WIDTH // 2, 100 + idx * 40))
-                    screen.blit(line_surface, line_rect)
-                
-                prompt_surface = font.render("Press any key to return", True, (255, 255, 255))
-                prompt_rect = prompt_surface.get_rect(center=(WIDTH // 2, HEIGHT - 50))
-                screen.blit(prompt_surface, prompt_rect)
-                
-                # Get the global notification system safely
-                try:
-                    from game import notification_system
-                    notification_system.update(current_time)
-                    notification_system.render(screen, current_time)
-                except Exception as e:
-                    print(f"Error rendering notifications: {e}")
-                
-                pygame.display.flip()
-                
-            except Exception as e:
-                print(f"Error in communications dialog: {e}")
-                
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    exit()
-                elif event.type == pygame.KEYDOWN:
-                    running_dialog = False
-
-    def show_missions(self, screen, player):
-        pass
\ No newline at end of file
+    def menu_scene(self):
+        """Return the scene of the hub's menu, shown while the player is docked."""
+        return StationMenuScene(BACKGROUND_PATH, "hub", DIALOGUE)
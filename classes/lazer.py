@@ -1,4 +1,5 @@
 import math, pygame
+from classes.particles import particles
 class lazer_beam:
     def __init__(self, x, y, angle, color = (255, 0, 0), speed=20, max_distance=500):
         self.x = x
@@ -23,6 +24,7 @@ class lazer_beam:
             distance = math.sqrt((self.x - target.x) ** 2 + (self.y - target.y) ** 2)
             if distance <= target_radius:
                 self.active = False
+                particles.emit_impact(self.x, self.y, -math.radians(self.angle))
                 return True
             
     def draw(self, screen, camera_x, camera_y):
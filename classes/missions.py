@@ -3,6 +3,13 @@ Module: missions
 Defines the Mission and MissionStep classes for the Infinite Horizons game.
 """
 import pygame
+from assets import assets
+
+TASK_ICON_PATH = "icons/checkmark.png"
+MISSION_ICON_PATH = "icons/checkmark.png"
+# Notification popups show their icons at 32x32
+assets.declare(TASK_ICON_PATH, (32, 32))
+assets.declare(MISSION_ICON_PATH, (32, 32))
 
 class TaskDeliver: # Deliver something to a planet or orbiting ship
     def __init__(self, current_planet,endpoint_planet):
@@ -101,7 +108,7 @@ class MissionStep:
                 notification_system.add_popup(
                     title="Task Complete!", 
                     message=self.description,
-                    icon="../icons/checkmark.png"  # Path to icon could be customized
+                    icon=TASK_ICON_PATH
                 )
                 self.notified = True
                 
@@ -177,7 +184,7 @@ class Mission:
                 notification_system.add_popup(
                     title="Mission Complete!",
                     message=f"{self.title} - Reward: {self.reward}",
-                    icon="../icons/mission_complete.png",  # Fixed path with extension
+                    icon=MISSION_ICON_PATH,
                     is_mission=True
                 )
                 self.notified = True
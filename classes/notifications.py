@@ -4,6 +4,8 @@ Defines notification and achievement popup systems for Infinite Horizons.
 """
 
 import pygame
+from quality import governor
+from assets import assets
 
 class AchievementPopup:
     def __init__(self):
@@ -54,19 +56,22 @@ class AchievementPopup:
         icon_surface = None
         if icon:
             try:
-                icon_surface = pygame.image.load(icon)
-                icon_surface = pygame.transform.scale(icon_surface, (32, 32))
+                icon_surface = assets.image(icon, (32, 32))
             except:
                 print(f"Warning: Could not load icon: {icon}")
         
-        self.active_popups.append({
+        popup = {
             "title": title,
             "message": message,
             "icon": icon_surface,
             "creation_time": 0,  # Will be set when rendering starts
             "is_visible": False,
-            "is_mission": is_mission
-        })
+            "is_mission": is_mission,
+            "surface": None
+        }
+        # Composed once here; rendering only fades and blits it
+        popup["surface"] = self._compose(popup)
+        self.active_popups.append(popup)
         
         # Play sound
         if self.sound_enabled:
@@ -95,16 +100,12 @@ class AchievementPopup:
         """
         self.active_popups = []
     
-    def render(self, screen, current_time):
+    def _compose(self, popup):
         """
-        Render all active popups to the screen.
-        
-        :param screen: Pygame screen to render to
-        :param current_time: Current game time in milliseconds
+        Draw a popup's background, border, icon and text onto a surface of its own.
+
+        :return: SRCALPHA surface at full opacity, or None if the fonts are unavailable.
         """
-        if not self.active_popups:
-            return
-            
         # Initialize font if not already done
         if not hasattr(self, 'title_font'):
             try:
@@ -112,7 +113,52 @@ class AchievementPopup:
                 self.message_font = pygame.font.SysFont(None, self.font_size)
             except:
                 print("Warning: Could not initialize fonts")
-                return
+                return None
+
+        popup_surface = pygame.Surface((self.popup_width, self.popup_height), pygame.SRCALPHA)
+
+        # Create fixed-length RGBA tuples for colors
+        bg_color = tuple(self.bg_color[:3]) + (self.bg_color[3] if len(self.bg_color) > 3 else 255,)
+        border_color = tuple(self.border_color[:3]) + (255,)
+
+        # Draw background and border
+        pygame.draw.rect(popup_surface, bg_color,
+                        (0, 0, self.popup_width, self.popup_height),
+                        border_radius=8)
+
+        pygame.draw.rect(popup_surface, border_color,
+                        (0, 0, self.popup_width, self.popup_height),
+                        width=self.border_width, border_radius=8)
+
+        # Render texts with correct colors
+        title_text = self.title_font.render(popup["title"], True, self.title_color)
+        message_text = self.message_font.render(popup["message"], True, self.text_color)
+
+        # Position and draw content
+        icon_width = 0
+        if popup["icon"]:
+            popup_surface.blit(popup["icon"], (self.padding, (self.popup_height - 32) // 2))
+            icon_width = 32 + self.padding
+
+        # Draw text
+        popup_surface.blit(title_text, (icon_width + self.padding, self.padding))
+        popup_surface.blit(message_text, (icon_width + self.padding, self.padding + title_text.get_height() + 5))
+        return popup_surface
+
+    def render(self, screen, current_time):
+        """
+        Render all active popups to the screen.
+
+        Each popup was composed when it was added; fading only changes the alpha of that
+        surface, so a visible popup costs one blit per frame.
+        
+        :param screen: Pygame screen to render to
+        :param current_time: Current game time in milliseconds
+        :return: List of the screen rects covered by popups this frame
+        """
+        drawn = []
+        if not self.active_popups:
+            return drawn
         
         # Position notifications in top-right corner
         screen_width = screen.get_width()
@@ -124,54 +170,27 @@ class AchievementPopup:
             try:
                 if not popup["is_visible"]:
                     continue
+                if popup["surface"] is None:
+                    # Fonts were unavailable when it was added
+                    popup["surface"] = self._compose(popup)
+                    if popup["surface"] is None:
+                        return drawn
                     
                 elapsed = current_time - popup["creation_time"]
                 
-                # Handle fade in/out
+                # Handle fade in/out (skipped at reduced quality levels)
                 alpha = 255
-                if elapsed < self.fade_time:
-                    alpha = int(255 * (elapsed / self.fade_time))
-                elif elapsed > self.display_time - self.fade_time:
-                    alpha = int(255 * (1 - (elapsed - (self.display_time - self.fade_time)) / self.fade_time))
-                
-                # Create notification surface with transparency
-                popup_surface = pygame.Surface((self.popup_width, self.popup_height), pygame.SRCALPHA)
-                
-                # Create fixed-length RGBA tuples for colors
-                bg_color = tuple(self.bg_color[:3]) + (int(self.bg_color[3] * alpha / 255) if len(self.bg_color) > 3 else alpha,)
-                border_color = tuple(self.border_color[:3]) + (alpha,)
-                
-                # Draw background and border
-                pygame.draw.rect(popup_surface, bg_color, 
-                                (0, 0, self.popup_width, self.popup_height), 
-                                border_radius=8)
-                
-                pygame.draw.rect(popup_surface, border_color, 
-                                (0, 0, self.popup_width, self.popup_height), 
-                                width=self.border_width, border_radius=8)
-                
-                # Render texts with correct colors
-                title_text = self.title_font.render(popup["title"], True, self.title_color)
-                title_text.set_alpha(alpha)
-                
-                message_text = self.message_font.render(popup["message"], True, self.text_color)
-                message_text.set_alpha(alpha)
-                
-                # Position and draw content
-                icon_width = 0
-                if popup["icon"]:
-                    # Apply alpha to icon
-                    icon = popup["icon"].copy()
-                    icon.set_alpha(alpha)
-                    popup_surface.blit(icon, (self.padding, (self.popup_height - 32) // 2))
-                    icon_width = 32 + self.padding
-                
-                # Draw text
-                popup_surface.blit(title_text, (icon_width + self.padding, self.padding))
-                popup_surface.blit(message_text, (icon_width + self.padding, self.padding + title_text.get_height() + 5))
+                if governor.settings["notification_fades"]:
+                    if elapsed < self.fade_time:
+                        alpha = int(255 * (elapsed / self.fade_time))
+                    elif elapsed > self.display_time - self.fade_time:
+                        alpha = int(255 * (1 - (elapsed - (self.display_time - self.fade_time)) / self.fade_time))
                 
-                # Draw to screen
-                screen.blit(popup_surface, (x_position, y_offset))
+                # Draw to screen, faded through the surface alpha
+                popup_surface = popup["surface"]
+                if popup_surface.get_alpha() != alpha:
+                    popup_surface.set_alpha(alpha)
+                drawn.append(screen.blit(popup_surface, (x_position, y_offset)))
                 
                 # Increment for next popup
                 y_offset += self.popup_height + 10
@@ -185,6 +204,7 @@ class AchievementPopup:
             # Limit number of visible popups
             if y_offset > screen.get_height() - self.popup_height:
                 break
+        return drawn
 
     def set_theme(self, bg_color=None, title_color=None, text_color=None, border_color=None):
         """
@@ -203,3 +223,6 @@ class AchievementPopup:
             self.text_color = text_color
         if border_color:
             self.border_color = border_color
+        # Popups already shown are composed again in the new colors
+        for popup in self.active_popups:
+            popup["surface"] = self._compose(popup)
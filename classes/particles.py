@@ -0,0 +1,263 @@
+"""
+Module: particles
+Defines the ParticleSystem class: a fixed pool of particles whose state lives in preallocated
+NumPy arrays, updated in one vectorized pass and drawn as one batch of pre-rendered sprites.
+Free slots are kept on a stack, so emitting and expiring particles never reallocates the pool.
+"""
+
+import math
+import numpy as np
+import pygame
+from quality import governor
+
+PARTICLE_CAPACITY = 4096      # Slots in the pool; the quality budget can only lower this.
+FADE_STEPS = 8                # Pre-rendered opacity steps per particle color.
+DRAG = 0.94                   # Velocity kept per tick.
+
+# Particle colors: (RGB, sprite diameter in pixels). Particles store an index into this table.
+PARTICLE_COLORS = (
+    ((255, 160, 50), 7),      # Exhaust flame
+    ((255, 240, 190), 4),     # Exhaust core
+    ((255, 90, 60), 3),       # Laser spark
+    ((255, 210, 110), 12),    # Explosion flash
+    ((110, 110, 120), 10),    # Smoke
+)
+EXHAUST, EXHAUST_CORE, SPARK, FLASH, SMOKE = range(len(PARTICLE_COLORS))
+
+EXHAUST_PER_TICK = 3          # Particles emitted per tick while a ship boosts.
+EXHAUST_OFFSET = 25           # Distance behind the ship's center where exhaust appears.
+IMPACT_SPARKS = 14
+EXPLOSION_PARTICLES = (60, 30)  # Flash and smoke particles of an explosion.
+
+
+def _make_particle_surface(color, diameter, opacity):
+    """Draw a soft round particle: a disc whose alpha falls off towards the rim."""
+    surface = pygame.Surface((diameter, diameter), pygame.SRCALPHA)
+    center = diameter / 2
+    rings = max(1, diameter // 2)
+    for i in range(rings):
+        radius = center * (1 - i / rings)
+        alpha = int(255 * opacity * (i + 1) / rings)
+        pygame.draw.circle(surface, color + (alpha,), (center, center), radius)
+    return surface
+
+
+class ParticleSystem:
+    _sprites = None      # Class variable holding the sprite bank, color-major (premultiplied alpha).
+    _half_sizes = None   # Class variable holding (half_width, half_height) per sprite.
+    _scaled_banks = {}   # Render scale -> (sprites, half sizes), for rendering below full resolution.
+
+    def __init__(self, capacity=PARTICLE_CAPACITY, seed=None):
+        """
+        Initialize an empty particle pool.
+
+        Particles are cosmetic, so they draw from their own generator and leave the simulation's
+        random state alone (input replays stay exact).
+
+        :param capacity: Number of particle slots.
+        :param seed: Optional seed for the particle generator.
+        """
+        self.capacity = capacity
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.life = np.zeros(capacity)       # Ticks left; a slot is free once it reaches zero.
+        self.max_life = np.ones(capacity)
+        self.color = np.zeros(capacity, dtype=np.int32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.free = np.arange(capacity - 1, -1, -1, dtype=np.int32)  # Stack of free slots, top at the end.
+        self.free_count = capacity
+        self.rng = np.random.default_rng(seed)
+        self.emitted = 0
+        self.dropped = 0
+
+    @classmethod
+    def _build_sprite_bank(cls):
+        """Render every particle color once per fade step."""
+        sprites = []
+        half_sizes = []
+        for color, diameter in PARTICLE_COLORS:
+            for step in range(FADE_STEPS):
+                sprite = _make_particle_surface(color, diameter, (step + 1) / FADE_STEPS).convert_alpha()
+                sprites.append(sprite.premul_alpha())
+                half_sizes.append((diameter // 2, diameter // 2))
+        cls._sprites = sprites
+        cls._half_sizes = np.array(half_sizes, dtype=np.int32)
+
+    @classmethod
+    def _sprite_bank(cls, scale):
+        """Return the sprites and half sizes for a render scale, building or scaling them on first use."""
+        if cls._sprites is None:
+            cls._build_sprite_bank()
+        if scale == 1.0:
+            return cls._sprites, cls._half_sizes
+        if scale not in cls._scaled_banks:
+            sprites = [pygame.transform.smoothscale(sprite, (max(1, int(sprite.get_width() * scale)),
+                                                             max(1, int(sprite.get_height() * scale))))
+                       for sprite in cls._sprites]
+            half_sizes = np.array([(sprite.get_width() // 2, sprite.get_height() // 2) for sprite in sprites],
+                                  dtype=np.int32)
+            cls._scaled_banks[scale] = (sprites, half_sizes)
+        return cls._scaled_banks[scale]
+
+    def __len__(self):
+        return self.capacity - self.free_count
+
+    def budget(self):
+        """Return the number of particles that may be alive at the current quality level."""
+        return min(self.capacity, governor.settings["particle_budget"])
+
+    def emit(self, x, y, count, color, speed, direction=None, spread=math.pi, life=(20, 40),
+             base_velocity=(0.0, 0.0), jitter=0.0):
+        """
+        Emit a burst of particles from a point.
+
+        Bursts beyond the particle budget are cut short rather than evicting live particles.
+
+        :param x: World X coordinate.
+        :param y: World Y coordinate.
+        :param count: Number of particles requested.
+        :param color: Index into PARTICLE_COLORS.
+        :param speed: (min, max) speed in pixels per tick.
+        :param direction: Mean direction in radians (screen axes, Y down); None emits in all directions.
+        :param spread: Half-angle of the cone around `direction`, in radians.
+        :param life: (min, max) lifetime in ticks.
+        :param base_velocity: Velocity added to every particle, e.g. the emitter's own.
+        :param jitter: Radius of the random offset of the spawn positions.
+        :return: Number of particles emitted.
+        """
+        n = min(count, self.budget() - len(self))
+        if n <= 0:
+            self.dropped += count
+            return 0
+        self.dropped += count - n
+        self.free_count -= n
+        slots = self.free[self.free_count:self.free_count + n]
+
+        rng = self.rng
+        if direction is None:
+            theta = rng.uniform(0, 2 * math.pi, n)
+        else:
+            theta = direction + rng.uniform(-spread, spread, n)
+        magnitude = rng.uniform(speed[0], speed[1], n)
+        self.vel[slots, 0] = np.cos(theta) * magnitude + base_velocity[0]
+        self.vel[slots, 1] = np.sin(theta) * magnitude + base_velocity[1]
+        self.pos[slots, 0] = x
+        self.pos[slots, 1] = y
+        if jitter:
+            self.pos[slots] += rng.uniform(-jitter, jitter, (n, 2))
+        self.life[slots] = rng.uniform(life[0], life[1], n)
+        self.max_life[slots] = self.life[slots]
+        self.color[slots] = color
+        self.alive[slots] = True
+        self.emitted += n
+        return n
+
+    def emit_exhaust(self, x, y, direction, ship_speed):
+        """
+        Emit boost exhaust behind a ship.
+
+        :param x: Ship center X.
+        :param y: Ship center Y.
+        :param direction: Direction the ship moves in, in radians (screen axes, Y down).
+        :param ship_speed: Distance the ship moves per tick; the exhaust inherits part of it.
+        """
+        back = direction + math.pi
+        nozzle_x = x + math.cos(back) * EXHAUST_OFFSET
+        nozzle_y = y + math.sin(back) * EXHAUST_OFFSET
+        carry = (math.cos(direction) * ship_speed * 0.5, math.sin(direction) * ship_speed * 0.5)
+        self.emit(nozzle_x, nozzle_y, EXHAUST_PER_TICK, EXHAUST, (2.0, 5.0), back, 0.3, (12, 24), carry, 3)
+        self.emit(nozzle_x, nozzle_y, 1, EXHAUST_CORE, (1.0, 3.0), back, 0.15, (6, 12), carry)
+
+    def emit_impact(self, x, y, direction):
+        """
+        Emit sparks where a shot hit something; they fly back the way the shot came.
+
+        :param direction: Direction the shot travelled in, in radians (screen axes, Y down).
+        """
+        self.emit(x, y, IMPACT_SPARKS, SPARK, (2.0, 7.0), direction + math.pi, 0.9, (8, 18))
+
+    def emit_explosion(self, x, y):
+        """Emit the flash and smoke of a destroyed ship."""
+        flash, smoke = EXPLOSION_PARTICLES
+        self.emit(x, y, flash, FLASH, (1.0, 9.0), life=(15, 35), jitter=6)
+        self.emit(x, y, smoke, SMOKE, (0.5, 3.0), life=(40, 80), jitter=12)
+
+    def update(self, dt=1.0):
+        """
+        Advance every live particle by dt ticks and return expired slots to the free stack.
+
+        :param dt: Number of ticks to advance.
+        """
+        if self.free_count == self.capacity:
+            return
+        live = np.flatnonzero(self.alive)
+        self.pos[live] += self.vel[live] * dt
+        self.vel[live] *= DRAG ** dt
+        self.life[live] -= dt
+        expired = live[self.life[live] <= 0]
+        if expired.size:
+            self.alive[expired] = False
+            self.free[self.free_count:self.free_count + expired.size] = expired
+            self.free_count += expired.size
+
+    def clear(self):
+        """Remove every particle, e.g. when the view changes to another coordinate space."""
+        self.alive[:] = False
+        self.life[:] = 0
+        self.free[:] = np.arange(self.capacity - 1, -1, -1, dtype=np.int32)
+        self.free_count = self.capacity
+
+    def _blits(self, viewport, scale, camera_x, camera_y, alpha):
+        """Return the Surface.blits items of the visible particles."""
+        if self.free_count == self.capacity:
+            return []
+        live = np.flatnonzero(self.alive)
+        # Positions are extrapolated back from the latest tick, like the interpolated ship
+        back = alpha - 1.0
+        screen_x = (self.pos[live, 0] + self.vel[live, 0] * back - camera_x) * scale
+        screen_y = (self.pos[live, 1] + self.vel[live, 1] * back - camera_y) * scale
+        left, top, right, bottom = viewport
+        margin = max(diameter for _, diameter in PARTICLE_COLORS)
+        visible = np.nonzero((screen_x > left - margin) & (screen_x < right + margin) &
+                             (screen_y > top - margin) & (screen_y < bottom + margin))[0]
+        if not visible.size:
+            return []
+        slots = live[visible]
+        step = np.minimum(FADE_STEPS - 1, (self.life[slots] / self.max_life[slots] * FADE_STEPS).astype(np.int32))
+        sprite = self.color[slots] * FADE_STEPS + step
+        sprites, half_sizes = ParticleSystem._sprite_bank(scale)
+        half = half_sizes[sprite]
+        dest_x = (screen_x[visible] - half[:, 0]).astype(np.int32).tolist()
+        dest_y = (screen_y[visible] - half[:, 1]).astype(np.int32).tolist()
+        blend = pygame.BLEND_PREMULTIPLIED
+        return [(sprites[s], (x, y), None, blend) for s, x, y in zip(sprite.tolist(), dest_x, dest_y)]
+
+    def submit(self, queue, layer, camera_x, camera_y, alpha=1.0):
+        """
+        Queue the visible particles on a RenderQueue world layer as one batch.
+
+        :param queue: RenderQueue of the frame.
+        :param layer: Layer constant; items keep their order within it, so exhaust submitted
+                      before the ship is drawn under it.
+        :param camera_x: Camera X offset.
+        :param camera_y: Camera Y offset.
+        :param alpha: Interpolation factor between the previous and current simulation tick.
+        """
+        items = self._blits(queue.viewport, queue.scale, camera_x, camera_y, alpha)
+        if items:
+            queue.extend(layer, items)
+
+    def draw(self, screen, camera_x, camera_y, alpha=1.0):
+        """Draw the visible particles straight onto a surface with one blits call."""
+        items = self._blits((0, 0) + screen.get_size(), 1.0, camera_x, camera_y, alpha)
+        if items:
+            screen.blits(items, doreturn=False)
+
+    def stats(self):
+        """Return the pool occupancy and emission counters."""
+        return {"live": len(self), "capacity": self.capacity, "budget": self.budget(),
+                "emitted": self.emitted, "dropped": self.dropped}
+
+
+# Shared particle pool for the game views.
+particles = ParticleSystem()
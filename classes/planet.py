@@ -1,177 +1,121 @@
 """
 Module: planet
 Defines the Planet class for the Infinite Horizons game.
-Generates planet sprites and handles drawing and loading from save data.
+A Planet is a lightweight view of one row of the PlanetCatalog and handles drawing.
 """
 
 import pygame
-if not pygame.font.get_init():
-    pygame.font.init()
-import random
-import os
-from PIL import Image
-from planet_texture import generate_and_save_planet_sprite, pil_to_pygame
-from utils import get_cached_sprite
+from planet_texture import THEMES
+from text_service import render_text
+from classes.sprite_cache import sprite_cache, quantize_length
+from render_queue import LAYER_PLANETS, LAYER_LABELS
 
-PLANET_FONT = pygame.font.SysFont(None, 20)
+PLANET_FONT = (None, 20)
 WHITE = (255, 255, 255)
-
-def surface_to_pil(surface):
-    """Convert a Pygame surface to a PIL image."""
-    data_str = pygame.image.tostring(surface, "RGBA")
-    size = surface.get_size()
-    return Image.frombytes("RGBA", size, data_str)
+PLANET_TYPES = ['Terrestrial', 'Gas Giant', 'Ice Giant', 'Dwarf']
+PLANET_RES = 256  # Resolution of a planet sprite.
 
 class Planet:
-    def __init__(self, x, y, save_folder, planet_id):
+    def __init__(self, catalog, index):
         """
-        Initialize a Planet instance.
+        Initialize a Planet view.
         
-        :param x: X coordinate.
-        :param y: Y coordinate.
-        :param save_folder: Folder to save the planet sprite.
-        :param planet_id: Unique identifier for the planet.
+        :param catalog: PlanetCatalog holding the planet's columns.
+        :param index: Row of the planet in the catalog.
         """
-        os.makedirs(save_folder, exist_ok=True)
-        self.x = x
-        self.y = y
-        self.id = planet_id
-        self.res = 256
-        self.type = random.choice(['Terrestrial', 'Gas Giant', 'Ice Giant', 'Dwarf'])
-        self.minerals = random.sample(
-            ['Iron', 'Gold', 'Silver', 'Copper', 'Uranium', 'Platinum'],
-            random.randint(1, 3)
-        )
-        self.habitability = random.uniform(0, 1)  # 0 (inhospitable) to 1 (earth-like)
-        self.name = self.generate_name()
-        self.scale = random.uniform(0.5, 6.0)
+        self.catalog = catalog
+        self.index = index
+        self.id = index
+        self.res = PLANET_RES
+        self.type = PLANET_TYPES[catalog.type[index]]
+        self.minerals = list(catalog.mineral_sets[catalog.minerals_id[index]])
+        self.habitability = float(catalog.habitability[index])  # 0 (inhospitable) to 1 (earth-like)
+        self.name = catalog.names[catalog.name_id[index]]
+        self.scale = float(catalog.scale[index])
+        self.theme_name = THEMES[catalog.theme[index]]["name"]
         self.color = WHITE
-        
-        self.cached_scaled_sprite = None
-        self.cached_scale = None
-        self.cached_mini_sprite = None
-        self.cached_mini_scale = None
 
-        # Generate planet sprite and associated theme.
-        temp = random.randint(-50, 50)
-        self.pil_sprite, theme = generate_and_save_planet_sprite(
-            self.res, temp, planet_index=self.id, save_folder=save_folder
-        )
-        self.sprite = pil_to_pygame(self.pil_sprite)
-        self.theme_name = theme["name"]
-        self.missions = []
+        # Missions live in the catalog so they survive the view being released.
+        self.missions = catalog.missions.setdefault(index, [])
+
+        self._sprite = None
+
+    @property
+    def x(self):
+        """Current X coordinate, read live from the catalog."""
+        return self.catalog.planet_x(self.index)
+
+    @property
+    def y(self):
+        """Current Y coordinate, read live from the catalog."""
+        return self.catalog.planet_y(self.index)
 
-    def generate_name(self):
-        """Generate a random planet name."""
-        prefixes = ['Alpha', 'Beta', 'Gamma', 'Delta', 'Epsilon', 'Zeta', 'Nova']
-        suffixes = ['I', 'II', 'III', 'IV', 'V', 'Prime', 'Major']
-        return f"{random.choice(prefixes)}-{random.choice(suffixes)}"
+    @property
+    def sprite(self):
+        """Planet sprite, or the theme placeholder while it is being loaded or generated."""
+        if self._sprite is None:
+            self._sprite = self.catalog.take_sprite(self.index)
+            if self._sprite is None:
+                return self.catalog.placeholder(self.index)
+        return self._sprite
 
-    def draw(self, surface, camera_x, camera_y):
+    def sprite_key(self):
+        """Stable cache key of the current sprite: the planet's own sprite, or its theme placeholder."""
+        if self._sprite is None:
+            return self.catalog.placeholder_key(self.index)
+        return ("planet", self.catalog.save_folder, self.index)
+
+    def get_sized_sprite(self, size, cache=sprite_cache):
+        """Return the sprite scaled to `size` through a sprite cache (the shared one by default)."""
+        sprite = self.sprite
+        return cache.get_scaled(self.sprite_key(), sprite, size)
+
+    def get_scaled_sprite(self, scale, premultiplied=False):
         """
-        Draw the planet on the given surface.
+        Return the sprite scaled by `scale` through the shared sprite cache (optionally premultiplied).
+
+        The size is quantized, so nearby scales reuse the same cached sprite.
+        """
+        sprite = self.sprite
+        size = (quantize_length(sprite.get_width() * scale), quantize_length(sprite.get_height() * scale))
+        return sprite_cache.get_scaled(self.sprite_key(), sprite, size, premultiplied)
+
+    def submit(self, queue, camera_x, camera_y):
+        """
+        Queue the planet and its name label for drawing.
         
-        :param surface: Pygame surface to draw on.
+        :param queue: RenderQueue of the frame.
         :param camera_x: Camera X offset.
         :param camera_y: Camera Y offset.
         """
-        # Update cached main sprite if scale changed
-        if self.cached_scaled_sprite is None or self.cached_scale != self.scale:
-            scaled_width = int(self.sprite.get_width() * self.scale)
-            scaled_height = int(self.sprite.get_height() * self.scale)
-            self.cached_scaled_sprite = pygame.transform.scale(self.sprite, (scaled_width, scaled_height))
-            self.cached_scale = self.scale
-            
-        scaled_sprite = get_cached_sprite(self.sprite, self.scale)
-        sprite_rect = scaled_sprite.get_rect(center=(int(camera_x), int(camera_y)))
-        sprite_rect = scaled_sprite.get_rect(center=(int(self.x - camera_x), int(self.y - camera_y)))
-        surface.blit(scaled_sprite, sprite_rect)
-        font = PLANET_FONT
-        name_surf = font.render(self.name, True, (255, 255, 255))            
-        surface.blit(name_surf, (sprite_rect.x, sprite_rect.y))
+        self._submit_at(queue, self.scale, int(self.x - camera_x), int(self.y - camera_y))
         
-    def draw_visit(self, surface, camera_x, camera_y, x=960, y=510):
+    def submit_visit(self, queue, camera_x, camera_y, x=960, y=510):
         """
-        Draw the planet on the given surface.
+        Queue the planet as seen while landed on it, with its name label.
         
-        :param surface: Pygame surface to draw on.
+        :param queue: RenderQueue of the frame.
         :param camera_x: Camera X offset.
         :param camera_y: Camera Y offset.
         """
-        # Update cached main sprite if scale changed
         landing_scale = 10
-        if self.cached_scaled_sprite is None or self.cached_scale != landing_scale:
-            scaled_width = int(self.sprite.get_width() * landing_scale)
-            scaled_height = int(self.sprite.get_height() * landing_scale)
-            self.cached_scaled_sprite = pygame.transform.scale(self.sprite, (scaled_width, scaled_height))
-            self.cached_scale = landing_scale
-            
-        scaled_sprite = get_cached_sprite(self.sprite, landing_scale)
-        sprite_rect = scaled_sprite.get_rect(center=(int(camera_x), int(camera_y)))
-        sprite_rect = scaled_sprite.get_rect(center=(int(x - camera_x), int(y - camera_y)))
-        surface.blit(scaled_sprite, sprite_rect)
-        font = PLANET_FONT
-        name_surf = font.render(self.name, True, (255, 255, 255))            
-        surface.blit(name_surf, (sprite_rect.x, sprite_rect.y))
+        self._submit_at(queue, landing_scale, int(x - camera_x), int(y - camera_y))
 
-    @classmethod
-    def from_save_data(cls, data):
-        """
-        Create a Planet instance from saved data.
-        
-        :param data: Dictionary containing planet data.
-        :return: A new Planet instance.
-        """
-        # Extract directory from sprite_filename to use as save_folder
-        sprite_filename = data.get("sprite_filename", "")
-        save_folder = os.path.dirname(os.path.dirname(sprite_filename))
-        if not save_folder:
-            save_folder = "saves"
-        
-        # Create a planet instance but avoid generating new sprites
-        planet = cls.__new__(cls)
-        
-        # Initialize basic attributes manually
-        planet.x = data['x']
-        planet.y = data['y']
-        planet.id = data['id']
-        planet.res = data["res"]
-        planet.type = data["type"]
-        planet.minerals = data["minerals"] 
-        planet.habitability = data["habitability"]
-        planet.name = data["name"]
-        planet.theme_name = data["theme_name"]
-        planet.scale = data["scale"]
-        planet.color = WHITE
-        planet.missions = []
-        
-        # Initialize cached sprites
-        planet.cached_scaled_sprite = None
-        planet.cached_scale = None
-        planet.cached_mini_sprite = None
-        planet.cached_mini_scale = None
-        
-        # Load the sprite from the saved file if available
-        if sprite_filename and os.path.exists(sprite_filename):
-            try:
-                planet.sprite = pygame.image.load(sprite_filename).convert_alpha()
-                # Convert to PIL image for consistency
-                planet.pil_sprite = surface_to_pil(planet.sprite)
-            except Exception as e:
-                print(f"Error loading planet sprite from {sprite_filename}: {e}")
-                # If loading fails, generate a new sprite (fallback)
-                temp = random.randint(-50, 50)
-                planet.pil_sprite, theme = generate_and_save_planet_sprite(
-                    planet.res, temp, planet_index=planet.id, save_folder=save_folder
-                )
-                planet.sprite = pil_to_pygame(planet.pil_sprite)
+    def _submit_at(self, queue, scale, center_x, center_y):
+        # The sprite is only scaled (or fetched from the cache) once it is known to be on screen
+        render_scale = queue.scale
+        size = int(self.res * scale * render_scale)
+        x, y = int(center_x * render_scale), int(center_y * render_scale)
+        if queue.cull(x - size // 2, y - size // 2, size, size):
+            return
+        if queue.textured:
+            # The renderer scales the full-resolution sprite as it draws it
+            queue.submit_transformed(LAYER_PLANETS, self.sprite, (x, y), (size, size))
         else:
-            # If sprite file doesn't exist, generate a new one
-            print(f"Missing sprite file for planet {planet.name}, generating new sprite")
-            temp = random.randint(-50, 50)
-            planet.pil_sprite, theme = generate_and_save_planet_sprite(
-                planet.res, temp, planet_index=planet.id, save_folder=save_folder
-            )
-            planet.sprite = pil_to_pygame(planet.pil_sprite)
-        
-        return planet
+            scaled_sprite = self.get_scaled_sprite(scale * render_scale, premultiplied=True)
+            queue.submit(LAYER_PLANETS, scaled_sprite, scaled_sprite.get_rect(center=(x, y)).topleft,
+                         flags=pygame.BLEND_PREMULTIPLIED)
+        # The name label is drawn at native resolution, at the sprite's top-left corner
+        native_size = int(self.res * scale)
+        queue.submit(LAYER_LABELS, render_text(self.name, PLANET_FONT, WHITE),
+                     (center_x - native_size // 2, center_y - native_size // 2))
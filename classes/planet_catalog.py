@@ -0,0 +1,284 @@
+"""
+Module: planet_catalog
+Defines the PlanetCatalog class which stores every planet of a world in NumPy columns.
+Planet objects are only created as lightweight views for planets near the player,
+and their sprites are loaded or generated on a background thread.
+"""
+
+import os
+import random
+import threading
+from collections import OrderedDict, deque
+import numpy as np
+import pygame
+from planet_texture import THEMES, generate_and_save_planet_sprite, pil_to_pygame
+from classes.planet import Planet, PLANET_TYPES, PLANET_RES
+from utils import STAR_FIELD_RANGE
+
+MINERALS = ['Iron', 'Gold', 'Silver', 'Copper', 'Uranium', 'Platinum']
+NAME_PREFIXES = ['Alpha', 'Beta', 'Gamma', 'Delta', 'Epsilon', 'Zeta', 'Nova']
+NAME_SUFFIXES = ['I', 'II', 'III', 'IV', 'V', 'Prime', 'Major']
+MAX_VIEWS = 256           # Planet views (and their sprites) kept alive at once.
+CATALOG_FILE = "catalog.npz"
+
+_theme_ids = {theme["name"]: i for i, theme in enumerate(THEMES)}
+_placeholders = {}  # theme id -> Surface shown while the real sprite is loading
+
+
+def _placeholder_sprite(theme_id):
+    """Return a flat disc in the theme's ocean color, used until the real sprite is ready."""
+    if theme_id not in _placeholders:
+        color = next(c for c in THEMES[theme_id]["water_map"].values() if c[3] > 0)
+        sprite = pygame.Surface((PLANET_RES, PLANET_RES), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, color[:3], (PLANET_RES // 2, PLANET_RES // 2), PLANET_RES // 2)
+        _placeholders[theme_id] = sprite.convert_alpha()
+    return _placeholders[theme_id]
+
+
+class PlanetCatalog:
+    def __init__(self, save_folder):
+        """
+        Initialize an empty catalog.
+
+        :param save_folder: Save folder whose sprites folder holds the planet sprites.
+        """
+        self.save_folder = save_folder
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.scale = np.zeros(0, dtype=np.float32)
+        self.type = np.zeros(0, dtype=np.uint8)
+        self.habitability = np.zeros(0, dtype=np.float32)
+        self.theme = np.zeros(0, dtype=np.uint8)
+        self.seed = np.zeros(0, dtype=np.int64)
+        self.name_id = np.zeros(0, dtype=np.int32)
+        self.minerals_id = np.zeros(0, dtype=np.int32)
+
+        # Interned strings: the columns above store indices into these tables.
+        self.names = []
+        self.mineral_sets = []
+        self._name_lookup = {}
+        self._mineral_lookup = {}
+
+        self.missions = {}        # planet index -> mission list, kept when the view is released
+        self.orbits = None        # StarSystems table providing live positions, once bound
+        self.views = OrderedDict()
+
+        self._sprite_requests = deque()
+        self._sprites_ready = {}  # planet index -> Surface finished by the loader thread
+        self._sprite_lock = threading.Condition()
+        self._loader = None
+
+    def __len__(self):
+        return len(self.x)
+
+    def _intern(self, table, lookup, value):
+        if value not in lookup:
+            lookup[value] = len(table)
+            table.append(value)
+        return lookup[value]
+
+    @classmethod
+    def generate(cls, count, save_folder, spread=STAR_FIELD_RANGE):
+        """
+        Create a catalog of random planets.
+
+        Only the columns are filled in; sprites are generated from each planet's seed when it is first seen.
+
+        :param count: Number of planets.
+        :param save_folder: Save folder of the new world.
+        :param spread: Planets are placed within this distance of the origin on each axis.
+        :return: A new PlanetCatalog instance.
+        """
+        catalog = cls(save_folder)
+        rng = np.random.default_rng(random.getrandbits(32))
+        catalog.x = rng.integers(-spread, spread + 1, count).astype(float)
+        catalog.y = rng.integers(-spread, spread + 1, count).astype(float)
+        catalog.scale = rng.uniform(0.5, 6.0, count).astype(np.float32)
+        catalog.type = rng.integers(0, len(PLANET_TYPES), count).astype(np.uint8)
+        catalog.habitability = rng.uniform(0, 1, count).astype(np.float32)  # 0 (inhospitable) to 1 (earth-like)
+        catalog.theme = rng.integers(0, len(THEMES), count).astype(np.uint8)
+        catalog.seed = rng.integers(0, 2 ** 31, count)
+
+        for prefix in NAME_PREFIXES:
+            for suffix in NAME_SUFFIXES:
+                catalog._intern(catalog.names, catalog._name_lookup, f"{prefix}-{suffix}")
+        catalog.name_id = rng.integers(0, len(catalog.names), count).astype(np.int32)
+
+        # A pool of mineral combinations is plenty; planets pick one of them.
+        for _ in range(32):
+            combo = tuple(random.sample(MINERALS, random.randint(1, 3)))
+            catalog._intern(catalog.mineral_sets, catalog._mineral_lookup, combo)
+        catalog.minerals_id = rng.integers(0, len(catalog.mineral_sets), count).astype(np.int32)
+        return catalog
+
+    @classmethod
+    def from_planet_records(cls, save_folder, records):
+        """
+        Build a catalog from the per-planet dictionaries of older saves.
+
+        :param save_folder: Save folder the records were loaded from.
+        :param records: List of planet dictionaries.
+        :return: A new PlanetCatalog instance.
+        """
+        catalog = cls(save_folder)
+        catalog.x = np.array([r["x"] for r in records], dtype=float)
+        catalog.y = np.array([r["y"] for r in records], dtype=float)
+        catalog.scale = np.array([r["scale"] for r in records], dtype=np.float32)
+        catalog.type = np.array([PLANET_TYPES.index(r["type"]) if r["type"] in PLANET_TYPES else 0
+                                 for r in records], dtype=np.uint8)
+        catalog.habitability = np.array([r["habitability"] for r in records], dtype=np.float32)
+        catalog.theme = np.array([_theme_ids.get(r.get("theme_name"), 0) for r in records], dtype=np.uint8)
+        catalog.seed = np.array([r.get("id", i) for i, r in enumerate(records)], dtype=np.int64)
+        catalog.name_id = np.array([catalog._intern(catalog.names, catalog._name_lookup, r["name"])
+                                    for r in records], dtype=np.int32)
+        catalog.minerals_id = np.array([catalog._intern(catalog.mineral_sets, catalog._mineral_lookup,
+                                                        tuple(r["minerals"])) for r in records], dtype=np.int32)
+        return catalog
+
+    @classmethod
+    def load(cls, save_folder, data):
+        """
+        Load a catalog written by save().
+
+        :param save_folder: Save folder holding catalog.npz.
+        :param data: The "catalog" dictionary stored in data.json.
+        :return: Tuple (PlanetCatalog, orbit column dictionary).
+        """
+        catalog = cls(save_folder)
+        with np.load(os.path.join(save_folder, CATALOG_FILE)) as columns:
+            for column in ("x", "y", "scale", "type", "habitability", "theme", "seed", "name_id", "minerals_id"):
+                setattr(catalog, column, columns[column])
+            orbits = {key: columns[key] for key in ("parent", "a", "phase", "rate") if key in columns}
+        for name in data["names"]:
+            catalog._intern(catalog.names, catalog._name_lookup, name)
+        for combo in data["mineral_sets"]:
+            catalog._intern(catalog.mineral_sets, catalog._mineral_lookup, tuple(combo))
+        return catalog, orbits
+
+    def save(self, save_folder):
+        """
+        Write the columns to catalog.npz in the save folder.
+
+        :param save_folder: Destination save folder.
+        :return: Dictionary with the interned tables, to be stored in data.json.
+        """
+        columns = {
+            "x": self.x, "y": self.y, "scale": self.scale, "type": self.type,
+            "habitability": self.habitability, "theme": self.theme, "seed": self.seed,
+            "name_id": self.name_id, "minerals_id": self.minerals_id,
+        }
+        if self.orbits is not None:
+            columns.update(self.orbits.orbit_columns())
+        np.savez_compressed(os.path.join(save_folder, CATALOG_FILE), **columns)
+        return {"names": self.names, "mineral_sets": [list(combo) for combo in self.mineral_sets]}
+
+    def planet_x(self, index):
+        """Current X coordinate of a planet."""
+        return float(self.orbits.x[index] if self.orbits is not None else self.x[index])
+
+    def planet_y(self, index):
+        """Current Y coordinate of a planet."""
+        return float(self.orbits.y[index] if self.orbits is not None else self.y[index])
+
+    def view(self, index):
+        """
+        Return the Planet view for a catalog row, creating it if needed.
+
+        Views are kept in an LRU of MAX_VIEWS entries; released views lose only their sprites.
+        """
+        planet = self.views.get(index)
+        if planet is not None:
+            self.views.move_to_end(index)
+            return planet
+        planet = Planet(self, index)
+        self.views[index] = planet
+        if len(self.views) > MAX_VIEWS:
+            released, _ = self.views.popitem(last=False)
+            with self._sprite_lock:
+                self._sprites_ready.pop(released, None)
+        return planet
+
+    def indices_in_rect(self, left, top, right, bottom):
+        """Return the sorted indices of the planets whose center lies inside the world rectangle."""
+        if self.orbits is not None:
+            indices = np.array(self.orbits.query_rect(left, top, right, bottom), dtype=np.int64)
+            xs, ys = self.orbits.x[indices], self.orbits.y[indices]
+        else:
+            indices = np.arange(len(self.x))
+            xs, ys = self.x, self.y
+        inside = (xs >= left) & (xs <= right) & (ys >= top) & (ys <= bottom)
+        return indices[inside].tolist()
+
+    def query_rect(self, left, top, right, bottom):
+        """Return views for the planets whose center lies inside the world rectangle."""
+        return [self.view(index) for index in self.indices_in_rect(left, top, right, bottom)]
+
+    def planet_names(self):
+        """Return the names given to planets, each once (not every interned name belongs to one)."""
+        return [self.names[i] for i in np.unique(self.name_id)]
+
+    def find_by_name(self, name):
+        """Return the view of the first planet with the given name, or None."""
+        name_id = self._name_lookup.get(name)
+        if name_id is None:
+            return None
+        found = np.flatnonzero(self.name_id == name_id)
+        return self.view(int(found[0])) if found.size else None
+
+    def sprite_path(self, index):
+        """Path of the sprite file of a planet in the save folder."""
+        return os.path.join(self.save_folder, "sprites", f"planet_{index}.png")
+
+    def take_sprite(self, index):
+        """
+        Return the sprite of a planet if the loader has finished it, otherwise queue it.
+
+        :param index: Planet index.
+        :return: Surface, or None while the sprite is still being loaded or generated.
+        """
+        with self._sprite_lock:
+            sprite = self._sprites_ready.pop(index, None)
+            if sprite is None:
+                if index not in self._sprite_requests:
+                    self._sprite_requests.append(index)
+                    self._sprite_lock.notify()
+                if self._loader is None:
+                    self._loader = threading.Thread(target=self._load_sprites, daemon=True)
+                    self._loader.start()
+                return None
+        return sprite.convert_alpha()
+
+    def placeholder(self, index):
+        """Return the shared placeholder sprite for a planet's theme."""
+        return _placeholder_sprite(int(self.theme[index]))
+
+    def placeholder_key(self, index):
+        """Sprite cache key of a planet's placeholder, shared by all planets of the theme."""
+        return ("placeholder", int(self.theme[index]))
+
+    def _load_sprites(self):
+        """Loader thread: read sprites from disk, generating the missing ones from the planet seed."""
+        while True:
+            with self._sprite_lock:
+                while not self._sprite_requests:
+                    self._sprite_lock.wait()
+                # Newest requests first: those planets are the ones on screen right now.
+                index = self._sprite_requests.pop()
+                if index not in self.views:
+                    continue
+            path = self.sprite_path(index)
+            try:
+                if os.path.exists(path):
+                    sprite = pygame.image.load(path)
+                else:
+                    rnd = random.Random(int(self.seed[index]))
+                    pil_sprite, _ = generate_and_save_planet_sprite(
+                        PLANET_RES, rnd.randint(-50, 50), planet_index=index, save_folder=self.save_folder,
+                        custom_theme=THEMES[int(self.theme[index])]["name"], seed=int(self.seed[index])
+                    )
+                    sprite = pil_to_pygame(pil_sprite)
+            except Exception as e:
+                print(f"Error loading sprite for planet {index}: {e}")
+                continue
+            with self._sprite_lock:
+                self._sprites_ready[index] = sprite
@@ -7,27 +7,35 @@ import pygame
 import random
 import math
 from utils import WIDTH, HEIGHT
+from classes.sprite_bank import sprite_bank
+from assets import assets
+from timestep import lerp
+from render_queue import LAYER_SHIP
+from classes.particles import particles
 
 MARGIN = 200
+SPRITE_PATH = "sprites/spaceship_1.png"
+BOOST_SPRITE_PATH = "sprites/spaceship_1_boost.png"
+assets.declare(SPRITE_PATH)
+assets.declare(BOOST_SPRITE_PATH)
 
 class Spaceship:
-    _original_sprite = None  # Class variable to store the default sprite.
-    _sprite_boost = None     # Class variable to store the boost sprite.
-
-    def __init__(self, x, y, scale_factor=0.33):
+    def __init__(self, x, y, scale_factor=0.33, sprite_path=SPRITE_PATH, boost_sprite_path=BOOST_SPRITE_PATH):
         """
         Initialize the spaceship.
         
         :param x: X coordinate.
         :param y: Y coordinate.
         :param scale_factor: Scaling factor for the spaceship sprite.
+        :param sprite_path: Sprite drawn while cruising.
+        :param boost_sprite_path: Sprite drawn while boosting.
         """
-        if Spaceship._original_sprite is None:
-            Spaceship._original_sprite = pygame.image.load("sprites/spaceship_1.png").convert_alpha()
-            Spaceship._sprite_boost = pygame.image.load("sprites/spaceship_1_boost.png").convert_alpha()
-
+        self.sprite_path = sprite_path
+        self.boost_sprite_path = boost_sprite_path
         self.x = x
         self.y = y
+        self.prev_x = x  # Position at the start of the current simulation tick.
+        self.prev_y = y
         self.width = 170
         self.height = 170
         self.angle = 0
@@ -36,13 +44,20 @@ class Spaceship:
         self.boost_speed = 3.5
         self.boosting = False
         self.scale_factor = scale_factor
-        self.sprite = self.get_scaled_sprite(Spaceship._original_sprite)
+        self.sprite = sprite_bank.get_scaled(self.sprite_path, self.scale_factor)
+
+    def store_previous(self):
+        """Remember the current position as the start of a simulation tick, for interpolation."""
+        self.prev_x = self.x
+        self.prev_y = self.y
 
-    def get_scaled_sprite(self, base_sprite):
-        """Return a scaled version of the provided sprite."""
-        width = int(base_sprite.get_width() * self.scale_factor)
-        height = int(base_sprite.get_height() * self.scale_factor)
-        return pygame.transform.scale(base_sprite, (width, height))
+    def render_position(self, alpha=1.0):
+        """Return the position interpolated between the last two simulation ticks."""
+        return lerp(self.prev_x, self.x, alpha), lerp(self.prev_y, self.y, alpha)
+
+    def current_sprite_path(self):
+        """Return the sprite variant for the current state (boost or normal)."""
+        return self.boost_sprite_path if self.boosting else self.sprite_path
 
     def update(self, keys, camera_x, camera_y):
         """
@@ -56,11 +71,10 @@ class Spaceship:
         if keys[pygame.K_SPACE]:
             self.boost_multiplier = self.boost_speed
             self.boosting = True
-            self.sprite = self.get_scaled_sprite(Spaceship._sprite_boost)
         else:
             self.boost_multiplier = 1
             self.boosting = False
-            self.sprite = self.get_scaled_sprite(Spaceship._original_sprite)
+        self.sprite = sprite_bank.get_scaled(self.current_sprite_path(), self.scale_factor)
             
         dx = keys[pygame.K_d] - keys[pygame.K_a]
         dy = keys[pygame.K_s] - keys[pygame.K_w]
@@ -68,6 +82,8 @@ class Spaceship:
             self.angle = -math.degrees(math.atan2(dy, dx)) - 90
             self.x += dx * self.speed * self.boost_multiplier
             self.y += dy * self.speed * self.boost_multiplier
+            if self.boosting:
+                particles.emit_exhaust(self.x, self.y, math.atan2(dy, dx), self.speed * self.boost_multiplier)
 
         # Adjust the camera based on spaceship position.
         screen_x = self.x - camera_x
@@ -84,18 +100,31 @@ class Spaceship:
         
         return camera_x, camera_y
         
-    def draw(self, screen, camera_x, camera_y):
+    def draw(self, screen, camera_x, camera_y, alpha=1.0):
         """
         Draw the spaceship on the screen.
         
         :param screen: Pygame display surface.
         :param camera_x: Camera X offset.
         :param camera_y: Camera Y offset.
+        :param alpha: Interpolation factor between the previous and current simulation tick.
+        """
+        x, y = self.render_position(alpha)
+        screen_pos = (x - camera_x, y - camera_y)
+        sprite_bank.blit_rotated(screen, self.current_sprite_path(), self.scale_factor, self.angle, screen_pos)
+
+    def submit(self, queue, camera_x, camera_y, alpha=1.0):
+        """
+        Queue the spaceship on the ship layer of a RenderQueue.
+
+        :param queue: RenderQueue of the frame.
+        :param camera_x: Camera X offset.
+        :param camera_y: Camera Y offset.
+        :param alpha: Interpolation factor between the previous and current simulation tick.
         """
-        screen_pos = (self.x - camera_x, self.y - camera_y)
-        rotated_image = pygame.transform.rotate(self.sprite, self.angle)
-        rotated_rect = rotated_image.get_rect(center=screen_pos)
-        screen.blit(rotated_image, rotated_rect.topleft)
+        x, y = self.render_position(alpha)
+        sprite_bank.submit_rotated(queue, LAYER_SHIP, self.current_sprite_path(), self.scale_factor, self.angle,
+                                   (x - camera_x, y - camera_y))
 
 
     def update_with_boundaries(self, keys, camera_x, camera_y, boundaries=[]):
@@ -111,11 +140,10 @@ class Spaceship:
         if keys[pygame.K_SPACE]:
             self.boost_multiplier = self.boost_speed
             self.boosting = True
-            self.sprite = self.get_scaled_sprite(Spaceship._sprite_boost)
         else:
             self.boost_multiplier = 1
             self.boosting = False
-            self.sprite = self.get_scaled_sprite(Spaceship._original_sprite)
+        self.sprite = sprite_bank.get_scaled(self.current_sprite_path(), self.scale_factor)
 
         dx = keys[pygame.K_d] - keys[pygame.K_a]
         dy = keys[pygame.K_s] - keys[pygame.K_w]
@@ -123,6 +151,8 @@ class Spaceship:
             self.angle = -math.degrees(math.atan2(dy, dx)) - 90
             self.x += dx * self.speed * self.boost_multiplier
             self.y += dy * self.speed * self.boost_multiplier
+            if self.boosting:
+                particles.emit_exhaust(self.x, self.y, math.atan2(dy, dx), self.speed * self.boost_multiplier)
 
         # Check boundaries using world coordinates
         collisions = self.set_boundaries(x1, y1, x2, y2, camera_x, camera_y)
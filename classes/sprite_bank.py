@@ -0,0 +1,88 @@
+"""
+Module: sprite_bank
+Defines the SpriteBank class which keeps scaled and pre-rotated ship and station sprites,
+so drawing a ship is a cache lookup instead of a transform every frame.
+Rotated sprites are stored with premultiplied alpha and drawn with BLEND_PREMULTIPLIED.
+"""
+
+import pygame
+from assets import assets
+
+ROTATION_STEP = 2  # Rotations are quantized to this many degrees.
+
+
+class SpriteBank:
+    def __init__(self, rotation_step=ROTATION_STEP):
+        """
+        Initialize an empty sprite bank.
+
+        :param rotation_step: Angle quantization step in degrees.
+        """
+        self.rotation_step = rotation_step
+        self.steps = int(round(360 / rotation_step))
+        self.scaled = {}     # (path, scale) -> scaled Surface
+        self.rotated = {}    # (path, scale, step index) -> rotated Surface, premultiplied alpha
+
+    def original(self, path):
+        """Return the sprite loaded from `path`, shared through the asset manager."""
+        return assets.image(path)
+
+    def get_scaled(self, path, scale):
+        """
+        Return the sprite scaled by `scale`; the scale is only applied once per (sprite, scale).
+
+        :param path: Sprite file path; boost/normal variants are separate paths.
+        :param scale: Scale factor.
+        :return: Scaled pygame.Surface.
+        """
+        key = (path, scale)
+        sprite = self.scaled.get(key)
+        if sprite is None:
+            original = self.original(path)
+            size = (int(original.get_width() * scale), int(original.get_height() * scale))
+            sprite = pygame.transform.scale(original, size)
+            self.scaled[key] = sprite
+        return sprite
+
+    def get_rotated(self, path, scale, angle):
+        """
+        Return the scaled sprite rotated by `angle`, rounded to the nearest rotation step.
+
+        :param path: Sprite file path.
+        :param scale: Scale factor.
+        :param angle: Rotation in degrees (counterclockwise, as pygame.transform.rotate).
+        :return: Rotated pygame.Surface with premultiplied alpha; blit it with BLEND_PREMULTIPLIED.
+        """
+        step = int(round(angle / self.rotation_step)) % self.steps
+        key = (path, scale, step)
+        sprite = self.rotated.get(key)
+        if sprite is None:
+            scaled = self.get_scaled(path, scale)
+            sprite = pygame.transform.rotate(scaled, step * self.rotation_step) if step else scaled
+            sprite = sprite.premul_alpha()
+            self.rotated[key] = sprite
+        return sprite
+
+    def blit_rotated(self, screen, path, scale, angle, center):
+        """
+        Draw a rotated sprite centered on a screen position.
+
+        :return: Rect covered on the screen.
+        """
+        sprite = self.get_rotated(path, scale, angle)
+        return screen.blit(sprite, sprite.get_rect(center=center), special_flags=pygame.BLEND_PREMULTIPLIED)
+
+    def submit_rotated(self, queue, layer, path, scale, angle, center):
+        """Queue a rotated sprite centered on a screen position on a RenderQueue world layer, at the queue's render scale."""
+        if queue.textured:
+            # The renderer rotates the upright sprite as it draws it (clockwise, hence the sign)
+            sprite = self.get_scaled(path, scale)
+            queue.submit_transformed(layer, sprite, center, sprite.get_size(), -angle)
+            return
+        sprite = self.get_rotated(path, scale * queue.scale, angle)
+        queue.submit(layer, sprite, sprite.get_rect(center=(center[0] * queue.scale, center[1] * queue.scale)),
+                     flags=pygame.BLEND_PREMULTIPLIED)
+
+
+# Shared bank used by all ships and stations.
+sprite_bank = SpriteBank()
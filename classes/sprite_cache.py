@@ -0,0 +1,154 @@
+"""
+Module: sprite_cache
+Defines the SpriteCache class, a memory-bounded LRU of scaled sprites keyed by stable keys.
+
+A cache has two sizes: a target, which evicting least recently used sprites keeps it to, and a
+hard limit it never exceeds. Between the two, sprites used in the current or previous frame (the
+visible working set) are not evicted: when a scene needs more sprites than the target holds, LRU
+would evict each one just before it is needed again next frame. Past the limit, new sprites are
+scaled without being stored. Caches whose limit equals their target are plain LRUs.
+"""
+
+import math
+from collections import OrderedDict
+import pygame
+
+SPRITE_CACHE_TARGET = 128 * 1024 * 1024  # Bytes of pixel data the shared cache evicts down to.
+SPRITE_CACHE_LIMIT = 2 * SPRITE_CACHE_TARGET  # Bytes the shared cache never exceeds, visible sprites included.
+MINIMAP_CACHE_BUDGET = 16 * 1024 * 1024  # Bytes of minimap thumbnails kept.
+SIZE_STEPS_PER_OCTAVE = 32               # Quantized sprite sizes per doubling (about 2% apart).
+QUANTIZE_ABOVE = 64                      # Smaller lengths are kept exact, as the steps would be under a pixel.
+
+
+def surface_bytes(surface):
+    """Return the size of a surface's pixel data in bytes."""
+    return surface.get_pitch() * surface.get_height()
+
+
+def quantize_length(length):
+    """
+    Round a sprite length to the nearest of a geometric series of steps, so that scales a
+    fraction of a percent apart (zoom, render scale) share cache entries.
+
+    :param length: Length in pixels.
+    :return: Quantized length, at least 1.
+    """
+    if length <= QUANTIZE_ABOVE:
+        return max(1, int(length))
+    step = round(math.log2(length) * SIZE_STEPS_PER_OCTAVE)
+    return int(round(2 ** (step / SIZE_STEPS_PER_OCTAVE)))
+
+
+class SpriteCache:
+    def __init__(self, target=SPRITE_CACHE_TARGET, limit=None):
+        """
+        Initialize an empty cache.
+
+        :param target: Bytes of pixel data that eviction keeps the cache to. Sprites used in the
+                       current or previous frame are kept past it, once begin_frame() is called.
+        :param limit: Bytes of pixel data the cache never exceeds; defaults to the target, which
+                      makes the cache a plain LRU of that size.
+        """
+        self.target = target
+        self.limit = target if limit is None else max(limit, target)
+        self.entries = OrderedDict()  # key -> (Surface, bytes, frame last used), least recently used first
+        self.bytes = 0
+        self.frame = None  # Current frame number, once begin_frame() was called
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bypasses = 0  # Sprites not stored, as the visible working set filled the limit
+        self.overruns = 0  # Sprites stored past the target, as the visible working set filled it
+        self.peak_bytes = 0
+
+    def begin_frame(self):
+        """Start a new frame; entries used in it are kept until the end of the next one."""
+        self.frame = 0 if self.frame is None else self.frame + 1
+
+    def get(self, key):
+        """Return the cached surface for `key`, or None."""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries[key] = (entry[0], entry[1], self.frame)
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, surface):
+        """
+        Store a surface, evicting least recently used entries to get back to the target.
+
+        Entries used in the current or previous frame are not evicted, so the cache may end up
+        past the target (an overrun). If they leave no room within the limit, the surface is not
+        stored. Neither are surfaces larger than the target.
+        """
+        size = surface_bytes(surface)
+        self.discard(key)
+        if size > self.target:
+            return
+        while self.entries and self.bytes + size > self.target:
+            oldest = next(iter(self.entries.values()))
+            if self.frame is not None and oldest[2] is not None and oldest[2] >= self.frame - 1:
+                break  # Everything left is still on screen
+            _, (_, evicted_size, _) = self.entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+        if self.bytes + size > self.limit:
+            self.bypasses += 1
+            return
+        self.entries[key] = (surface, size, self.frame)
+        self.bytes += size
+        if self.bytes > self.target:
+            self.overruns += 1
+        self.peak_bytes = max(self.peak_bytes, self.bytes)
+
+    def discard(self, key):
+        """Remove an entry if present."""
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[1]
+
+    def get_scaled(self, key, source, size, premultiplied=False):
+        """
+        Return `source` scaled to `size`, scaling only on a cache miss.
+
+        :param key: Stable key identifying the source image (not the Surface object); the size is appended.
+        :param source: Source pygame.Surface, used only on a miss.
+        :param size: (width, height) of the scaled sprite.
+        :param premultiplied: Store the sprite with premultiplied alpha, to be blitted with BLEND_PREMULTIPLIED.
+        :return: Scaled pygame.Surface.
+        """
+        full_key = key + (size, premultiplied)
+        surface = self.get(full_key)
+        if surface is None:
+            surface = pygame.transform.scale(source, size)
+            if premultiplied:
+                surface = surface.premul_alpha()
+            self.put(full_key, surface)
+        return surface
+
+    def stats(self):
+        """Return the counters and current memory use."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else None,
+            "overruns": self.overruns,
+            "evictions": self.evictions,
+            "bypasses": self.bypasses,
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "peak_bytes": self.peak_bytes,
+            "target": self.target,
+            "limit": self.limit,
+        }
+
+
+# Shared cache for scaled planet sprites; the game loop starts its frames.
+sprite_cache = SpriteCache(limit=SPRITE_CACHE_LIMIT)
+# Shared cache for the minimap's planet thumbnails. The minimap is redrawn every few frames, so
+# its thumbnails are kept apart, where the large planet sprites do not evict them in between.
+minimap_cache = SpriteCache(MINIMAP_CACHE_BUDGET)
@@ -0,0 +1,216 @@
+"""
+Module: star_systems
+Defines the StarSystems class which stores the stars and the orbital state of every planet in columns.
+All planet positions are advanced with one NumPy evaluation per tick.
+"""
+
+import math
+import random
+import numpy as np
+import pygame
+from spatial_index import SpatialGrid
+from render_queue import LAYER_STARS
+from utils import STAR_FIELD_RANGE
+
+STAR_SYSTEM_COUNT = 3
+MAX_PLANETS_PER_STAR = 4
+FIRST_ORBIT_RADIUS = 1800       # Semi-major axis of the innermost orbit slot.
+ORBIT_SPACING = 1500            # Distance between neighbouring orbit slots.
+MIN_STAR_SEPARATION = 11000     # Keeps neighbouring systems from overlapping.
+INNER_ORBIT_PERIOD = 600        # Seconds for one revolution of the innermost slot.
+STAR_COLORS = [(255, 244, 214), (255, 214, 130), (255, 170, 100), (175, 205, 255)]
+
+
+class StarSystems:
+    def __init__(self, stars=None, time=0.0):
+        """
+        Initialize the star and orbit tables.
+
+        :param stars: Optional list of star dictionaries with x, y, radius and color.
+        :param time: Simulation time in seconds the orbits are evaluated at.
+        """
+        stars = stars or []
+        self.star_x = np.array([s["x"] for s in stars], dtype=float)
+        self.star_y = np.array([s["y"] for s in stars], dtype=float)
+        self.star_radius = np.array([s["radius"] for s in stars], dtype=float)
+        self.star_color = [tuple(s["color"]) for s in stars]
+        self.time = time
+
+        # Orbit columns, indexed like the planets list (parent -1 means a fixed planet).
+        self.parent = np.zeros(0, dtype=np.int32)
+        self.a = np.zeros(0)
+        self.phase = np.zeros(0)
+        self.rate = np.zeros(0)
+        self.base_x = np.zeros(0)
+        self.base_y = np.zeros(0)
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.orbiting = np.zeros(0, dtype=np.int64)  # Rows with an orbit; the others never move.
+
+        self.grid = SpatialGrid()
+        self._star_sprites = {}
+
+    @classmethod
+    def generate(cls, count=STAR_SYSTEM_COUNT):
+        """
+        Create a set of randomly placed stars.
+
+        :param count: Number of star systems.
+        :return: A new StarSystems instance without planets.
+        """
+        stars = []
+        attempts = 0
+        while len(stars) < count and attempts < 1000:
+            attempts += 1
+            x = random.randint(-STAR_FIELD_RANGE, STAR_FIELD_RANGE)
+            y = random.randint(-STAR_FIELD_RANGE, STAR_FIELD_RANGE)
+            if any(math.dist((x, y), (s["x"], s["y"])) < MIN_STAR_SEPARATION for s in stars):
+                continue
+            stars.append({
+                "x": x,
+                "y": y,
+                "radius": random.randint(250, 450),
+                "color": random.choice(STAR_COLORS),
+            })
+        return cls(stars)
+
+    @classmethod
+    def from_save_data(cls, data):
+        """
+        Create the star tables from saved data.
+
+        :param data: Dictionary with "stars" and "time", or None for saves without star systems.
+        :return: A new StarSystems instance without planets.
+        """
+        data = data or {}
+        return cls(data.get("stars", []), data.get("time", 0.0))
+
+    def to_save_data(self):
+        """Convert the stars and simulation time to a serializable dictionary."""
+        return {
+            "stars": [
+                {"x": float(x), "y": float(y), "radius": float(r), "color": list(c)}
+                for x, y, r, c in zip(self.star_x, self.star_y, self.star_radius, self.star_color)
+            ],
+            "time": self.time,
+        }
+
+    def orbit_columns(self):
+        """Return the orbit columns as a dictionary of arrays, as accepted by bind()."""
+        return {"parent": self.parent, "a": self.a, "phase": self.phase, "rate": self.rate}
+
+    def assign_orbits(self, catalog):
+        """
+        Put a random subset of newly created planets into orbit around the stars and bind them.
+
+        :param catalog: PlanetCatalog of the new world.
+        """
+        orbits = [None] * len(catalog)
+        candidates = random.sample(range(len(catalog)), min(len(catalog), len(self.star_x) * MAX_PLANETS_PER_STAR))
+        for star in range(len(self.star_x)):
+            for slot in range(random.randint(1, MAX_PLANETS_PER_STAR)):
+                if not candidates:
+                    break
+                a = FIRST_ORBIT_RADIUS + slot * ORBIT_SPACING
+                # Kepler's third law: the period grows with a^1.5.
+                period = INNER_ORBIT_PERIOD * (a / FIRST_ORBIT_RADIUS) ** 1.5
+                orbits[candidates.pop()] = {
+                    "parent": star,
+                    "a": a,
+                    "phase": random.uniform(0, 2 * math.pi),
+                    "rate": random.choice((-1, 1)) * 2 * math.pi / period,
+                }
+        self.bind(catalog, orbits)
+
+    def bind(self, catalog, orbits=None):
+        """
+        Fill the orbit columns for the planets and make the catalog read live positions from this table.
+
+        :param catalog: PlanetCatalog; a planet's row in the catalog is its row here.
+        :param orbits: Optional orbit columns (as returned by orbit_columns) or a list with an
+                       orbit dictionary (or None) per planet, as stored by older saves.
+        """
+        count = len(catalog)
+        self.base_x = np.asarray(catalog.x, dtype=float)
+        self.base_y = np.asarray(catalog.y, dtype=float)
+        if isinstance(orbits, dict) and len(orbits.get("parent", ())) == count:
+            self.parent = np.asarray(orbits["parent"], dtype=np.int32)
+            self.a = np.asarray(orbits["a"], dtype=float)
+            self.phase = np.asarray(orbits["phase"], dtype=float)
+            self.rate = np.asarray(orbits["rate"], dtype=float)
+            self.parent[self.parent >= len(self.star_x)] = -1
+        else:
+            self.parent = np.full(count, -1, dtype=np.int32)
+            self.a = np.zeros(count)
+            self.phase = np.zeros(count)
+            self.rate = np.zeros(count)
+            for index, orbit in enumerate(orbits if isinstance(orbits, list) else []):
+                if orbit and 0 <= orbit["parent"] < len(self.star_x):
+                    self.parent[index] = orbit["parent"]
+                    self.a[index] = orbit["a"]
+                    self.phase[index] = orbit["phase"]
+                    self.rate[index] = orbit["rate"]
+        self.orbiting = np.flatnonzero(self.parent >= 0)
+        self.x = self.base_x.copy()
+        self.y = self.base_y.copy()
+        self.grid.rebuild(self.x, self.y)
+        catalog.orbits = self
+        self.advance(0.0)
+
+    def advance(self, dt):
+        """
+        Advance the simulation time and recompute the positions of the orbiting planets.
+
+        Fixed planets keep their position, so the cost follows the number of orbits, not the planet count.
+
+        :param dt: Elapsed time in seconds.
+        """
+        self.time += dt
+        rows = self.orbiting
+        if not len(rows):
+            return
+        star = self.parent[rows]
+        angle = self.phase[rows] + self.rate[rows] * self.time
+        self.x[rows] = self.star_x[star] + self.a[rows] * np.cos(angle)
+        self.y[rows] = self.star_y[star] + self.a[rows] * np.sin(angle)
+        self.grid.update(self.x, self.y, rows)
+
+    def query_rect(self, left, top, right, bottom):
+        """Return the sorted indices of planets near the given world rectangle."""
+        return sorted(self.grid.query_rect(left, top, right, bottom))
+
+    def planets_near(self, x, y, radius):
+        """Return the sorted indices of planets near the given world position."""
+        return sorted(self.grid.query_radius(x, y, radius))
+
+    def _get_star_sprite(self, radius, color):
+        """Return a cached glow sprite (premultiplied alpha) for a star of the given radius and color."""
+        key = (int(radius), color)
+        if key not in self._star_sprites:
+            size = int(radius) * 4
+            sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+            center = size // 2
+            # Soft corona made of translucent rings, then the solid disc on top.
+            for ring in range(8, 0, -1):
+                pygame.draw.circle(sprite, color + (12,), (center, center), int(radius * (1 + ring / 8)))
+            pygame.draw.circle(sprite, color, (center, center), int(radius))
+            self._star_sprites[key] = sprite.convert_alpha().premul_alpha()
+        return self._star_sprites[key]
+
+    def submit_stars(self, queue, camera_x, camera_y):
+        """
+        Queue the stars that are inside the camera view.
+
+        :param queue: RenderQueue of the frame.
+        :param camera_x: Camera X offset.
+        :param camera_y: Camera Y offset.
+        """
+        scale = queue.scale
+        for x, y, radius, color in zip(self.star_x, self.star_y, self.star_radius, self.star_color):
+            radius = max(1, int(radius * scale))
+            reach = radius * 2
+            left = int((x - camera_x) * scale) - reach
+            top = int((y - camera_y) * scale) - reach
+            if not queue.cull(left, top, 2 * reach, 2 * reach):
+                queue.submit(LAYER_STARS, self._get_star_sprite(radius, color), (left, top),
+                             flags=pygame.BLEND_PREMULTIPLIED)
@@ -0,0 +1,98 @@
+"""
+Module: station_menu
+Defines the scenes shared by the orbiting ships: the station menu with its Comms, Missions and
+Exit buttons, and the dialog screen opened from its Comms button.
+"""
+
+import pygame
+from scenes import Scene
+from text_service import render_text
+from assets import assets
+
+# Monospaced, terminal-like fonts (Courier New or similar) for the menu labels, as (face, size, bold).
+TERMINAL_FONT = ("courier", 32, True)
+TERMINAL_SMALLER_FONT = ("courier", 20, True)
+DIALOG_FONT = (None, 32)
+TERMINAL_GREEN = (0, 255, 0)  # Bright terminal green
+
+# Button areas on the station room backgrounds (drawn for 1920x1080)
+COMMS_BUTTON = pygame.Rect(455, 515, 135, 120)
+MISSIONS_BUTTON = pygame.Rect(875, 540, 185, 132)
+EXIT_BUTTON = pygame.Rect(1600, 395, 64, 100)
+
+
+class StationMenuScene(Scene):
+    _frames = {}  # Class variable holding the composed menu per (background, size); it never changes.
+
+    def __init__(self, background_path, location, dialogue, open_missions=None):
+        """
+        Initialize the menu of an orbiting ship.
+
+        :param background_path: Image of the ship's room, stretched to the screen.
+        :param location: Location type reported to the missions while the menu is open ("comm", "hub").
+        :param dialogue: Lines shown by the Comms button.
+        :param open_missions: Function returning the scene shown by the Missions button, or None
+                              if the ship has no missions.
+        """
+        super().__init__()
+        self.background_path = background_path
+        self.location = location
+        self.dialogue = dialogue
+        self.open_missions = open_missions
+
+    def compose(self, size):
+        # The menu itself is static: composed once per ship type, then only what the popups cover is repainted
+        key = (self.background_path, size)
+        if key in StationMenuScene._frames:
+            return StationMenuScene._frames[key]
+        frame = assets.image(self.background_path, size, alpha=False).copy()
+        overlay = pygame.Surface(size, pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 100))  # Black with alpha 100, for button contrast
+        frame.blit(overlay, (0, 0))
+        comms_text = render_text("Comms", TERMINAL_FONT, TERMINAL_GREEN)
+        missions_text = render_text("Missions", TERMINAL_FONT, TERMINAL_GREEN)
+        exit_text = render_text("Exit", TERMINAL_SMALLER_FONT, TERMINAL_GREEN)
+        frame.blit(comms_text, comms_text.get_rect(center=(COMMS_BUTTON.centerx, COMMS_BUTTON.centery - 5)))
+        frame.blit(missions_text, missions_text.get_rect(center=MISSIONS_BUTTON.center))
+        frame.blit(exit_text, exit_text.get_rect(center=EXIT_BUTTON.center))
+        StationMenuScene._frames[key] = frame
+        return frame
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if COMMS_BUTTON.collidepoint(event.pos):
+                # Show predefined communications dialogue
+                self.stack.push(DialogScene(self.dialogue))
+            elif MISSIONS_BUTTON.collidepoint(event.pos):
+                if self.open_missions is not None:
+                    self.stack.push(self.open_missions())
+            elif EXIT_BUTTON.collidepoint(event.pos):
+                self.close()
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            self.close()
+
+
+class DialogScene(Scene):
+    def __init__(self, lines):
+        """
+        Initialize a dialog screen; any key returns to the screen below.
+
+        :param lines: Lines of text, centered from the top of the screen.
+        """
+        super().__init__()
+        self.lines = lines
+
+    def compose(self, size):
+        width, height = size
+        frame = pygame.Surface(size)
+        frame.fill((0, 0, 0))
+        for idx, line in enumerate(self.lines):
+            line_surface = render_text(line, DIALOG_FONT, (255, 255, 255))
+            frame.blit(line_surface, line_surface.get_rect(center=(width // 2, 100 + idx * 40)))
+        prompt_surface = render_text("Press any key to return", DIALOG_FONT, (255, 255, 255))
+        frame.blit(prompt_surface, prompt_surface.get_rect(center=(width // 2, height - 50)))
+        return frame
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            self.close()
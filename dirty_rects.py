@@ -0,0 +1,83 @@
+"""
+Module: dirty_rects
+Tracks the screen regions that changed during a frame so only those are sent to the display.
+"""
+
+import pygame
+from display_backend import display
+
+# Above this share of the screen, one full flip is cheaper than many rectangle updates.
+FULL_FRAME_RATIO = 0.5
+
+
+class DirtyRectTracker:
+    def __init__(self):
+        """
+        Initialize the tracker.
+
+        The first present() always updates the whole screen, since nothing has been shown yet.
+        """
+        self.rects = []
+        self.full = True
+        self.overlay_rects = []  # Regions covered by last frame's overlays (e.g. notification popups).
+
+    def mark(self, rect):
+        """Mark a screen region as changed."""
+        if rect:
+            self.rects.append(pygame.Rect(rect))
+
+    def mark_full(self):
+        """Mark the whole screen as changed."""
+        self.full = True
+
+    def handle_event(self, event):
+        """Repaint everything after the window was resized or exposed."""
+        if event.type in (pygame.VIDEORESIZE, pygame.VIDEOEXPOSE):
+            self.mark_full()
+
+    def erase_overlay(self, screen, background):
+        """
+        Restore the regions drawn over by last frame's overlays.
+
+        :param screen: Display surface.
+        :param background: Surface holding the frame without overlays, same size as the screen.
+        """
+        for rect in self.overlay_rects:
+            screen.blit(background, rect, rect)
+            self.mark(rect)
+        self.overlay_rects = []
+
+    def add_overlay(self, rects):
+        """
+        Record the regions drawn by this frame's overlays.
+
+        They are marked as changed now and erased again by the next erase_overlay(). Regions of
+        last frame's overlays that were not erased (the frame was redrawn underneath) are marked too.
+        """
+        for rect in self.overlay_rects:
+            self.mark(rect)
+        self.overlay_rects = []
+        for rect in rects:
+            self.overlay_rects.append(pygame.Rect(rect))
+            self.mark(rect)
+
+    def present(self):
+        """Send the changed regions to the display and start a new frame."""
+        if self.full:
+            display.present()
+        elif self.rects:
+            merged = []
+            for rect in self.rects:
+                # Fold overlapping rectangles together so no pixel is sent twice.
+                index = rect.collidelist(merged)
+                while index != -1:
+                    rect = rect.union(merged.pop(index))
+                    index = rect.collidelist(merged)
+                merged.append(rect)
+            width, height = display.get_size()
+            if sum(r.width * r.height for r in merged) > width * height * FULL_FRAME_RATIO:
+                display.present()
+            else:
+                display.present(merged)
+        self.rects = []
+        self.full = False
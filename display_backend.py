@@ -0,0 +1,191 @@
+"""
+Module: display_backend
+Opens the game window and sends finished frames to it.
+
+The surface backend (the default) draws everything with CPU blits on the display surface.
+The texture backend renders with pygame._sdl2.video: sprites are uploaded once as textures and
+scaled and rotated by the renderer as they are drawn, while everything still drawn with
+surface calls (HUD, minimap, menus) goes on a transparent canvas laid over the textures.
+"""
+
+import os
+from weakref import WeakKeyDictionary
+import numpy as np
+import pygame
+
+BACKENDS = ("surface", "texture", "texture-software")
+STREAM_MIN_SIZE = 4096   # Sources this large (in either dimension) are streamed by visible region, not uploaded whole.
+SDL_BLENDMODE_BLEND = 1  # Straight alpha blending, for Texture.blend_mode.
+
+
+class DisplayBackend:
+    def __init__(self):
+        """Initialize the backend; no window is open until open() is called."""
+        self.name = "surface"
+        self.renderer = None       # pygame._sdl2.video.Renderer while the texture backend is active
+        self.canvas = None         # Transparent surface drawn over the textures
+        self.canvas_texture = None
+        self.textures = WeakKeyDictionary()  # Source surface -> Texture; released with the surface
+        self.streams = {}          # Size -> streaming Texture for regions of large sources
+        self.composed = False      # The canvas has been drawn over this frame's textures
+        self.readback = None       # Surface the renderer output is read back into, for frame capture
+        self.uploads = 0
+        self.draws = 0
+
+    @property
+    def textured(self):
+        """True while frames are drawn through the texture backend."""
+        return self.renderer is not None
+
+    def open(self, size, flags=0, backend="surface"):
+        """
+        Open the game window.
+
+        The texture backends fall back to the surface backend if pygame._sdl2 is missing or
+        no renderer can be created.
+
+        :param size: Window size.
+        :param flags: pygame.display.set_mode flags.
+        :param backend: One of BACKENDS; "texture-software" forces SDL's software renderer,
+                        so the texture path runs without a GPU.
+        :return: Surface the game draws on: the display surface, or the texture backend's canvas.
+        """
+        if backend != "surface":
+            try:
+                return self._open_textured(size, flags, backend == "texture-software")
+            except (ImportError, pygame.error) as e:
+                print(f"Texture renderer unavailable ({e}); drawing with surfaces")
+                self.renderer = None
+        self.name = "surface"
+        return pygame.display.set_mode(size, flags)
+
+    def _open_textured(self, size, flags, software):
+        from pygame._sdl2.video import Window, Renderer, Texture
+        if software:
+            os.environ["SDL_RENDER_DRIVER"] = "software"
+        # In SCALED mode pygame presents through an SDL renderer of its own, which is reused here;
+        # the display surface itself is never flipped
+        pygame.display.set_mode(size, flags | pygame.SCALED)
+        self.renderer = Renderer.from_window(Window.from_display_module())
+        self.canvas = pygame.Surface(size, pygame.SRCALPHA)
+        self.canvas_texture = Texture(self.renderer, size, streaming=True)
+        self.canvas_texture.blend_mode = SDL_BLENDMODE_BLEND
+        self.name = "texture-software" if software else "texture"
+        return self.canvas
+
+    def begin(self, fill=(0, 0, 0)):
+        """Start a textured frame: clear the renderer to `fill` and the canvas to transparent."""
+        self.renderer.draw_color = tuple(fill) + (255,)
+        self.renderer.clear()
+        self.canvas.fill((0, 0, 0, 0))
+
+    def texture(self, surface, premultiplied=False):
+        """
+        Return the texture of a surface, uploading it on first use.
+
+        :param premultiplied: The surface holds premultiplied alpha; SDL's renderers only blend
+                              straight alpha, so the colors are divided back out for the upload.
+        """
+        texture = self.textures.get(surface)
+        if texture is None:
+            from pygame._sdl2.video import Texture
+            source = surface
+            if premultiplied:
+                source = surface.copy()
+                rgb = pygame.surfarray.pixels3d(source)
+                alpha = pygame.surfarray.array_alpha(source)[..., None].astype(np.uint16)
+                np.copyto(rgb, np.minimum(255, rgb * np.uint16(255) // np.maximum(alpha, 1)), casting="unsafe")
+                del rgb
+            texture = Texture.from_surface(self.renderer, source)
+            self.textures[surface] = texture
+            self.uploads += 1
+        return texture
+
+    def _stream(self, surface, area):
+        """Copy a region of a large surface into a streaming texture of the region's size."""
+        from pygame._sdl2.video import Texture
+        region = surface.subsurface(pygame.Rect(area).clip(surface.get_rect()))
+        size = region.get_size()
+        texture = self.streams.get(size)
+        if texture is None:
+            texture = Texture(self.renderer, size, streaming=True)
+            self.streams[size] = texture
+        texture.update(region)
+        return texture, size
+
+    def draw_items(self, items):
+        """
+        Draw queued render items with the renderer.
+
+        :param items: Surface.blits tuples (surface, dest[, area[, flags]]), or transformed items
+                      (surface, dest rect, area, flags, angle) whose surface is stretched to the
+                      rect and rotated clockwise by `angle` degrees.
+        """
+        for item in items:
+            surface, dest = item[0], item[1]
+            area = item[2] if len(item) > 2 else None
+            flags = item[3] if len(item) > 3 else 0
+            if area is not None and max(surface.get_size()) >= STREAM_MIN_SIZE:
+                texture, (width, height) = self._stream(surface, area)
+                texture.draw(dstrect=(dest[0], dest[1], width, height))
+            else:
+                texture = self.texture(surface, flags == pygame.BLEND_PREMULTIPLIED)
+                if len(item) > 4:
+                    texture.draw(srcrect=area, dstrect=dest, angle=item[4])
+                else:
+                    width, height = surface.get_size() if area is None else (area[2], area[3])
+                    texture.draw(srcrect=area, dstrect=(dest[0], dest[1], width, height))
+        self.draws += len(items)
+
+    def present(self, rects=None):
+        """
+        Show the frame.
+
+        :param rects: Changed screen regions for the surface backend, or None for the whole screen.
+                      The texture backend always composes and presents the whole frame.
+        """
+        if self.renderer is None:
+            if rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)
+            return
+        self.compose()
+        self.renderer.present()
+        self.composed = False
+        # Whatever was on the back buffer is undefined now; frames without world layers (menus)
+        # are covered by the canvas anyway
+        self.renderer.draw_color = (0, 0, 0, 255)
+        self.renderer.clear()
+
+    def compose(self):
+        """Draw the canvas over the textures; done once per frame, before it is presented or read back."""
+        if not self.composed:
+            self.canvas_texture.update(self.canvas)
+            self.canvas_texture.draw()
+            self.composed = True
+
+    def frame_surface(self):
+        """
+        Return a surface holding the finished frame, before it is presented.
+
+        With the texture backend this reads the frame back from the renderer, which is slow on
+        GPUs, so it is only done while frames are being captured.
+        """
+        if self.renderer is None:
+            return pygame.display.get_surface()
+        self.compose()
+        self.readback = self.renderer.to_surface(self.readback)
+        return self.readback
+
+    def get_size(self):
+        """Return the size of the surface the game draws on."""
+        return (self.canvas if self.renderer is not None else pygame.display.get_surface()).get_size()
+
+    def stats(self):
+        """Return the backend name and texture counters."""
+        return {"backend": self.name, "textures": len(self.textures), "uploads": self.uploads, "draws": self.draws}
+
+
+# Shared display used by the game loop, the render queue and the menus.
+display = DisplayBackend()
@@ -0,0 +1,193 @@
+"""
+Module: frame_capture
+Records the game's frames for bug reports and trailers without disturbing frame pacing.
+
+Each captured frame is copied, as raw pixels, into one slot of a ring of preallocated arrays;
+a background thread converts and writes them out. When every slot is still waiting for the
+encoder, the frame is dropped instead of waiting for a slot.
+
+Output goes to a timestamped folder with a frames.csv listing the frames kept:
+    png: one PNG file per frame (compressed with zlib, which runs outside the GIL)
+    raw: all frames appended to frames.rgb as packed RGB24, e.g. for
+         ffmpeg -f rawvideo -pix_fmt rgb24 -s WIDTHxHEIGHT -r 60 -i frames.rgb capture.mp4
+"""
+
+import csv
+import os
+import queue
+import struct
+import threading
+import zlib
+from datetime import datetime
+import numpy as np
+
+CAPTURE_DIR = "captures"
+CAPTURE_FORMATS = ("png", "raw")
+RING_SLOTS = 8            # Frames that can wait for the encoder before new ones are dropped.
+PNG_COMPRESSION = 1       # zlib level; higher levels shrink the files a little and fall behind a lot.
+
+
+def _png_chunk(tag, data):
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(data, zlib.crc32(tag)))
+
+
+def write_png(path, rows, width, height):
+    """
+    Write an RGB image as a PNG file.
+
+    :param rows: uint8 array of shape (height, 1 + width * 3): each row starts with its filter
+                 type byte (0, none) followed by the RGB pixels.
+    """
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(_png_chunk(b"IHDR", header))
+        f.write(_png_chunk(b"IDAT", zlib.compress(rows, PNG_COMPRESSION)))
+        f.write(_png_chunk(b"IEND", b""))
+
+
+class FrameCapture:
+    def __init__(self, slots=RING_SLOTS):
+        """
+        Initialize the capture; it starts stopped.
+
+        :param slots: Number of frames in the ring buffer.
+        """
+        self.slot_count = slots
+        self.active = False
+        self.format = "png"
+        self.path = None
+        self.interval = 1
+        self.buffers = None   # (slots, height, pitch) raw pixel arrays, allocated on the first frame
+        self.layout = None    # (width, height, pitch, byte offsets of R, G and B) of the captured surface
+        self.free = None      # Slots the main loop may fill
+        self.filled = None    # (slot, frame, time) waiting for the encoder; None stops the encoder
+        self.thread = None
+        self.frame = 0
+        self.captured = 0
+        self.dropped = 0
+
+    def start(self, path=None, fmt=None, interval=1):
+        """
+        Start capturing frames.
+
+        :param path: Output folder; defaults to a timestamped folder in the captures folder.
+        :param fmt: "png" or "raw"; keeps the current format if None.
+        :param interval: Capture every n-th frame.
+        :return: The output folder.
+        """
+        self.stop()
+        if fmt is not None:
+            self.format = fmt
+        if path is None:
+            path = os.path.join(CAPTURE_DIR, f"capture_{datetime.now().strftime('%m%d%y%H%M%S')}")
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.interval = max(1, interval)
+        self.buffers = None
+        self.layout = None
+        self.free = queue.Queue()
+        for slot in range(self.slot_count):
+            self.free.put(slot)
+        self.filled = queue.Queue()
+        self.frame = 0
+        self.captured = 0
+        self.dropped = 0
+        self.thread = threading.Thread(target=self._encode_loop, daemon=True)
+        self.thread.start()
+        self.active = True
+        return path
+
+    def stop(self):
+        """Stop capturing and wait for the encoder to write the frames still queued."""
+        if not self.active:
+            return
+        self.active = False
+        self.filled.put(None)
+        self.thread.join()
+        self.thread = None
+        print(f"Captured {self.captured} frames to {self.path} ({self.dropped} dropped)")
+
+    def toggle(self):
+        """Start or stop capturing; returns True while capturing."""
+        if self.active:
+            self.stop()
+        else:
+            print(f"Capturing frames to {self.start()}")
+        return self.active
+
+    def grab(self, surface, time_ms):
+        """
+        Copy a finished frame into the ring buffer.
+
+        Costs one copy of the raw pixels; the frame is dropped if no slot is free.
+
+        :param surface: 32-bit surface holding the frame (display surface or renderer readback).
+        :param time_ms: Time of the frame, written to frames.csv.
+        """
+        self.frame += 1
+        if (self.frame - 1) % self.interval:
+            return
+        if self.layout is None:
+            # Sized on the first frame, as the capture does not know the window beforehand
+            shifts = surface.get_shifts()
+            self.layout = (surface.get_width(), surface.get_height(), surface.get_pitch(),
+                           tuple(shift // 8 for shift in shifts[:3]))
+            self.buffers = np.empty((self.slot_count, surface.get_height(), surface.get_pitch()), dtype=np.uint8)
+        width, height, pitch, _ = self.layout
+        if surface.get_size() != (width, height) or surface.get_pitch() != pitch or surface.get_bitsize() != 32:
+            self.dropped += 1  # The window changed size; only frames of the first size are kept
+            return
+        try:
+            slot = self.free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return
+        np.copyto(self.buffers[slot], np.frombuffer(surface.get_buffer(), dtype=np.uint8).reshape(height, pitch))
+        self.filled.put((slot, self.frame, time_ms))
+        self.captured += 1
+
+    def _encode_loop(self):
+        """Encoder thread: convert queued frames to RGB and write them until stopped."""
+        rows = None
+        raw_file = None
+        with open(os.path.join(self.path, "frames.csv"), "w", newline="") as manifest:
+            writer = csv.writer(manifest)
+            writer.writerow(["frame", "time_ms", "file"])
+            while True:
+                item = self.filled.get()
+                if item is None:
+                    break
+                slot, frame, time_ms = item
+                width, height, _, channels = self.layout
+                if rows is None:
+                    rows = np.zeros((height, 1 + width * 3), dtype=np.uint8)  # Column 0: PNG filter type
+                pixels = self.buffers[slot][:, :width * 4].reshape(height, width, 4)
+                rgb = rows[:, 1:].reshape(height, width, 3)
+                for i, channel in enumerate(channels):
+                    rgb[:, :, i] = pixels[:, :, channel]
+                self.free.put(slot)
+
+                if self.format == "png":
+                    name = f"frame_{frame:06d}.png"
+                    write_png(os.path.join(self.path, name), rows, width, height)
+                else:
+                    name = "frames.rgb"
+                    if raw_file is None:
+                        raw_file = open(os.path.join(self.path, name), "wb")
+                    raw_file.write(np.ascontiguousarray(rgb))
+                writer.writerow([frame, time_ms, name])
+        if raw_file is not None:
+            raw_file.close()
+
+    def describe(self):
+        """Return a one-line summary of the running capture, for the profiler overlay."""
+        return f"capturing {os.path.basename(self.path)}  {self.captured} frames, {self.dropped} dropped"
+
+    def stats(self):
+        """Return the capture counters."""
+        return {"active": self.active, "format": self.format, "captured": self.captured, "dropped": self.dropped}
+
+
+# Shared capture toggled from the game loop.
+capture = FrameCapture()
@@ -1,15 +1,31 @@
 import pygame
 import threading
+import time
 from classes.spaceship import Spaceship
-from classes.planet import Planet
 from classes.comm_ship import comm_ship
 from classes.hub_ship import hub_ship
 from classes.notifications import AchievementPopup
-from ui import draw_mini_map, draw_progress_bar
-from utils import WIDTH, HEIGHT, get_save_filename, FPS
+from classes.asteroids import AsteroidField
+from classes.particles import particles
+from classes.star_systems import StarSystems
+from classes.galaxy_map import GalaxyMap
+from classes.exploration import ExploredMap
+from ui import draw_mini_map, create_progress_bar
+from dirty_rects import DirtyRectTracker
+from scenes import SceneStack
+from display_backend import display
+from utils import WIDTH, HEIGHT, WHITE, get_save_filename, FPS
+from text_service import render_text
+from timestep import FixedTimestep, lerp
+from profiler import profiler
+from frame_capture import capture
+from render_queue import render_queue, LAYER_BACKGROUND, LAYER_PLANETS, LAYER_LABELS, LAYER_SHIP
+from quality import governor
+from classes.sprite_cache import sprite_cache
+from game_input import LiveInput
 from save_funcs import save_game
 from world import CHUNK_SIZE, get_visible_chunks, get_chunk_surface
-from landing import is_ship_on_planet  # Import the is_ship_on_planet function
+from landing import is_ship_on_planet, MAX_PLANET_RADIUS
 import random
 from classes.player import Player
 import math
@@ -20,6 +36,11 @@ player = Player("Player 1")
 # Make notification_system importable by other modules
 notification_system = AchievementPopup()
 
+# Screen area around the landed ship that covers the ship and its "Press E" prompt
+PLANET_SHIP_DIRTY_SIZE = (420, 280)
+
+INTERACT_FONT = (None, 36)
+
 # Function to update mission progress based on player's current location
 def update_player_missions(current_planet=None, location_type="space"):
     for mission in player.missions:
@@ -32,269 +53,462 @@ def update_player_missions(current_planet=None, location_type="space"):
         # Update mission completion status with notification system
         mission.update(notification_system)
 
-def run_game(screen, planets, spaceship_data, save_folder=None):
+def run_game(screen, catalog, spaceship_data, save_folder=None, star_systems=None, realtime=True,
+             input_source=None, start_scene=None):
     """
     Run the main game loop, handling both space and planet modes.
+
+    :param catalog: PlanetCatalog holding the planets of the world.
+    :param realtime: If False, the loop runs one simulation tick per frame as fast as it can
+                     (headless runs); otherwise ticks follow wall time at SIM_RATE.
+    :param input_source: Where the main loop reads events and keys from; defaults to LiveInput.
+                         A ReplayInput also supplies the starting ship position and simulation time.
+    :param start_scene: Optional Scene shown over the space view when the loop starts (benchmarks).
     """
+    if input_source is None:
+        input_source = LiveInput()
     clock = pygame.time.Clock()
 
+    # Planets without star system data stay where they are
+    if star_systems is None:
+        star_systems = StarSystems()
+        star_systems.bind(catalog)
+
     # Initialize player spaceship
     if spaceship_data:
         player_ship = Spaceship(spaceship_data["x"], spaceship_data["y"])
     else:
         player_ship = Spaceship(0, 0)
 
+    # Input recording seeds the random generators here; a replay restores the recorded start
+    initial_save_folder = save_folder if save_folder else get_save_filename()
+    start = input_source.start({"save": initial_save_folder, "x": player_ship.x, "y": player_ship.y,
+                                "time": star_systems.time})
+    player_ship.x, player_ship.y = start["x"], start["y"]
+    player_ship.store_previous()
+    if start["time"] != star_systems.time:
+        star_systems.advance(start["time"] - star_systems.time)
+
+    # Explored regions, revealed around the ship as it flies
+    explored = spaceship_data.get("explored") if spaceship_data else None
+    if explored is None:
+        explored = ExploredMap()
+    explored.reveal(player_ship.x, player_ship.y)
+
     # Initialize notification system sounds
     try:
         notification_system.load_sounds("sounds/notification.wav", "sounds/mission_complete.wav")
     except:
         print("Could not load notification sounds")
 
-    # Save game initially
-    initial_save_folder = save_folder if save_folder else get_save_filename()
-    save_progress = 0.0
-    save_in_progress = True
-
-    def save_progress_callback(progress_value):
-        nonlocal save_progress
-        save_progress = progress_value
-
-    def save_thread_func():
-        nonlocal save_in_progress
-        save_game(planets, spaceship=player_ship, save_name=initial_save_folder, progress_callback=save_progress_callback)
-        save_in_progress = False
-
-    thread = threading.Thread(target=save_thread_func)
-    thread.start()
-
-    # Display initial save progress
-    while save_in_progress:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
+    # Save game initially, unless replaying: a replay starts from the recorded save and leaves it as it was
+    if input_source.save_on_start:
+        save_progress = 0.0
+        save_in_progress = True
+
+        def save_progress_callback(progress_value):
+            nonlocal save_progress
+            save_progress = progress_value
+
+        def save_thread_func():
+            nonlocal save_in_progress
+            save_game(catalog, spaceship=player_ship, save_name=initial_save_folder, progress_callback=save_progress_callback,
+                      star_systems=star_systems, explored=explored)
+            save_in_progress = False
+
+        thread = threading.Thread(target=save_thread_func)
+        thread.start()
+
+        # Display initial save progress; only the bar changes between frames
+        tracker = DirtyRectTracker()
+        progress_bar = create_progress_bar()
         screen.fill((0, 0, 0))
-        draw_progress_bar(screen, save_progress)
-        pygame.display.flip()
-        clock.tick(FPS)
-    thread.join()
-    print(f"Initial save created: {initial_save_folder}")
+        while save_in_progress:
+            for event in pygame.event.get():
+                tracker.handle_event(event)
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    exit()
+            progress_bar.set_value(save_progress)
+            tracker.mark(progress_bar.draw(screen, force=tracker.full))
+            tracker.present()
+            clock.tick(FPS)
+        thread.join()
+        print(f"Initial save created: {initial_save_folder}")
 
     # --- Game Mode and State Initialization ---
     camera_x, camera_y = 0, 0
-    game_type = "space"  # Can be "space" or "planet"
+    game_type = "space"  # Can be "space", "planet" or "map"
     running = True
     landed_planet = None
     current_location = None  # Track current planet name for mission updates
+    tracker = DirtyRectTracker()  # Screen areas presented each frame; the first frame is presented whole
     
     # Pre-initialize star background for planet view
     boundary_size_x, boundary_size_y = 3840, 3840
     star_background = create_star_background(2 * boundary_size_x + WIDTH, 2 * boundary_size_y + HEIGHT)
+
+    # Asteroid belts around some of the planets
+    asteroid_field = AsteroidField.from_catalog(catalog)
+
+    # Full-screen galaxy map, opened from space with M
+    galaxy_map = GalaxyMap()
     
     # Initialize spaceship for planetary movement
     planet_ship = None
     communications = None
     hub = None
-    loc = "planet"
     last_planet = None
 
+    # Menus and dialogs shown over the game; the simulation is paused while any are open
+    scenes = SceneStack()
+    if start_scene is not None:
+        scenes.push(start_scene)
+
+    # Screen updates: full frames while the view scrolls, dirty rects while it stands still
+    last_view = None
+    last_ship_area = None
+
+    # Ship movement and orbits advance in fixed ticks; rendering interpolates between them
+    timestep = FixedTimestep(realtime=realtime)
+    prev_camera_x, prev_camera_y = camera_x, camera_y
+
     # --- Main Game Loop ---
     while running:
+        profiler.begin_frame()
+        sprite_cache.begin_frame()
+        frame_start = time.perf_counter()
         current_time = pygame.time.get_ticks()
-        
+        mode = (game_type, len(scenes))
+
         # Handle common events
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-                break
+        with profiler.stage("events"):
+            for event in input_source.get_events():
+                tracker.handle_event(event)
+                if event.type == pygame.QUIT:
+                    running = False
+                    break
+
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    profiler.toggle()
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                    # Dump per-frame stage timings to CSV until F4 is pressed again
+                    if profiler.csv_writer is None:
+                        print(f"Recording frame profile to {profiler.start_csv()}")
+                    else:
+                        profiler.stop_csv()
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F5:
+                    # Capture frames in the background until F5 is pressed again
+                    capture.toggle()
+
+                elif scenes:
+                    # The open menu takes all other input
+                    scenes.handle_event(event)
+
+                elif game_type == "map":
+                    # The map handles its own zoom and pan input
+                    if not galaxy_map.handle_event(event):
+                        game_type = "space"
                 
-            elif event.type == pygame.KEYDOWN:
-                if game_type == "space" and event.key == pygame.K_q:
-                    # Check for landing
-                    for planet in planets:
-                        if is_ship_on_planet(player_ship, planet):
-                            landed_planet = planet
-                            game_type = "planet"
-                            # Initialize planet view
-                            planet_ship = Spaceship(WIDTH / 2, HEIGHT / 2)
+                elif event.type == pygame.KEYDOWN:
+                    if game_type == "space" and event.key == pygame.K_m:
+                        stars = zip(star_systems.star_x, star_systems.star_y,
+                                    star_systems.star_radius, star_systems.star_color)
+                        galaxy_map.open(star_systems.x, star_systems.y, stars, (player_ship.x, player_ship.y), explored)
+                        game_type = "map"
+
+                    elif game_type == "space" and event.key == pygame.K_q:
+                        # Check for landing
+                        for index in star_systems.planets_near(player_ship.x, player_ship.y, MAX_PLANET_RADIUS):
+                            planet = catalog.view(index)
+                            if is_ship_on_planet(player_ship, planet):
+                                landed_planet = planet
+                                game_type = "planet"
+                                particles.clear()  # Planet view coordinates are unrelated to space
+                                # Initialize planet view
+                                planet_ship = Spaceship(WIDTH / 2, HEIGHT / 2)
                             
-                            # Generate orbiting ships if we're landing on a new planet
-                            if landed_planet != last_planet:
-                                comm_location = orbit_ship_location()
-                                hub_location = orbit_ship_location([comm_location])
-                                communications = comm_ship(comm_location, [landed_planet, planets])
-                                hub = hub_ship(hub_location, [landed_planet, planets])
-                                last_planet = landed_planet
+                                # Generate orbiting ships if we're landing on a new planet
+                                if landed_planet != last_planet:
+                                    comm_location = orbit_ship_location()
+                                    hub_location = orbit_ship_location([comm_location])
+                                    communications = comm_ship(comm_location, [landed_planet, catalog])
+                                    hub = hub_ship(hub_location, [landed_planet, catalog])
+                                    last_planet = landed_planet
                             
-                            break
+                                break
                             
-                elif game_type == "planet":
-                    if event.key == pygame.K_q:  # Take off
-                        game_type = "space"
-                        # Reset camera to follow spaceship, after taking off
-                        camera_x = player_ship.x - WIDTH // 2
-                        camera_y = player_ship.y - HEIGHT // 2
-                    elif event.key == pygame.K_e:
-                        if communications.check_border(planet_ship.x, planet_ship.y):
-                            loc = "comm"
-                        elif hub.check_border(planet_ship.x, planet_ship.y):
-                            loc = "hub"
+                    elif game_type == "planet":
+                        if event.key == pygame.K_q:  # Take off
+                            game_type = "space"
+                            particles.clear()
+                            # Reset camera to follow spaceship, after taking off
+                            camera_x = player_ship.x - WIDTH // 2
+                            camera_y = player_ship.y - HEIGHT // 2
+                            prev_camera_x, prev_camera_y = camera_x, camera_y
+                        elif event.key == pygame.K_e:
+                            if communications.check_border(planet_ship.x, planet_ship.y):
+                                scenes.push(communications.menu_scene(player))
+                            elif hub.check_border(planet_ship.x, planet_ship.y):
+                                scenes.push(hub.menu_scene())
         
-        # Process current game type
-        if game_type == "space":
-            # Update spaceship position
-            camera_x, camera_y = player_ship.update(pygame.key.get_pressed(), camera_x, camera_y)
-            
-            # Render space view
-            render_space_view(screen, planets, player_ship, camera_x, camera_y)
+        # Don't interpolate the camera across a switch between views
+        if (game_type, len(scenes)) != mode:
+            prev_camera_x, prev_camera_y = camera_x, camera_y
+
+        # --- Simulation: run every tick that is due, even if that means rendering fewer frames ---
+        keys = input_source.get_pressed()
+        if scenes:
+            # Time spent in a menu is not simulated
+            timestep.resync()
+            due = 0
+        else:
+            due = timestep.advance()
+        for _ in range(input_source.frame_ticks(due)):
+            prev_camera_x, prev_camera_y = camera_x, camera_y
+
+            with profiler.stage("ship update"):
+                # Advance planetary orbits and keep the asteroid belts with their planets
+                star_systems.advance(timestep.dt)
+                asteroid_field.follow(star_systems.x, star_systems.y)
+
+                if game_type == "space":
+                    player_ship.store_previous()
+                    camera_x, camera_y = player_ship.update(keys, camera_x, camera_y)
+                    asteroid_field.update()
+                    explored.reveal(player_ship.x, player_ship.y)
+
+                elif game_type == "map":
+                    galaxy_map.update(keys)
+
+                else:
+                    # Update planetary ship position
+                    planet_ship.store_previous()
+                    camera_x, camera_y = planet_ship.update_with_boundaries(keys, camera_x, camera_y, 
+                                        [-boundary_size_x, boundary_size_x + WIDTH, 
+                                        -boundary_size_y, boundary_size_y + HEIGHT])
+
+                particles.update()
+
+        # Missions depend on where the player is, not on time: updated once per frame
+        with profiler.stage("missions"):
+            scenes.update()
+            if scenes:
+                update_player_missions(current_planet=landed_planet, location_type=scenes.location())
+            elif game_type == "space":
+                update_player_missions(current_planet=None, location_type="space")
+            elif game_type == "planet":
+                # Update mission progress when on a planet
+                update_player_missions(current_planet=landed_planet, location_type="planet")
+
+        # --- Rendering: positions interpolated between the last two ticks ---
+        alpha = timestep.alpha
+        render_camera_x = lerp(prev_camera_x, camera_x, alpha)
+        render_camera_y = lerp(prev_camera_y, camera_y, alpha)
+
+        if scenes:
+            scenes.draw(screen, tracker)
+
+        elif game_type == "space":
+            render_space_view(screen, catalog, player_ship, render_camera_x, render_camera_y, asteroid_field,
+                              star_systems, explored, alpha)
+
+        elif game_type == "map":
+            galaxy_map.draw(screen, player_ship.x, player_ship.y)
             
         else:  # game_type == "planet"
-            # Handle interaction with communications/hub if active
-            if loc == "comm":
-                try:
-                    new_loc = communications.comm_menu(screen, player, update_player_missions)
-                    if new_loc:  # Only update if a valid location was returned
-                        loc = new_loc
-                except Exception as e:
-                    print(f"Error in comm menu: {e}")
-                    loc = "planet"  # Fallback to planet view
-                    
-            elif loc == "hub":
-                try:
-                    new_loc = hub.hub_menu(screen, player, update_player_missions)
-                    if new_loc:  # Only update if a valid location was returned
-                        loc = new_loc
-                except Exception as e:
-                    print(f"Error in hub menu: {e}")
-                    loc = "planet"  # Fallback to planet view
-                    
-            else:
-                # Update planetary ship position
-                keys = pygame.key.get_pressed()
-                camera_x, camera_y = planet_ship.update_with_boundaries(keys, camera_x, camera_y, 
-                                    [-boundary_size_x, boundary_size_x + WIDTH, 
-                                    -boundary_size_y, boundary_size_y + HEIGHT])
-                
-                # Render planet view
-                render_planet_view(screen, landed_planet, planets, planet_ship, communications, hub, 
-                                   star_background, boundary_size_x, boundary_size_y, camera_x, camera_y, loc)
-                
-            # Update mission progress when on a planet            
-            update_player_missions(current_planet=landed_planet, location_type=loc)
+            render_planet_view(screen, landed_planet, catalog, planet_ship, communications, hub, 
+                               star_background, boundary_size_x, boundary_size_y, render_camera_x,
+                               render_camera_y, "planet", alpha)
             
         # Update and render notifications
-        notification_system.update(current_time)
-        notification_system.render(screen, current_time)
-        
-        pygame.display.flip()
-        clock.tick(FPS)
+        with profiler.stage("notifications"):
+            notification_system.update(current_time)
+            popup_rects = notification_system.render(screen, current_time)
+        hud_rect = profiler.draw(screen)
+        if hud_rect:
+            popup_rects.append(hud_rect)
 
-    # Save game on exit
-    final_save_filename = save_folder if save_folder else get_save_filename()
-    save_progress = 0.0
-    save_in_progress = True
+        # On the planet, a still camera means only the ship, its prompt and the popups changed;
+        # an open menu has marked what it repainted itself
+        view = None if scenes else (game_type, render_camera_x, render_camera_y)
+        if game_type == "planet" and view is not None and view == last_view:
+            ship_x, ship_y = planet_ship.render_position(alpha)
+            ship_area = pygame.Rect(0, 0, PLANET_SHIP_DIRTY_SIZE[0], PLANET_SHIP_DIRTY_SIZE[1])
+            ship_area.center = (ship_x - render_camera_x, ship_y - render_camera_y)
+            tracker.mark(ship_area)
+            tracker.mark(last_ship_area)
+            last_ship_area = ship_area
+        elif view is not None:
+            tracker.mark_full()
+            last_ship_area = None
+        tracker.add_overlay(popup_rects)
+        last_view = view
+        with profiler.stage("flip"):
+            if capture.active:
+                capture.grab(display.frame_surface(), current_time)
+            tracker.present()
+        profiler.end_frame()
+        # The quality governor adapts to the work done per frame, before the frame limiter sleeps
+        governor.update(time.perf_counter() - frame_start)
+        if timestep.realtime:
+            clock.tick(FPS)
 
-    def final_save_progress_callback(progress_value):
-        nonlocal save_progress
-        save_progress = progress_value
-        
-    def final_save_thread_func():
-        nonlocal save_in_progress
-        save_game(planets, spaceship=player_ship, save_name=final_save_filename, progress_callback=final_save_progress_callback)
-        save_in_progress = False
-
-    thread = threading.Thread(target=final_save_thread_func)
-    thread.start()
-    while save_in_progress:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()  # Correct quit handling during save
-                exit()
-            elif event.type == pygame.VIDEORESIZE:
-                new_width, new_height = event.w, event.h
-                screen = pygame.display.set_mode((new_width, new_height), pygame.RESIZABLE)
+    profiler.stop_csv()
+    capture.stop()
+    input_source.close()
+
+    # Save game on exit; recordings keep the save they started from, and replays never write one
+    if input_source.save_on_exit:
+        final_save_filename = save_folder if save_folder else get_save_filename()
+        save_progress = 0.0
+        save_in_progress = True
+
+        def final_save_progress_callback(progress_value):
+            nonlocal save_progress
+            save_progress = progress_value
+
+        def final_save_thread_func():
+            nonlocal save_in_progress
+            save_game(catalog, spaceship=player_ship, save_name=final_save_filename, progress_callback=final_save_progress_callback,
+                      star_systems=star_systems, explored=explored)
+            save_in_progress = False
+
+        thread = threading.Thread(target=final_save_thread_func)
+        thread.start()
+        tracker = DirtyRectTracker()
+        progress_bar = create_progress_bar()
         screen.fill((0, 0, 0))
-        draw_progress_bar(screen, save_progress)
-        pygame.display.flip()
-        clock.tick(FPS)
-    thread.join()
-    print(f"Game saved on exit: {final_save_filename}")
+        while save_in_progress:
+            for event in pygame.event.get():
+                tracker.handle_event(event)
+                if event.type == pygame.QUIT:
+                    pygame.quit()  # Correct quit handling during save
+                    exit()
+                elif event.type == pygame.VIDEORESIZE and not display.textured:
+                    new_width, new_height = event.w, event.h
+                    screen = pygame.display.set_mode((new_width, new_height), pygame.RESIZABLE)
+                    screen.fill((0, 0, 0))
+            progress_bar.set_value(save_progress)
+            tracker.mark(progress_bar.draw(screen, force=tracker.full))
+            tracker.present()
+            clock.tick(FPS)
+        thread.join()
+        print(f"Game saved on exit: {final_save_filename}")
     pygame.quit()
 
 
-def render_space_view(screen, planets, player_ship, camera_x, camera_y):
+def render_space_view(screen, catalog, player_ship, camera_x, camera_y, asteroid_field=None, star_systems=None,
+                      explored=None, alpha=1.0):
     """Renders the space view without its own game loop."""
     # --- Rendering (Space Mode) ---
-    screen.fill((0, 0, 0))
-    
-    visible_chunks = get_visible_chunks(camera_x, camera_y, WIDTH, HEIGHT)
-    for chunk_coord in visible_chunks:
-        chunk_surface = get_chunk_surface(chunk_coord)
-        world_x = chunk_coord[0] * CHUNK_SIZE
-        world_y = chunk_coord[1] * CHUNK_SIZE
-        screen_x = world_x - camera_x
-        screen_y = world_y - camera_y
-        screen.blit(chunk_surface, (screen_x, screen_y))
-
-    for planet in planets:
-        planet.draw(screen, camera_x, camera_y)
+    # Sprites go through the render queue: culled against the screen, then one blits call per layer.
+    # The world may be drawn at a lower resolution and upscaled; labels, minimap and HUD stay native.
+    world = render_queue.begin(screen, fill=(0, 0, 0))
+    scale = render_queue.scale
+    with profiler.stage("chunk blits"):
+        # The background starfield is dropped at low quality levels
+        visible_chunks = ()
+        if governor.settings["starfield"]:
+            visible_chunks = get_visible_chunks(camera_x, camera_y, WIDTH, HEIGHT)
+        chunk_size = math.ceil(CHUNK_SIZE * scale)  # Rounded up so neighbouring chunks leave no seams
+        for chunk_coord in visible_chunks:
+            chunk_surface = get_chunk_surface(chunk_coord)
+            if chunk_size != CHUNK_SIZE:
+                chunk_surface = sprite_cache.get_scaled(("chunk",) + chunk_coord, chunk_surface,
+                                                        (chunk_size, chunk_size))
+            world_x = chunk_coord[0] * CHUNK_SIZE
+            world_y = chunk_coord[1] * CHUNK_SIZE
+            screen_x = int((world_x - camera_x) * scale)
+            screen_y = int((world_y - camera_y) * scale)
+            render_queue.submit(LAYER_BACKGROUND, chunk_surface, (screen_x, screen_y))
+
+        if star_systems is not None:
+            star_systems.submit_stars(render_queue, camera_x, camera_y)
+        render_queue.flush(world, below=LAYER_PLANETS)
+
+    with profiler.stage("planet draws"):
+        # Only planets in grid cells around the view can be on screen; views are created just for those
+        margin = MAX_PLANET_RADIUS
+        visible_planets = catalog.query_rect(camera_x - margin, camera_y - margin,
+                                             camera_x + WIDTH + margin, camera_y + HEIGHT + margin)
+        for planet in visible_planets:
+            planet.submit(render_queue, camera_x, camera_y)
+
+        if asteroid_field is not None:
+            asteroid_field.submit(render_queue, camera_x, camera_y)
+        render_queue.flush(world, below=LAYER_SHIP)
         
-    update_player_missions(current_planet=None, location_type="space")
-    
-    for mission in player.missions:
-        if mission.steps:
-            current_step = mission.steps[0]
-            if not current_step.is_complete and hasattr(current_step, 'type') and current_step.type == "Deliver":
-                player_location = (player_ship.x - camera_x, player_ship.y - camera_y)
-                # Find the planet with the same name as the mission's endpoint
-                endpoint_planet = next((planet for planet in planets if planet.name == current_step.task.endpoint_planet), None)
-                if endpoint_planet:
-                    endpoint_location = (endpoint_planet.x - camera_x, endpoint_planet.y - camera_y)
-                    pygame.draw.line(screen, (255, 0, 0), player_location, endpoint_location, 1)
-
-    player_ship.draw(screen, camera_x, camera_y)
-    draw_mini_map(screen, player_ship, planets)
-
-
-def render_planet_view(screen, planet, planets, spaceship, communications, hub, star_background, 
-                      boundary_size_x, boundary_size_y, camera_x, camera_y, loc):
+    with profiler.stage("missions"):
+        for mission in player.missions:
+            if mission.steps:
+                current_step = mission.steps[0]
+                if not current_step.is_complete and hasattr(current_step, 'type') and current_step.type == "Deliver":
+                    player_location = ((player_ship.x - camera_x) * scale, (player_ship.y - camera_y) * scale)
+                    # Find the planet with the same name as the mission's endpoint
+                    endpoint_planet = catalog.find_by_name(current_step.task.endpoint_planet)
+                    if endpoint_planet:
+                        endpoint_location = ((endpoint_planet.x - camera_x) * scale,
+                                             (endpoint_planet.y - camera_y) * scale)
+                        pygame.draw.line(world, (255, 0, 0), player_location, endpoint_location, 1)
+
+    particles.submit(render_queue, LAYER_SHIP, camera_x, camera_y, alpha)
+    player_ship.submit(render_queue, camera_x, camera_y, alpha)
+    render_queue.flush(world, below=LAYER_LABELS)
+    render_queue.present(screen)
+    render_queue.flush(screen)
+    with profiler.stage("minimap"):
+        draw_mini_map(screen, player_ship, catalog, star_systems, explored)
+
+
+def render_planet_view(screen, planet, catalog, spaceship, communications, hub, star_background, 
+                      boundary_size_x, boundary_size_y, camera_x, camera_y, loc, alpha=1.0):
     """Renders the planet view without its own game loop."""
     # Calculate the region of the background to display based on camera position
     bg_x = camera_x + boundary_size_x
     bg_y = camera_y + boundary_size_y
     view_rect = pygame.Rect(bg_x, bg_y, WIDTH, HEIGHT)
+    world = render_queue.begin(screen)
+    scale = render_queue.scale
     
     # Draw the star background
-    screen.blit(star_background, (0, 0), view_rect)
+    with profiler.stage("chunk blits"):
+        if world is screen:
+            render_queue.submit(LAYER_BACKGROUND, star_background, (0, 0), view_rect)
+            render_queue.flush(world, below=LAYER_PLANETS)
+        else:
+            # Scaled straight from the visible region; a scaled copy of the whole background would be huge
+            region = star_background.subsurface(view_rect.clip(star_background.get_rect()))
+            pygame.transform.scale(region, world.get_size(), world)
     
     # Draw the border
-    draw_border(screen, boundary_size_x, boundary_size_y, camera_x, camera_y)
+    draw_border(world, boundary_size_x, boundary_size_y, camera_x, camera_y, scale)
     
-    # Draw the planet
-    planet.draw_visit(screen, camera_x, camera_y, WIDTH / 2, HEIGHT / 2)
+    # Draw the planet and the orbiting ships, then their borders on top
+    with profiler.stage("planet draws"):
+        planet.submit_visit(render_queue, camera_x, camera_y, WIDTH / 2, HEIGHT / 2)
+        communications.submit(render_queue, camera_x, camera_y)
+        hub.submit(render_queue, camera_x, camera_y)
+        render_queue.flush(world, below=LAYER_SHIP)
+    communications.draw_border(world, camera_x, camera_y, scale)
+    hub.draw_border(world, camera_x, camera_y, scale)
     
-    # Communication ship
-    communications.draw(screen, camera_x, camera_y)
-    if communications.check_border(spaceship.x, spaceship.y):
-        font = pygame.font.Font(None, 36)
-        text_surface = font.render("Press E to interact", True, (255, 255, 255))
+    # Interaction prompt while inside the communication or hub ship's border
+    if communications.check_border(spaceship.x, spaceship.y) or hub.check_border(spaceship.x, spaceship.y):
+        text_surface = render_text("Press E to interact", INTERACT_FONT, WHITE)
         text_rect = text_surface.get_rect(center=(spaceship.x - camera_x, spaceship.y - camera_y - 50))
-        screen.blit(text_surface, text_rect)
+        render_queue.submit(LAYER_LABELS, text_surface, text_rect)
     
-    # Hub ship
-    hub.draw(screen, camera_x, camera_y)
-    if hub.check_border(spaceship.x, spaceship.y):  
-        font = pygame.font.Font(None, 36)
-        text_surface = font.render("Press E to interact", True, (255, 255, 255))
-        text_rect = text_surface.get_rect(center=(spaceship.x - camera_x, spaceship.y - camera_y - 50))
-        screen.blit(text_surface, text_rect)
-    
-    # Draw spaceship
-    spaceship.draw(screen, camera_x, camera_y)
+    # Draw the exhaust, then the spaceship over it
+    particles.submit(render_queue, LAYER_SHIP, camera_x, camera_y, alpha)
+    spaceship.submit(render_queue, camera_x, camera_y, alpha)
+    render_queue.flush(world, below=LAYER_LABELS)
+    render_queue.present(screen)
+    render_queue.flush(screen)
 
 
-def draw_border(screen, boundary_size_x, boundary_size_y, camera_x, camera_y):
-    """Draw the planet boundary border."""
+def draw_border(screen, boundary_size_x, boundary_size_y, camera_x, camera_y, scale=1.0):
+    """Draw the planet boundary border (on a surface rendered at `scale` of the screen resolution)."""
     # Draw the border relative to the camera view grey
     border_rect = pygame.Rect(
         -boundary_size_x -5 - 2*camera_x -1,   # left in screen space
@@ -303,14 +517,21 @@ def draw_border(screen, boundary_size_x, boundary_size_y, camera_x, camera_y):
         2* boundary_size_y + HEIGHT + 5 + 2               # height
     )
     
-    pygame.draw.rect(screen, (3, 227, 252), border_rect, 2)
+    pygame.draw.rect(screen, (3, 227, 252), scale_rect(border_rect, scale), 2)
     border_rect = pygame.Rect(
         -boundary_size_x -5 - 2*camera_x - 4,   # left in screen space
         -boundary_size_y -5 - 2*camera_y - 4,   # top in screen space
         2* boundary_size_x + WIDTH + 5 + 8,               # width
         2* boundary_size_y + HEIGHT + 5 + 8                # height
     )
-    pygame.draw.rect(screen, (255, 255, 255), border_rect, 3)
+    pygame.draw.rect(screen, (255, 255, 255), scale_rect(border_rect, scale), 3)
+
+
+def scale_rect(rect, scale):
+    """Return a copy of `rect` with its position and size multiplied by `scale`."""
+    if scale == 1.0:
+        return rect
+    return pygame.Rect(rect.x * scale, rect.y * scale, rect.width * scale, rect.height * scale)
 
 
 def create_star_background(width, height):
@@ -0,0 +1,274 @@
+"""
+Module: game_input
+Defines the input sources the game loop reads events and key state from, including the
+recorder and replayer of input logs used to reproduce sessions exactly.
+
+Input log format (little-endian):
+    header: magic, version, RNG seed, ship x, ship y, simulation time, save name
+    frame:  simulation ticks, flags, event count,
+            [held key count, scancodes...] if the key state changed (flag 1),
+            events: type, then the fields listed in EVENT_FIELDS for that type
+"""
+
+import random
+import struct
+import numpy as np
+import pygame
+
+LOG_MAGIC = b"IHREC"
+LOG_VERSION = 1
+_HEADER = struct.Struct("<5sBIdddH")
+_FRAME = struct.Struct("<BBH")
+_COUNT = struct.Struct("<H")
+_EVENT_TYPE = struct.Struct("<I")
+KEYS_CHANGED = 1
+
+# Events recorded in input logs: type -> (struct format, attributes). Other events (window
+# exposure, focus, ...) are not part of the log and still come from pygame on replay.
+EVENT_FIELDS = {
+    pygame.QUIT: ("<", ()),
+    pygame.KEYDOWN: ("<iHI", ("key", "mod", "scancode")),
+    pygame.KEYUP: ("<iHI", ("key", "mod", "scancode")),
+    pygame.MOUSEBUTTONDOWN: ("<hhB", ("pos", "button")),
+    pygame.MOUSEBUTTONUP: ("<hhB", ("pos", "button")),
+    pygame.MOUSEMOTION: ("<hhhhBBB", ("pos", "rel", "buttons")),
+    pygame.MOUSEWHEEL: ("<ii", ("x", "y")),
+    pygame.VIDEORESIZE: ("<HH", ("size",)),
+}
+TUPLE_FIELDS = {"pos": 2, "rel": 2, "buttons": 3, "size": 2}
+_EVENT_STRUCTS = {event_type: struct.Struct(fmt) for event_type, (fmt, _) in EVENT_FIELDS.items()}
+
+
+def seed_generators(seed):
+    """Seed the random and NumPy global generators used by the simulation."""
+    random.seed(seed)
+    np.random.seed(seed)
+
+
+class LiveInput:
+    """Reads input straight from pygame: the event queue and the current keyboard state."""
+
+    save_on_start = True  # run_game writes the save when the session starts
+    save_on_exit = True   # ... and when it ends
+
+    def start(self, state):
+        """
+        Called once before the first frame.
+
+        :param state: Dict with the starting "save", ship "x" and "y" and simulation "time".
+        :return: The state to start from (replays substitute the recorded one).
+        """
+        return state
+
+    def get_events(self):
+        """Return the events of this frame."""
+        return pygame.event.get()
+
+    def get_pressed(self):
+        """Return the key state sequence for this frame, indexable by pygame key constants."""
+        return pygame.key.get_pressed()
+
+    def frame_ticks(self, ticks):
+        """
+        Return the number of simulation ticks to run this frame.
+
+        :param ticks: Ticks due according to the simulation clock.
+        """
+        return ticks
+
+    def close(self):
+        """Called once after the last frame."""
+
+
+class ScriptedKeys:
+    """Key state for scripted input: every key in `held` reads as pressed."""
+
+    def __init__(self, held=()):
+        self.held = set(held)
+
+    def __getitem__(self, key):
+        return key in self.held
+
+
+class ScriptedInput(LiveInput):
+    def __init__(self, script, frames):
+        """
+        Initialize a scripted input source.
+
+        Real pygame events are still delivered (window events, timers), with the scripted ones added.
+
+        :param script: List of (frame, action, keys) tuples; action is "press" (key down event and
+                       held from then on), "hold" or "release".
+        :param frames: Frame after which a QUIT event ends the run.
+        """
+        self.script = sorted(script, key=lambda step: step[0])
+        self.frames = frames
+        self.frame = -1
+        self.keys = ScriptedKeys()
+        self._next = 0
+
+    def get_events(self):
+        self.frame += 1
+        events = pygame.event.get()
+        while self._next < len(self.script) and self.script[self._next][0] <= self.frame:
+            _, action, keys = self.script[self._next]
+            self._next += 1
+            for key in keys:
+                if action == "release":
+                    self.keys.held.discard(key)
+                    events.append(pygame.event.Event(pygame.KEYUP, key=key, mod=0, unicode="", scancode=0))
+                else:
+                    self.keys.held.add(key)
+                    if action == "press":
+                        events.append(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0))
+        if self.frame >= self.frames:
+            events.append(pygame.event.Event(pygame.QUIT))
+        return events
+
+    def get_pressed(self):
+        return self.keys
+
+
+class RecordingInput(LiveInput):
+    # The log replays against the save as it was when recording started, so it is not saved over on exit
+    save_on_exit = False
+
+    def __init__(self, path, seed=None):
+        """
+        Initialize a recorder: live input that is also written to an input log.
+
+        :param path: Output file for the log.
+        :param seed: Seed for the random generators; a fresh one is drawn if None.
+        """
+        self.path = path
+        self.seed = seed if seed is not None else random.SystemRandom().getrandbits(32)
+        self.file = None
+        self.events = []
+        self.keys = None
+        self.last_held = None
+
+    def start(self, state):
+        seed_generators(self.seed)
+        name = (state.get("save") or "").encode("utf-8")
+        self.file = open(self.path, "wb")
+        self.file.write(_HEADER.pack(LOG_MAGIC, LOG_VERSION, self.seed, state["x"], state["y"], state["time"],
+                                     len(name)))
+        self.file.write(name)
+        print(f"Recording input to {self.path}")
+        return state
+
+    def get_events(self):
+        self.events = pygame.event.get()
+        return self.events
+
+    def get_pressed(self):
+        self.keys = pygame.key.get_pressed()
+        return self.keys
+
+    def frame_ticks(self, ticks):
+        """Write this frame to the log; called once per frame after its events and key state were read."""
+        held = tuple(i for i, pressed in enumerate(self.keys) if pressed)
+        events = [event for event in self.events if event.type in EVENT_FIELDS]
+        changed = held != self.last_held
+        self.last_held = held
+
+        data = [_FRAME.pack(ticks, KEYS_CHANGED if changed else 0, len(events))]
+        if changed:
+            data.append(_COUNT.pack(len(held)))
+            data.append(struct.pack(f"<{len(held)}H", *held))
+        for event in events:
+            values = []
+            for name in EVENT_FIELDS[event.type][1]:
+                value = getattr(event, name)
+                values.extend(value if name in TUPLE_FIELDS else (value,))
+            data.append(_EVENT_TYPE.pack(event.type))
+            data.append(_EVENT_STRUCTS[event.type].pack(*values))
+        self.file.write(b"".join(data))
+        return ticks
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+            print(f"Input log written to {self.path}; the save was left as recorded, for replays")
+
+
+class ReplayInput(LiveInput):
+    # Every replay of a log starts from the same recorded save, so replays never write it
+    save_on_start = False
+    save_on_exit = False
+
+    def __init__(self, path):
+        """
+        Initialize a replay of an input log. The header is read right away, so the caller can
+        load the recorded save before the game starts.
+
+        Each frame runs the recorded number of simulation ticks with the recorded keys and events.
+        Closing the window still ends the replay; a QUIT event follows the last recorded frame.
+
+        :param path: Input log written by RecordingInput.
+        """
+        with open(path, "rb") as f:
+            self.data = f.read()
+        magic, version, self.seed, x, y, time, name_length = _HEADER.unpack_from(self.data)
+        if magic != LOG_MAGIC or version != LOG_VERSION:
+            raise ValueError(f"{path} is not a version {LOG_VERSION} input log")
+        self.offset = _HEADER.size + name_length
+        name = self.data[_HEADER.size:self.offset].decode("utf-8")
+        self.state = {"save": name or None, "x": x, "y": y, "time": time}
+        self.keys = pygame.key.ScancodeWrapper([False] * len(pygame.key.get_pressed()))
+        self.ticks = 0
+        self.frame = 0
+
+    def start(self, state):
+        seed_generators(self.seed)
+        return self.state
+
+    def get_events(self):
+        # Only window events come from pygame, plus QUIT so the replay can be cut short
+        events = [event for event in pygame.event.get()
+                  if event.type not in EVENT_FIELDS or event.type == pygame.QUIT]
+        if self.offset >= len(self.data):
+            events.append(pygame.event.Event(pygame.QUIT))
+            return events
+
+        self.ticks, flags, count = _FRAME.unpack_from(self.data, self.offset)
+        self.offset += _FRAME.size
+        if flags & KEYS_CHANGED:
+            (held_count,) = _COUNT.unpack_from(self.data, self.offset)
+            self.offset += _COUNT.size
+            held = struct.unpack_from(f"<{held_count}H", self.data, self.offset)
+            self.offset += 2 * held_count
+            pressed = [False] * len(self.keys)
+            for index in held:
+                pressed[index] = True
+            self.keys = pygame.key.ScancodeWrapper(pressed)
+
+        for _ in range(count):
+            (event_type,) = _EVENT_TYPE.unpack_from(self.data, self.offset)
+            self.offset += _EVENT_TYPE.size
+            values = _EVENT_STRUCTS[event_type].unpack_from(self.data, self.offset)
+            self.offset += _EVENT_STRUCTS[event_type].size
+            attributes = {}
+            position = 0
+            for name in EVENT_FIELDS[event_type][1]:
+                width = TUPLE_FIELDS.get(name)
+                if width:
+                    attributes[name] = values[position:position + width]
+                    position += width
+                else:
+                    attributes[name] = values[position]
+                    position += 1
+            if event_type in (pygame.KEYDOWN, pygame.KEYUP):
+                attributes["unicode"] = ""
+            elif event_type == pygame.VIDEORESIZE:
+                attributes["w"], attributes["h"] = attributes["size"]
+            events.append(pygame.event.Event(event_type, attributes))
+        self.frame += 1
+        return events
+
+    def get_pressed(self):
+        return self.keys
+
+    def frame_ticks(self, ticks):
+        return self.ticks
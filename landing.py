@@ -3,6 +3,9 @@ from classes.spaceship import Spaceship
 from classes.planet import Planet
 import math
 
+# Largest planet radius (a 256px sprite at the maximum 6.0 scale); bounds spatial lookups around the ship.
+MAX_PLANET_RADIUS = 768
+
 def is_ship_on_planet(ship: Spaceship, planet : Planet):
     planet_center = (planet.x, planet.y)
     # Compute effective radius: half the sprite width times the current scale.
@@ -3,50 +3,69 @@ Module: main
 Handles game initialization, main menu, and game loading.
 """
 
+import argparse
 import pygame
 import threading
 import random
-from ui import show_main_menu, show_loading_screen, show_save_selection_menu, get_custom_save_name, draw_progress_bar
+from ui import show_main_menu, show_loading_screen, show_save_selection_menu, get_custom_save_name, create_progress_bar
 from utils import list_save_files, get_save_filename, WIDTH, HEIGHT, STAR_FIELD_RANGE, FPS, PLANET_COUNT
 from game import run_game
+from game_input import RecordingInput, ReplayInput
+from render_queue import MIN_RENDER_SCALE, MAX_RENDER_SCALE
+from quality import governor
+from dirty_rects import DirtyRectTracker
+from display_backend import display, BACKENDS
+from assets import assets
+from frame_capture import capture, CAPTURE_FORMATS
 from save_funcs import load_game
-from classes.planet import Planet
+from classes.planet_catalog import PlanetCatalog
+from classes.star_systems import StarSystems
 
 def init_sample(screen, clock): 
     # Load the predefined sample world instead of creating a new one
-        current_save_filename = "sample world"
         show_loading_screen(screen, "Loading Sample World...")
-        load_progress = 0.0
-        load_in_progress = True
-        loaded_result = {}
+        return load_save(screen, clock, "sample world")
 
-        def load_progress_callback(progress):
-            nonlocal load_progress
-            load_progress = progress
 
-        def load_thread_func():
-            nonlocal load_in_progress
-            loaded_result["planets"], loaded_result["spaceship_data"] = load_game(
-                "sample world", progress_callback=load_progress_callback
-            )
-            load_in_progress = False
+def load_save(screen, clock, save_name):
+    """
+    Load a save on a background thread while showing the progress bar.
 
-        thread = threading.Thread(target=load_thread_func)
-        thread.start()
-        while load_in_progress:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    exit()
-            screen.fill((0, 0, 0))
-            draw_progress_bar(screen, load_progress)
-            pygame.display.flip()
-            clock.tick(FPS)
-        thread.join()
-        planets = loaded_result["planets"]
-        spaceship_data = loaded_result["spaceship_data"]
-        print("Loaded sample world.")
-        return planets, spaceship_data, current_save_filename
+    :return: (catalog, spaceship_data, save_name, star_systems)
+    """
+    load_progress = 0.0
+    load_in_progress = True
+    loaded_result = {}
+
+    def load_progress_callback(progress):
+        nonlocal load_progress
+        load_progress = progress
+
+    def load_thread_func():
+        nonlocal load_in_progress
+        loaded_result["catalog"], loaded_result["spaceship_data"], loaded_result["star_systems"] = load_game(
+            save_name, progress_callback=load_progress_callback
+        )
+        load_in_progress = False
+
+    thread = threading.Thread(target=load_thread_func)
+    thread.start()
+    tracker = DirtyRectTracker()
+    progress_bar = create_progress_bar()
+    screen.fill((0, 0, 0))
+    while load_in_progress:
+        for event in pygame.event.get():
+            tracker.handle_event(event)
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                exit()
+        progress_bar.set_value(load_progress)
+        tracker.mark(progress_bar.draw(screen, force=tracker.full))
+        tracker.present()
+        clock.tick(FPS)
+    thread.join()
+    print(f"Loaded save from {save_name}")
+    return loaded_result["catalog"], loaded_result["spaceship_data"], save_name, loaded_result["star_systems"]
 
 
 def load_world(screen, clock): 
@@ -55,73 +74,81 @@ def load_world(screen, clock):
         selected_save = show_save_selection_menu(screen, save_files)
         current_save_filename = selected_save
         show_loading_screen(screen, "Loading Save...")
-        load_progress = 0.0
-        load_in_progress = True
-        loaded_result = {}
-
-        def load_progress_callback(progress):
-            nonlocal load_progress
-            load_progress = progress
-
-        def load_thread_func():
-            nonlocal load_in_progress
-            loaded_result["planets"], loaded_result["spaceship_data"] = load_game(
-                selected_save, progress_callback=load_progress_callback
-            )
-            load_in_progress = False
-
-        thread = threading.Thread(target=load_thread_func)
-        thread.start()
-        while load_in_progress:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    exit()
-            screen.fill((0, 0, 0))
-            draw_progress_bar(screen, load_progress)
-            pygame.display.flip()
-            clock.tick(FPS)
-        thread.join()
-        planets = loaded_result["planets"]
-        spaceship_data = loaded_result["spaceship_data"]
-        print(f"Loaded save from {selected_save}")
-        return planets, spaceship_data, current_save_filename
+        return load_save(screen, clock, selected_save)
     else:
         print("No save files found. Starting a new game.")
-        return [], None, get_custom_save_name(screen)
+        save_name = get_custom_save_name(screen)
+        return PlanetCatalog(save_name), None, save_name, None
  
  
 def create_world(screen, clock):  
     custom_name = get_custom_save_name(screen)
     show_loading_screen(screen, "Loading... Please wait")
     current_save_filename = get_save_filename(custom_name) if custom_name else get_save_filename()
-    planets = [Planet(random.randint(-STAR_FIELD_RANGE, STAR_FIELD_RANGE),
-            random.randint(-STAR_FIELD_RANGE, STAR_FIELD_RANGE), planet_id=_ ,save_folder=current_save_filename)
-    for _ in range(PLANET_COUNT)]
+    # Only the catalog columns are created here; planet sprites are generated once the planets are seen.
+    catalog = PlanetCatalog.generate(PLANET_COUNT, current_save_filename)
+    star_systems = StarSystems.generate()
+    star_systems.assign_orbits(catalog)
     spaceship_data = None
     
-    return planets, spaceship_data, current_save_filename
+    return catalog, spaceship_data, current_save_filename, star_systems
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Infinite Horizons")
+    parser.add_argument("--record", metavar="LOG", help="Record the session's input to an input log.")
+    parser.add_argument("--replay", metavar="LOG", help="Replay an input log against the save it was recorded on.")
+    parser.add_argument("--render-scale", type=float,
+                        help=f"Render the world at this fraction of the window resolution "
+                             f"({MIN_RENDER_SCALE}-{MAX_RENDER_SCALE}); the HUD stays sharp.")
+    parser.add_argument("--fixed-quality", action="store_true",
+                        help="Keep full quality instead of lowering it when frames take too long.")
+    parser.add_argument("--renderer", choices=BACKENDS, default="surface",
+                        help="Draw with CPU surface blits (default) or GPU textures; texture-software uses "
+                             "SDL's software renderer.")
+    parser.add_argument("--capture", choices=CAPTURE_FORMATS,
+                        help="Capture frames from the start of the game (F5 toggles capturing in any case).")
+    args = parser.parse_args()
+    if args.render_scale is not None:
+        governor.set_max_render_scale(args.render_scale)
+    if args.fixed_quality:
+        governor.set_enabled(False)
+    if args.capture:
+        print(f"Capturing frames to {capture.start(fmt=args.capture)}")
+
     pygame.init()
-    screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.RESIZABLE)
+    screen = display.open((WIDTH, HEIGHT), pygame.RESIZABLE, args.renderer)
     pygame.display.set_caption("Infinite Horizons")
+    # Ship sprites and station rooms load while the player is in the main menu
+    assets.preload()
     clock = pygame.time.Clock()
      
     current_save_filename = None
     testing = False
+    input_source = RecordingInput(args.record) if args.record else None
     
+    if args.replay:
+        # Replays run one recorded frame after another as fast as possible, for timing comparisons,
+        # so quality stays fixed
+        input_source = ReplayInput(args.replay)
+        governor.set_enabled(False)
+        show_loading_screen(screen, "Loading Replay...")
+        catalog, spaceship_data, current_save_filename, star_systems = load_save(screen, clock,
+                                                                                 input_source.state["save"])
+        run_game(screen, catalog, spaceship_data, current_save_filename, star_systems, realtime=False,
+                 input_source=input_source)
+        return
+
     if not testing:
         choice = show_main_menu(screen)
         if choice == "l":
-            planets, spaceship_data, current_save_filename = load_world(screen, clock) # Load world
+            catalog, spaceship_data, current_save_filename, star_systems = load_world(screen, clock) # Load world
         else:
-            planets, spaceship_data, current_save_filename = create_world(screen, clock) # Create world
+            catalog, spaceship_data, current_save_filename, star_systems = create_world(screen, clock) # Create world
     else:
-        planets, spaceship_data, current_save_filename = init_sample(screen, clock) # Testing world
+        catalog, spaceship_data, current_save_filename, star_systems = init_sample(screen, clock) # Testing world
         
-    run_game(screen, planets, spaceship_data, current_save_filename)
+    run_game(screen, catalog, spaceship_data, current_save_filename, star_systems, input_source=input_source)
 
 if __name__ == "__main__":
     main()
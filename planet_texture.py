@@ -427,9 +427,10 @@ THEMES = [
 
 class NoiseGen:
     @staticmethod
-    def generate_noise(resolution, avg_temperature, custom_params=None):
+    def generate_noise(resolution, avg_temperature, custom_params=None, rnd=random):
         """
         custom_params: Optional dict to override default noise parameters.
+        rnd: Random source used to pick the noise base.
         """
         center = resolution // 2
         # Default noise parameters.
@@ -437,7 +438,7 @@ class NoiseGen:
         octaves = custom_params.get("octaves", 8) if custom_params else 8
         persistence = custom_params.get("persistence", 0.55) if custom_params else 0.55
         lacunarity = custom_params.get("lacunarity", 2.0) if custom_params else 2.0
-        seed = random.randint(0, 100)
+        seed = rnd.randint(0, 100)
         noise_array = np.zeros((resolution, resolution))
         water_noise_array = np.zeros((resolution, resolution))
         land_noise_array = np.zeros((resolution, resolution))
@@ -464,13 +465,13 @@ class NoiseGen:
         return water_normalized, land_normalized
 
     @staticmethod
-    def generate_clouds_noise(resolution, custom_params=None):
+    def generate_clouds_noise(resolution, custom_params=None, rnd=random):
         center = resolution // 2
         scale = custom_params.get("scale", 0.3 * resolution) if custom_params else 0.3 * resolution
         octaves = custom_params.get("octaves", 6) if custom_params else 6
         persistence = custom_params.get("persistence", 0.45) if custom_params else 0.45
         lacunarity = custom_params.get("lacunarity", 2.0) if custom_params else 2.0
-        seed = random.randint(0, 100)
+        seed = rnd.randint(0, 100)
         noise_array = np.zeros((resolution, resolution))
         for y in range(resolution):
             for x in range(resolution):
@@ -510,7 +511,7 @@ def pil_to_pygame(pil_image):
 #######################
 
 def generate_and_save_planet_sprite(resolution, avg_temperature, star_type="g", planet_index=None, 
-                                      save_folder="default_save", custom_theme=None):
+                                      save_folder="default_save", custom_theme=None, seed=None):
     """
     Generates a circular planet sprite PNG with the given resolution (clamped between 64 and 512)
     and average temperature. Optionally, specify a custom theme name (as a string) to use one of the themes.
@@ -522,8 +523,11 @@ def generate_and_save_planet_sprite(resolution, avg_temperature, star_type="g",
             sprites/
                 planet_X.png
 
+    Pass a seed to make the sprite reproducible without touching the global random state.
+
     Returns a tuple: (generated PIL Image, the chosen theme).
     """
+    rnd = random.Random(seed) if seed is not None else random
     resolution = max(64, min(resolution, 512))
     center = resolution // 2
 
@@ -532,9 +536,9 @@ def generate_and_save_planet_sprite(resolution, avg_temperature, star_type="g",
         theme = next((t for t in THEMES if t["name"].lower() == custom_theme.lower()), None)
         if theme is None:
             print(f"Theme '{custom_theme}' not found. Falling back to random theme.")
-            theme = random.choice(THEMES)
+            theme = rnd.choice(THEMES)
     else:
-        theme = random.choice(THEMES)
+        theme = rnd.choice(THEMES)
     print(f"Generating planet with theme: {theme['name']} at resolution {resolution}x{resolution}")
 
     # Setup custom noise parameters for certain themes (optional).
@@ -548,8 +552,8 @@ def generate_and_save_planet_sprite(resolution, avg_temperature, star_type="g",
     # Add other theme-specific tweaks here if desired.
 
     # Generate noise maps.
-    water_noise, land_noise = NoiseGen.generate_noise(resolution, avg_temperature, noise_params)
-    clouds_noise = NoiseGen.generate_clouds_noise(resolution, cloud_noise_params)
+    water_noise, land_noise = NoiseGen.generate_noise(resolution, avg_temperature, noise_params, rnd)
+    clouds_noise = NoiseGen.generate_clouds_noise(resolution, cloud_noise_params, rnd)
 
     water_map = theme["water_map"]
     land_map = theme["land_map"]
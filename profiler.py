@@ -0,0 +1,229 @@
+"""
+Module: profiler
+Provides the in-game frame profiler: scoped stage timers, rolling frame-time percentiles,
+a toggleable HUD overlay and optional per-frame CSV dumps.
+"""
+
+import csv
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+import numpy as np
+import pygame
+from text_service import get_font
+from quality import governor
+from frame_capture import capture
+
+STAGES = ("events", "ship update", "chunk blits", "planet draws", "missions", "minimap", "notifications", "flip")
+HISTORY_FRAMES = 240        # Frames kept for the rolling statistics.
+HUD_REFRESH_MS = 250        # The overlay text is re-rendered at most this often.
+HUD_FONT = ("courier", 16)
+HUD_POSITION = (10, 10)
+PROFILE_DIR = "profiles"
+
+
+class _NullTimer:
+    """Timer returned while profiling is off: entering and leaving it does nothing."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _StageTimer:
+    __slots__ = ("samples", "name", "start")
+
+    def __init__(self, samples, name):
+        self.samples = samples
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.samples[self.name] += time.perf_counter() - self.start
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class FrameProfiler:
+    def __init__(self, history=HISTORY_FRAMES, stages=STAGES):
+        """
+        Initialize the profiler; it starts disabled.
+
+        :param history: Number of frames kept for the rolling statistics.
+        :param stages: Names of the timed stages, in display order.
+        """
+        self.enabled = False  # Timing is on while the overlay is shown or a CSV dump is written.
+        self.visible = False
+        self.stages = stages
+        self.frame = 0       # Frames seen overall, used to number CSV rows.
+        self.frame_start = None  # None while the current frame is not being timed.
+        self.current = dict.fromkeys(stages, 0.0)
+        self._timers = {name: _StageTimer(self.current, name) for name in stages}
+        self._alloc_start = None  # (traced bytes, allocated blocks) at frame start, while tracemalloc runs.
+        self.reset(history)
+
+        self.csv_file = None
+        self.csv_writer = None
+        self.csv_path = None
+
+        self._hud = None
+        self._hud_time = 0
+
+    def reset(self, history=HISTORY_FRAMES):
+        """
+        Clear the recorded frames.
+
+        :param history: Number of frames kept for the rolling statistics.
+        """
+        self.history = history
+        self.frame_times = np.zeros(history)
+        self.stage_times = np.zeros((history, len(self.stages)))
+        self.alloc_bytes = np.zeros(history)   # Python memory allocated within each frame (peak growth).
+        self.alloc_blocks = np.zeros(history)  # Net change in allocated memory blocks over each frame.
+        self.count = 0       # Frames recorded since the profiler was enabled.
+
+    def set_enabled(self, enabled):
+        """Turn timing on or off without showing the overlay (used by headless benchmarks)."""
+        if enabled and not self.enabled:
+            self.count = 0
+        self.enabled = enabled
+
+    def toggle(self):
+        """Show or hide the overlay."""
+        self.visible = not self.visible
+        self.set_enabled(self.visible or self.csv_writer is not None)
+
+    def stage(self, name):
+        """
+        Return a context manager timing one stage of the current frame.
+
+        Calls for the same stage within a frame add up. While the profiler is disabled a shared
+        no-op timer is returned, so the instrumentation costs a method call and nothing else.
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return self._timers[name]
+
+    def begin_frame(self):
+        """Start timing a frame."""
+        self.frame += 1
+        if not self.enabled:
+            self.frame_start = None
+            return
+        for name in self.stages:
+            self.current[name] = 0.0
+        if tracemalloc.is_tracing():
+            # Allocation tracking only happens while tracemalloc runs, as it slows everything down.
+            tracemalloc.reset_peak()
+            self._alloc_start = (tracemalloc.get_traced_memory()[0], sys.getallocatedblocks())
+        else:
+            self._alloc_start = None
+        self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """Finish the frame: store its samples in the rolling history and the CSV dump."""
+        if not self.enabled or self.frame_start is None:
+            return
+        total = time.perf_counter() - self.frame_start
+        slot = self.count % self.history
+        self.frame_times[slot] = total
+        self.stage_times[slot] = [self.current[name] for name in self.stages]
+        if self._alloc_start is not None:
+            self.alloc_bytes[slot] = tracemalloc.get_traced_memory()[1] - self._alloc_start[0]
+            self.alloc_blocks[slot] = sys.getallocatedblocks() - self._alloc_start[1]
+        self.count += 1
+        if self.csv_writer is not None:
+            self.csv_writer.writerow([self.frame, f"{total * 1000:.3f}"] +
+                                     [f"{self.current[name] * 1000:.3f}" for name in self.stages])
+
+    def percentiles(self, points=(50, 95, 99)):
+        """Return the frame-time percentiles of the recorded history, in milliseconds."""
+        samples = self.frame_times[:min(self.count, self.history)]
+        if not len(samples):
+            return {p: 0.0 for p in points}
+        return {p: float(np.percentile(samples, p)) * 1000 for p in points}
+
+    def stage_means(self):
+        """Return the mean time per stage over the recorded history, in milliseconds."""
+        samples = self.stage_times[:min(self.count, self.history)]
+        if not len(samples):
+            return dict.fromkeys(self.stages, 0.0)
+        return dict(zip(self.stages, (samples.mean(axis=0) * 1000).tolist()))
+
+    def start_csv(self, path=None):
+        """
+        Start writing one row per frame to a CSV file; this enables timing.
+
+        :param path: Output path; defaults to a timestamped file in the profiles folder.
+        :return: The path being written.
+        """
+        self.stop_csv()
+        if path is None:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            path = os.path.join(PROFILE_DIR, f"frames_{datetime.now().strftime('%m%d%y%H%M%S')}.csv")
+        self.csv_file = open(path, "w", newline="")
+        self.csv_writer = csv.writer(self.csv_file)
+        self.csv_writer.writerow(["frame", "total_ms"] + [f"{name.replace(' ', '_')}_ms" for name in self.stages])
+        self.csv_path = path
+        self.set_enabled(True)
+        return path
+
+    def stop_csv(self):
+        """Close the CSV dump, if one is being written."""
+        if self.csv_file is not None:
+            self.csv_file.close()
+            print(f"Frame profile written to {self.csv_path}")
+        self.csv_file = None
+        self.csv_writer = None
+        self.set_enabled(self.visible)
+
+    def draw(self, screen):
+        """
+        Draw the overlay in the top-left corner.
+
+        :return: Rect covered on the screen, or None while the overlay is hidden.
+        """
+        if not self.visible:
+            return None
+        now = pygame.time.get_ticks()
+        if self._hud is None or now - self._hud_time > HUD_REFRESH_MS:
+            self._hud = self._render_hud()
+            self._hud_time = now
+        return screen.blit(self._hud, HUD_POSITION)
+
+    def _render_hud(self):
+        font = get_font(*HUD_FONT)
+        pct = self.percentiles()
+        means = self.stage_means()
+        lines = [f"frame p50 {pct[50]:5.2f}  p95 {pct[95]:5.2f}  p99 {pct[99]:5.2f} ms"]
+        lines += [f"{name:<14}{ms:6.2f} ms" for name, ms in means.items()]
+        other = (float(np.mean(self.frame_times[:min(self.count, self.history)])) * 1000
+                 if self.count else 0.0) - sum(means.values())
+        lines.append(f"{'other':<14}{max(0.0, other):6.2f} ms")
+        lines.append(governor.describe())
+        if self.csv_writer is not None:
+            lines.append(f"recording {os.path.basename(self.csv_path)}")
+        if capture.active:
+            lines.append(capture.describe())
+
+        line_height = font.get_linesize()
+        width = max(font.size(line)[0] for line in lines) + 16
+        hud = pygame.Surface((width, line_height * len(lines) + 12), pygame.SRCALPHA)
+        hud.fill((0, 0, 0, 170))
+        for i, line in enumerate(lines):
+            hud.blit(font.render(line, True, (0, 255, 0)), (8, 6 + i * line_height))
+        return hud
+
+
+# Shared profiler instrumented by the game loop.
+profiler = FrameProfiler()
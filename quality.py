@@ -0,0 +1,110 @@
+"""
+Module: quality
+Provides the adaptive quality governor. It watches the rolling frame time and steps through
+quality levels to hold the FPS target, with hysteresis so it does not oscillate between two levels.
+"""
+
+from collections import deque
+from utils import FPS
+from render_queue import render_queue
+
+# Quality levels, best first. Each step gives up a little more, so load degrades the picture gradually.
+QUALITY_LEVELS = (
+    {"render_scale": 1.0, "starfield": True, "minimap_interval_ms": 0, "notification_fades": True,
+     "rock_budget": None, "particle_budget": 4096},
+    {"render_scale": 1.0, "starfield": True, "minimap_interval_ms": 50, "notification_fades": True,
+     "rock_budget": 1500, "particle_budget": 2048},
+    {"render_scale": 0.85, "starfield": True, "minimap_interval_ms": 100, "notification_fades": False,
+     "rock_budget": 1000, "particle_budget": 1024},
+    {"render_scale": 0.7, "starfield": False, "minimap_interval_ms": 200, "notification_fades": False,
+     "rock_budget": 600, "particle_budget": 512},
+    {"render_scale": 0.5, "starfield": False, "minimap_interval_ms": 333, "notification_fades": False,
+     "rock_budget": 300, "particle_budget": 256},
+)
+WINDOW_FRAMES = 30          # Frames averaged before deciding anything.
+DEGRADE_RATIO = 0.9         # Step down when the average frame takes more than this share of the budget...
+UPGRADE_RATIO = 0.55        # ...and up only once it stays below this share...
+UPGRADE_HOLD_FRAMES = 180   # ...for this many frames in a row.
+
+
+class QualityGovernor:
+    def __init__(self, target_fps=FPS, levels=QUALITY_LEVELS):
+        """
+        Initialize the governor at the best quality level.
+
+        :param target_fps: Frame rate to hold.
+        :param levels: Quality settings per level, best first.
+        """
+        self.budget = 1.0 / target_fps
+        self.levels = levels
+        self.level = 0
+        self.settings = levels[0]
+        self.enabled = True
+        self.max_render_scale = 1.0  # Upper bound from the player's render scale setting
+        self.samples = deque(maxlen=WINDOW_FRAMES)
+        self.fast_frames = 0
+        self.changes = 0
+        self.frames_at_level = [0] * len(levels)
+
+    def set_enabled(self, enabled):
+        """Turn adaptation on or off; turning it off returns to the best level."""
+        self.enabled = enabled
+        if not enabled:
+            self.set_level(0)
+
+    def set_max_render_scale(self, scale):
+        """Set the highest render scale any level may use, and apply it."""
+        self.max_render_scale = scale
+        self.set_level(self.level)
+
+    def set_level(self, level):
+        """Switch to a quality level and forget the frame times measured at the previous one."""
+        level = min(len(self.levels) - 1, max(0, level))
+        if level != self.level:
+            self.changes += 1
+        self.level = level
+        self.settings = self.levels[level]
+        self.samples.clear()
+        self.fast_frames = 0
+        render_queue.set_scale(min(self.settings["render_scale"], self.max_render_scale))
+
+    def update(self, frame_time):
+        """
+        Record the work time of a frame and change level if needed.
+
+        :param frame_time: Seconds spent on the frame, not counting the frame limiter's sleep.
+        """
+        self.frames_at_level[self.level] += 1
+        if not self.enabled:
+            return
+        self.samples.append(frame_time)
+        if len(self.samples) < WINDOW_FRAMES:
+            return
+        average = sum(self.samples) / WINDOW_FRAMES
+        if average > self.budget * DEGRADE_RATIO:
+            if self.level < len(self.levels) - 1:
+                self.set_level(self.level + 1)
+        elif average < self.budget * UPGRADE_RATIO:
+            self.fast_frames += 1
+            if self.fast_frames >= UPGRADE_HOLD_FRAMES and self.level > 0:
+                self.set_level(self.level - 1)
+        else:
+            self.fast_frames = 0
+
+    def describe(self):
+        """Return a one-line summary of the current level, for the profiler overlay."""
+        return (f"quality {self.level}/{len(self.levels) - 1}{'' if self.enabled else ' (fixed)'}  "
+                f"scale {render_queue.scale:.2f}")
+
+    def stats(self):
+        """Return the current level and how the frames were spread over the levels."""
+        return {
+            "enabled": self.enabled,
+            "level": self.level,
+            "changes": self.changes,
+            "frames_at_level": list(self.frames_at_level),
+        }
+
+
+# Shared governor read by the systems with quality knobs.
+governor = QualityGovernor()
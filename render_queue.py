@@ -0,0 +1,190 @@
+"""
+Module: render_queue
+Collects the sprites of a frame by layer, drops those outside the viewport and draws each
+layer with a single Surface.blits call.
+
+The world layers can be rendered at a fraction of the output resolution to an offscreen
+target, which is upscaled to the screen in one pass; the native layers (labels) are drawn
+after that at full resolution.
+
+With the texture backend the layers are drawn by the renderer instead, always at full
+resolution since it scales for free, and sprites can be queued untransformed, leaving
+scaling and rotation to the renderer.
+"""
+
+import math
+import pygame
+from display_backend import display
+
+# Layers, drawn from the lowest to the highest; items within a layer keep their submission order.
+LAYER_BACKGROUND = 0
+LAYER_STARS = 1
+LAYER_PLANETS = 2
+LAYER_ASTEROIDS = 3
+LAYER_STATIONS = 4
+LAYER_SHIP = 5
+LAYER_LABELS = 6         # First native layer: submitted in screen coordinates, drawn after the upscale.
+LAYER_COUNT = 7
+
+RENDER_SCALE = 1.0       # Default resolution of the world layers, as a fraction of the screen's.
+MIN_RENDER_SCALE = 0.5
+MAX_RENDER_SCALE = 1.0
+
+
+class RenderQueue:
+    def __init__(self, layers=LAYER_COUNT, scale=RENDER_SCALE):
+        """
+        Initialize an empty queue.
+
+        :param layers: Number of layers.
+        :param scale: Render scale of the world layers (see set_scale).
+        """
+        self.layers = [[] for _ in range(layers)]
+        self.viewport = (0, 0, 0, 0)         # (left, top, right, bottom) of the world target
+        self.native_viewport = (0, 0, 0, 0)  # The same for the native layers, i.e. the screen
+        self.scale = 1.0
+        self.target = None  # Offscreen world surface while the scale is below 1
+        self.queued = 0
+        self.culled = 0
+        self.set_scale(scale)
+
+    def set_scale(self, scale):
+        """
+        Set the resolution of the world layers as a fraction of the screen's.
+
+        Callers submitting world layers multiply their screen positions and sprite sizes by `scale`.
+        """
+        self.scale = min(MAX_RENDER_SCALE, max(MIN_RENDER_SCALE, scale))
+
+    @property
+    def textured(self):
+        """True while the layers are drawn by the texture backend (see submit_transformed)."""
+        return display.textured
+
+    def begin(self, screen, fill=None):
+        """
+        Start a frame shown on `screen`.
+
+        :param fill: Optional color the world is cleared to.
+        :return: Surface the world layers are drawn on: the screen itself at full scale,
+                 otherwise the offscreen target, to be upscaled with present().
+        """
+        width, height = screen.get_size()
+        self.native_viewport = (0, 0, width, height)
+        for items in self.layers:
+            items.clear()
+        if display.textured:
+            # The screen is the canvas over the textures; it is cleared to transparent
+            self.scale = MAX_RENDER_SCALE
+            display.begin(fill or (0, 0, 0))
+        if self.scale >= MAX_RENDER_SCALE:
+            self.viewport = self.native_viewport
+            self.target = None
+            target = screen
+        else:
+            size = (max(1, int(width * self.scale)), max(1, int(height * self.scale)))
+            self.viewport = (0, 0) + size
+            if self.target is None or self.target.get_size() != size:
+                self.target = pygame.Surface(size).convert()
+            target = self.target
+        if fill is not None and not display.textured:
+            target.fill(fill)
+        return target
+
+    def present(self, screen):
+        """Upscale the world target to the screen, if the world was rendered offscreen."""
+        if self.target is not None:
+            pygame.transform.scale(self.target, screen.get_size(), screen)
+
+    def cull(self, x, y, width, height, native=False):
+        """
+        Check a rectangle against the viewport, counting it as culled if it is outside.
+
+        Lets callers skip preparing a sprite (scaling, rendering) that would not be seen.
+
+        :param native: Check against the screen instead of the world target.
+        :return: True if the rectangle is entirely outside the viewport.
+        """
+        left, top, right, bottom = self.native_viewport if native else self.viewport
+        if x >= right or y >= bottom or x + width <= left or y + height <= top:
+            self.culled += 1
+            return True
+        return False
+
+    def submit(self, layer, surface, dest, area=None, flags=0):
+        """
+        Queue a blit, unless it lies entirely outside the viewport.
+
+        :param layer: Layer constant.
+        :param surface: Source pygame.Surface.
+        :param dest: Top-left position (or Rect) as for Surface.blit, on the world target for
+                     world layers and on the screen for native layers.
+        :param area: Optional source rect, as for Surface.blit.
+        :param flags: Blend flags, e.g. BLEND_PREMULTIPLIED for premultiplied-alpha sprites.
+        :return: True if the item was queued.
+        """
+        width, height = surface.get_size() if area is None else (area[2], area[3])
+        if self.cull(dest[0], dest[1], width, height, layer >= LAYER_LABELS):
+            return False
+        if flags:
+            self.layers[layer].append((surface, dest, area, flags))
+        elif area is not None:
+            self.layers[layer].append((surface, dest, area))
+        else:
+            self.layers[layer].append((surface, dest))
+        self.queued += 1
+        return True
+
+    def submit_transformed(self, layer, surface, center, size, angle=0.0):
+        """
+        Queue a sprite to be stretched and rotated by the renderer; texture backend only.
+
+        :param layer: Layer constant.
+        :param surface: Source pygame.Surface with straight alpha, uploaded once as a texture.
+        :param center: Center of the sprite on the screen.
+        :param size: (width, height) the sprite is drawn at, before rotation.
+        :param angle: Rotation in degrees, clockwise.
+        :return: True if the item was queued.
+        """
+        rect = pygame.Rect((0, 0), size)
+        rect.center = center
+        if angle:
+            # Bounds of the sprite at any rotation
+            extent = math.hypot(size[0], size[1])
+            bounds = (center[0] - extent / 2, center[1] - extent / 2, extent, extent)
+        else:
+            bounds = (rect.x, rect.y, rect.width, rect.height)
+        if self.cull(*bounds, layer >= LAYER_LABELS):
+            return False
+        self.layers[layer].append((surface, rect, None, 0, angle))
+        self.queued += 1
+        return True
+
+    def extend(self, layer, items):
+        """Queue blits that the caller has already culled, as Surface.blits tuples."""
+        self.layers[layer].extend(items)
+        self.queued += len(items)
+
+    def flush(self, screen, below=None):
+        """
+        Draw the queued layers in order and empty them.
+
+        :param screen: Surface to draw on: the world target for world layers, the screen for native ones.
+        :param below: If given, only layers lower than this one are drawn; the rest stay queued,
+                      so immediate-mode drawing (lines, outlines) can go between layers.
+        """
+        for items in self.layers[:below]:
+            if items:
+                if display.textured:
+                    display.draw_items(items)
+                else:
+                    screen.blits(items, doreturn=False)
+                items.clear()
+
+    def stats(self):
+        """Return the counters of queued and culled items."""
+        return {"queued": self.queued, "culled": self.culled}
+
+
+# Shared queue used by the space and planet views.
+render_queue = RenderQueue()
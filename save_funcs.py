@@ -5,59 +5,52 @@ Handles saving and loading game state.
 
 import os
 import json
+import shutil
 import pygame
-from classes.planet import Planet
+from classes.planet_catalog import PlanetCatalog
 from classes.missions import Mission, MissionStep, TaskDeliver, TaskDeliverPassenger
+from classes.star_systems import StarSystems
+from classes.exploration import ExploredMap
 
-def save_game(planets, spaceship=None, save_name="default", progress_callback=None):
+def save_game(catalog, spaceship=None, save_name="default", progress_callback=None, star_systems=None,
+              explored=None):
     """
     Save the game state including planets and spaceship.
     
-    :param planets: List of Planet objects.
+    :param catalog: PlanetCatalog holding the planets.
     :param spaceship: Spaceship object (optional).
     :param save_name: Save folder name/path.
     :param progress_callback: Optional callback to report progress.
+    :param star_systems: StarSystems holding the stars and planet orbits (optional).
+    :param explored: ExploredMap of the regions the player has visited (optional).
     """
     os.makedirs(save_name, exist_ok=True)
     sprites_folder = os.path.join(save_name, "sprites")
     os.makedirs(sprites_folder, exist_ok=True)
-    
-    planets_data = []
-    total = len(planets)
-    for i, planet in enumerate(planets):
-        sprite_filename = os.path.join(sprites_folder, f"planet_{i}.png")
-        
-        # Save the planet sprite if it exists
-        if hasattr(planet, 'pil_sprite') and planet.pil_sprite:
+
+    # Planet sprites are written when they are generated; copy them over when saving elsewhere.
+    source_folder = os.path.join(catalog.save_folder, "sprites")
+    if os.path.isdir(source_folder) and os.path.abspath(source_folder) != os.path.abspath(sprites_folder):
+        for file_name in os.listdir(source_folder):
             try:
-                planet.pil_sprite.save(sprite_filename)
+                shutil.copy(os.path.join(source_folder, file_name), sprites_folder)
             except Exception as e:
                 print(f"Error saving planet sprite: {e}")
-        
-        # Serialize missions
-        missions_data = []
-        if hasattr(planet, 'missions') and planet.missions:
-            missions_data = [mission.to_dict() for mission in planet.missions]
-        
-        planet_data = {
-            "x": planet.x,
-            "y": planet.y,
-            "id": planet.id,
-            "missions": missions_data,
-            "res": planet.res,
-            "type": planet.type,
-            "minerals": planet.minerals,
-            "habitability": planet.habitability,
-            "name": planet.name,
-            "theme_name": planet.theme_name,
-            "scale": planet.scale,
-            "sprite_filename": sprite_filename,
-        }
-        planets_data.append(planet_data)
-        if progress_callback:
-            progress_callback((i + 1) / total)
+    if progress_callback:
+        progress_callback(0.3)
+
+    # The planet columns go to catalog.npz; data.json keeps the string tables and the missions.
+    catalog_data = catalog.save(save_name)
+    catalog_data["missions"] = {
+        str(index): [mission.to_dict() for mission in missions]
+        for index, missions in catalog.missions.items() if missions
+    }
+    if progress_callback:
+        progress_callback(0.9)
     
-    save_data = {"planets": planets_data}
+    save_data = {"catalog": catalog_data}
+    if star_systems is not None:
+        save_data["star_systems"] = star_systems.to_save_data()
     if spaceship is not None:
         # Serialize player missions if applicable
         player_missions = []
@@ -69,10 +62,14 @@ def save_game(planets, spaceship=None, save_name="default", progress_callback=No
             "y": spaceship.y,
             "missions": player_missions
         }
+        if explored is not None:
+            save_data["spaceship"]["explored"] = explored.to_save_data()
     
     data_filename = os.path.join(save_name, "data.json")
     with open(data_filename, "w") as f:
         json.dump(save_data, f)
+    if progress_callback:
+        progress_callback(1.0)
 
 def load_game(save_name, progress_callback=None):
     """
@@ -80,14 +77,14 @@ def load_game(save_name, progress_callback=None):
     
     :param save_name: Save folder name/path.
     :param progress_callback: Optional callback to report progress.
-    :return: Tuple (list of Planet objects, spaceship data dictionary).
+    :return: Tuple (PlanetCatalog, spaceship data dictionary, StarSystems).
     """
     data_filename = os.path.join(save_name, "data.json")
     
     # Check if the data file exists
     if not os.path.exists(data_filename):
         print(f"Save file not found: {data_filename}")
-        return [], None
+        return PlanetCatalog(save_name), None, None
         
     # Load the data
     try:
@@ -95,30 +92,33 @@ def load_game(save_name, progress_callback=None):
             save_data = json.load(f)
     except Exception as e:
         print(f"Error loading save data: {e}")
-        return [], None
-        
-    planets_data = save_data["planets"]
-    loaded_planets = []
-    total = len(planets_data)
-    
-    for i, data in enumerate(planets_data):
+        return PlanetCatalog(save_name), None, None
+
+    if "catalog" in save_data:
+        catalog, orbits = PlanetCatalog.load(save_name, save_data["catalog"])
+        missions_data = {int(index): missions for index, missions in save_data["catalog"].get("missions", {}).items()}
+    else:
+        # Saves from before the catalog store one dictionary per planet
+        planets_data = save_data.get("planets", [])
+        catalog = PlanetCatalog.from_planet_records(save_name, planets_data)
+        orbits = [data.get("orbit") for data in planets_data]
+        missions_data = {index: data["missions"] for index, data in enumerate(planets_data) if data.get("missions")}
+    if progress_callback:
+        progress_callback(0.5)
+
+    # Deserialize missions if they exist
+    for index, missions in missions_data.items():
         try:
-            planet = Planet.from_save_data(data)
-            
-            # Deserialize missions if they exist
-            if "missions" in data and data["missions"]:
-                planet.missions = [Mission.from_dict(mission_data) for mission_data in data["missions"]]
-            else:
-                planet.missions = []
-                
-            loaded_planets.append(planet)
-            
-            if progress_callback:
-                progress_callback((i + 1) / total)
-                
+            catalog.missions[index] = [Mission.from_dict(mission_data) for mission_data in missions]
         except Exception as e:
-            print(f"Error loading planet {i}: {e}")
-    
+            print(f"Error loading planet {index}: {e}")
+
+    # Saves from before star systems existed load with every planet fixed in place
+    star_systems = StarSystems.from_save_data(save_data.get("star_systems"))
+    star_systems.bind(catalog, orbits)
+    if progress_callback:
+        progress_callback(1.0)
+
     spaceship_data = save_data.get("spaceship", None)
     
     # Deserialize player missions if they exist
@@ -129,5 +129,13 @@ def load_game(save_name, progress_callback=None):
         except Exception as e:
             print(f"Error loading player missions: {e}")
             spaceship_data["missions"] = []
+
+    # Saves from before exploration tracking start with everything unexplored
+    if spaceship_data:
+        try:
+            spaceship_data["explored"] = ExploredMap.from_save_data(spaceship_data.get("explored"))
+        except Exception as e:
+            print(f"Error loading explored regions: {e}")
+            spaceship_data["explored"] = ExploredMap()
     
-    return loaded_planets, spaceship_data
+    return catalog, spaceship_data, star_systems
@@ -0,0 +1,120 @@
+"""
+Module: scenes
+Defines the scene stack of the game loop. Each screen shown over the game (the station menus,
+their dialogs and mission lists) is a scene: it handles events, updates and draws itself, while
+the loop that drives it stays the game's own, so frame limiting, missions, notifications and
+presentation happen once per frame whatever is on screen.
+"""
+
+
+class Scene:
+    location = None  # Location type reported to the missions while the scene is open (e.g. "hub").
+
+    def __init__(self):
+        """Initialize the scene; it is shown once pushed on a SceneStack."""
+        self.stack = None
+        self.frame = None  # Composed frame, kept until invalidate() is called
+
+    def handle_event(self, event):
+        """
+        Handle an input event while the scene is on top of the stack.
+
+        :param event: pygame event from the game's input source.
+        """
+        pass
+
+    def update(self):
+        """Advance the scene by one frame."""
+        pass
+
+    def compose(self, size):
+        """
+        Draw the scene's frame.
+
+        :param size: Screen size.
+        :return: Surface of that size, reused until the scene is invalidated.
+        """
+        raise NotImplementedError
+
+    def invalidate(self):
+        """Compose the frame again before it is next drawn, e.g. after its contents changed."""
+        self.frame = None
+
+    def draw(self, screen, tracker):
+        """
+        Draw the scene, repainting only what last frame's overlays covered if nothing else changed.
+
+        :param screen: Surface the game draws on.
+        :param tracker: DirtyRectTracker of the game loop.
+        """
+        if self.frame is None:
+            self.frame = self.compose(screen.get_size())
+            tracker.mark_full()
+        if tracker.full:
+            screen.blit(self.frame, (0, 0))
+        else:
+            tracker.erase_overlay(screen, self.frame)
+
+    def close(self):
+        """Remove the scene from its stack, uncovering the scene (or game view) below it."""
+        if self.stack is not None:
+            self.stack.remove(self)
+
+
+class SceneStack:
+    def __init__(self):
+        """Initialize an empty stack; the game views are shown while it is empty."""
+        self.scenes = []
+        self.changed = False  # The top scene changed since the last draw
+
+    def __len__(self):
+        return len(self.scenes)
+
+    @property
+    def top(self):
+        """The scene shown and receiving input, or None."""
+        return self.scenes[-1] if self.scenes else None
+
+    def push(self, scene):
+        """Show a scene over the current one."""
+        scene.stack = self
+        self.scenes.append(scene)
+        self.changed = True
+
+    def remove(self, scene):
+        """Remove a scene, along with any scenes opened from it."""
+        if scene in self.scenes:
+            for closed in self.scenes[self.scenes.index(scene):]:
+                closed.stack = None
+            del self.scenes[self.scenes.index(scene):]
+            self.changed = True
+
+    def clear(self):
+        """Remove every scene."""
+        if self.scenes:
+            self.remove(self.scenes[0])
+
+    def location(self):
+        """Return the location type of the topmost scene that sets one, or None."""
+        for scene in reversed(self.scenes):
+            if scene.location is not None:
+                return scene.location
+        return None
+
+    def handle_event(self, event):
+        """Pass an input event to the top scene."""
+        if self.scenes:
+            self.scenes[-1].handle_event(event)
+
+    def update(self):
+        """Update the top scene; the scenes below it are paused."""
+        if self.scenes:
+            self.scenes[-1].update()
+
+    def draw(self, screen, tracker):
+        """Draw the top scene (scenes cover the whole screen, so the ones below are not drawn)."""
+        if self.changed:
+            tracker.mark_full()
+            self.changed = False
+        if self.scenes:
+            self.scenes[-1].draw(screen, tracker)
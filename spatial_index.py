@@ -0,0 +1,94 @@
+"""
+Module: spatial_index
+Uniform grid used to look up world objects near a point or inside a rectangle.
+"""
+
+import math
+import numpy as np
+
+# Size (in world pixels) of one grid cell.
+CELL_SIZE = 2048
+
+
+class SpatialGrid:
+    def __init__(self, cell_size=CELL_SIZE):
+        """
+        Initialize an empty grid.
+
+        :param cell_size: Width and height of a grid cell in world pixels.
+        """
+        self.cell_size = cell_size
+        self.cells = {}  # (cell_x, cell_y) -> set of object indices
+        self.cell_x = np.zeros(0, dtype=np.int64)
+        self.cell_y = np.zeros(0, dtype=np.int64)
+
+    def _cells_of(self, xs, ys):
+        cell_x = np.floor_divide(np.asarray(xs, dtype=float), self.cell_size).astype(np.int64)
+        cell_y = np.floor_divide(np.asarray(ys, dtype=float), self.cell_size).astype(np.int64)
+        return cell_x, cell_y
+
+    def rebuild(self, xs, ys):
+        """
+        Insert every object from scratch.
+
+        :param xs: Array of X coordinates, indexed by object index.
+        :param ys: Array of Y coordinates, indexed by object index.
+        """
+        self.cells = {}
+        self.cell_x, self.cell_y = self._cells_of(xs, ys)
+        for index, key in enumerate(zip(self.cell_x.tolist(), self.cell_y.tolist())):
+            self.cells.setdefault(key, set()).add(index)
+
+    def update(self, xs, ys, indices=None):
+        """
+        Move objects whose cell changed since the last update.
+
+        The cell computation is vectorized; only objects that crossed a cell border
+        are touched in Python, so the cost follows the number of moves, not the object count.
+
+        :param xs: Array of X coordinates, indexed by object index.
+        :param ys: Array of Y coordinates, indexed by object index.
+        :param indices: Optional array of the only objects that may have moved.
+        :return: Number of objects that changed cell.
+        """
+        if len(xs) != len(self.cell_x):
+            self.rebuild(xs, ys)
+            return len(xs)
+        if indices is None:
+            indices = np.arange(len(xs))
+        new_x, new_y = self._cells_of(xs[indices], ys[indices])
+        changed = np.nonzero((new_x != self.cell_x[indices]) | (new_y != self.cell_y[indices]))[0]
+        moved = indices[changed]
+        new_x = new_x[changed]
+        new_y = new_y[changed]
+        for index, cell_x, cell_y in zip(moved.tolist(), new_x.tolist(), new_y.tolist()):
+            old_key = (int(self.cell_x[index]), int(self.cell_y[index]))
+            bucket = self.cells.get(old_key)
+            if bucket is not None:
+                bucket.discard(index)
+                if not bucket:
+                    del self.cells[old_key]
+            self.cells.setdefault((cell_x, cell_y), set()).add(index)
+        self.cell_x[moved] = new_x
+        self.cell_y[moved] = new_y
+        return len(moved)
+
+    def query_rect(self, left, top, right, bottom):
+        """
+        Return the indices of objects whose position lies in cells overlapping the rectangle.
+
+        The result may contain objects slightly outside the rectangle; callers that need
+        an exact test should check the positions themselves.
+        """
+        size = self.cell_size
+        result = []
+        for cx in range(math.floor(left / size), math.floor(right / size) + 1):
+            for cy in range(math.floor(top / size), math.floor(bottom / size) + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket:
+                    result.extend(bucket)
+        return result
+
+    def query_radius(self, x, y, radius):
+        """Return the indices of objects in cells overlapping the square around (x, y)."""
+        return self.query_rect(x - radius, y - radius, x + radius, y + radius)
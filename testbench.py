@@ -5,6 +5,9 @@ import random
 from classes.spaceship import Spaceship
 from ui import pre_render_star_field
 from classes.lazer import lazer_beam
+from classes.particles import particles
+
+NPC_HIT_RADIUS = 30
 
 
 def get_all_lazers(lazers):
@@ -260,7 +263,7 @@ class Theta_Pattern(MovementPattern):  # Butterfly curve pattern
 
 class npc_ship(Spaceship):
     def __init__(self, x, y, target, scale_factor=0.33):
-        super().__init__(x, y, scale_factor, "sprites/enemy1.png")
+        super().__init__(x, y, scale_factor, "sprites/enemy1.png", "sprites/enemy1.png")
         self.accuracy = 0.5
         self.target = target
         self.current_angle = 0  # Track current angle for smooth rotation
@@ -277,6 +280,15 @@ class npc_ship(Spaceship):
             "theta": Theta_Pattern("Theta", period=360)
         }
         self.current_pattern = None
+        self.health = 100
+        
+    def check_lazer_collisions(self, lazers):
+        # One hit destroys the ship
+        for lazer in lazers:
+            if lazer.collision(self, NPC_HIT_RADIUS):
+                self.health = 0
+                particles.emit_explosion(self.x, self.y)
+                break
         
     def activate_pattern(self, pattern_name, radius=400):
         for name, pattern in self.patterns.items():
@@ -371,6 +383,7 @@ RED = (255, 0, 0)
 
 # Create ship
 ship = Spaceship(WIDTH // 2, HEIGHT // 2)
+ship.lazers = []
 npc_one = npc_ship(WIDTH // 2 - 500, HEIGHT // 2 - 300, target(ship.x, ship.y))
 npc_list = []
 
@@ -402,12 +415,18 @@ while running:
         elif event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
                 running = False
+            elif event.key == pygame.K_f:
+                ship.lazers.append(lazer_beam(ship.x, ship.y, ship.angle + 90))
     
     # Handle key presses
     keys = pygame.key.get_pressed()
     
     # Update ship (only call this once)
     camera_x, camera_y = ship.update(keys, camera_x, camera_y)
+    for lazer in ship.lazers:
+        lazer.update()
+    ship.lazers = [lazer for lazer in ship.lazers if lazer.active]
+    particles.update()
     
     # Draw everything
     screen.fill(BLACK)
@@ -443,7 +462,10 @@ while running:
             npc.update(target(ship.x - camera_x, ship.y - camera_y), camera_x, camera_y)  
             npc.check_lazer_collisions(get_all_lazers(ship.lazers))
     
-    # Draw ship
+    # Draw lazers, particles and ship
+    for lazer in ship.lazers:
+        lazer.draw(screen, camera_x, camera_y)
+    particles.draw(screen, camera_x, camera_y)
     ship.draw(screen, camera_x, camera_y)
       
     
@@ -0,0 +1,73 @@
+"""
+Module: text_service
+Provides shared fonts and a bounded cache of rendered text surfaces.
+"""
+
+from collections import OrderedDict
+import pygame
+
+MAX_RENDERED_TEXTS = 512  # Rendered surfaces kept in the LRU.
+
+# Font registry: (face, size, bold) -> pygame.font.Font
+_fonts = {}
+
+# Rendered text LRU: (text, font key, color, antialias) -> Surface
+_rendered = OrderedDict()
+text_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def _font_key(font):
+    """Normalize a (face, size) or (face, size, bold) font spec."""
+    return (font[0], font[1], bool(font[2]) if len(font) > 2 else False)
+
+
+def get_font(face, size, bold=False):
+    """
+    Return the shared Font for a face, size and weight, creating it on first use.
+
+    :param face: System font name (e.g. "courier"), or None for pygame's default font.
+    :param size: Font size in points.
+    :param bold: Whether to render in bold.
+    :return: pygame.font.Font instance.
+    """
+    key = (face, size, bool(bold))
+    font = _fonts.get(key)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = pygame.font.SysFont(face, size, bold=bold)
+        _fonts[key] = font
+    return font
+
+
+def render_text(text, font, color, antialias=True):
+    """
+    Return a rendered text surface, reusing a cached one when possible.
+
+    The returned surface is shared: blit it, but do not draw on it or change its alpha.
+    Text that changes every frame (counters, timers) should be rendered with get_font() directly.
+
+    :param text: String to render.
+    :param font: Font spec tuple (face, size) or (face, size, bold).
+    :param color: Text color.
+    :param antialias: Whether to antialias the text.
+    :return: pygame.Surface with the rendered text.
+    """
+    key = (text, _font_key(font), tuple(color), antialias)
+    surface = _rendered.get(key)
+    if surface is not None:
+        _rendered.move_to_end(key)
+        text_cache_stats["hits"] += 1
+        return surface
+    text_cache_stats["misses"] += 1
+    surface = get_font(*key[1]).render(text, antialias, color)
+    _rendered[key] = surface
+    if len(_rendered) > MAX_RENDERED_TEXTS:
+        _rendered.popitem(last=False)
+        text_cache_stats["evictions"] += 1
+    return surface
+
+
+def clear_text_cache():
+    """Drop all rendered text surfaces (fonts are kept)."""
+    _rendered.clear()
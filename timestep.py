@@ -0,0 +1,78 @@
+"""
+Module: timestep
+Provides the fixed-rate simulation clock used by the game loop.
+The simulation advances in fixed ticks; rendering happens once per loop iteration and
+interpolates between the last two ticks, so a slow frame skips renders, not simulation.
+"""
+
+import time
+
+SIM_RATE = 60               # Simulation ticks per second.
+MAX_FRAME_TIME = 0.25       # Longer gaps (menus, loading hitches) are not caught up on.
+MAX_STEPS_PER_FRAME = 8     # Ticks run at most per rendered frame before time is dropped.
+
+
+class FixedTimestep:
+    def __init__(self, rate=SIM_RATE, realtime=True):
+        """
+        Initialize the simulation clock.
+
+        :param rate: Simulation ticks per second.
+        :param realtime: If False, every frame runs exactly one tick regardless of wall time,
+                         so the simulation can run headless as fast (or slow) as it is driven.
+        """
+        self.rate = rate
+        self.dt = 1.0 / rate
+        self.realtime = realtime
+        self.accumulator = 0.0
+        self.last_time = time.perf_counter()
+        self.ticks = 0
+        self.frames = 0
+        self.skipped_renders = 0  # Ticks that were simulated without a render of their own.
+        self.dropped_time = 0.0   # Seconds of wall time that were not simulated.
+
+    def resync(self):
+        """Forget the time spent outside the loop (e.g. in a blocking menu)."""
+        self.last_time = time.perf_counter()
+        self.accumulator = 0.0
+
+    def advance(self):
+        """
+        Account for the wall time since the last call.
+
+        :return: Number of simulation ticks to run before rendering this frame.
+        """
+        self.frames += 1
+        if not self.realtime:
+            self.ticks += 1
+            return 1
+
+        now = time.perf_counter()
+        elapsed = now - self.last_time
+        self.last_time = now
+        if elapsed > MAX_FRAME_TIME:
+            self.dropped_time += elapsed - MAX_FRAME_TIME
+            elapsed = MAX_FRAME_TIME
+
+        self.accumulator += elapsed
+        steps = int(self.accumulator / self.dt)
+        self.accumulator -= steps * self.dt
+        if steps > MAX_STEPS_PER_FRAME:
+            self.dropped_time += (steps - MAX_STEPS_PER_FRAME) * self.dt
+            steps = MAX_STEPS_PER_FRAME
+        if steps > 1:
+            self.skipped_renders += steps - 1
+        self.ticks += steps
+        return steps
+
+    @property
+    def alpha(self):
+        """Fraction of a tick elapsed since the last one, used to interpolate rendered positions."""
+        if not self.realtime:
+            return 1.0
+        return min(1.0, self.accumulator / self.dt)
+
+
+def lerp(previous, current, alpha):
+    """Interpolate linearly between two values."""
+    return previous + (current - previous) * alpha
@@ -4,169 +4,101 @@ Handles user interface elements such as menus, progress bars, and the mini-map.
 """
 
 import pygame
-if not pygame.font.get_init():
-    pygame.font.init()
 import os
-from utils import WIDTH, HEIGHT, WHITE, GRAY, DARK_GRAY, MINI_MAP_WIDTH, MINI_MAP_HEIGHT, STAR_FIELD_RANGE, FPS
-
-# Cache common fonts (created once when the module is loaded).
-TITLE_FONT = pygame.font.SysFont(None, 80)
-MAIN_MENU_FONT = pygame.font.SysFont(None, 60)
-BUTTON_FONT = pygame.font.SysFont(None, 40)
-PROGRESS_FONT = pygame.font.SysFont(None, 48)
-INPUT_FONT = pygame.font.SysFont(None, 72)
-PROMPT_FONT = pygame.font.SysFont(None, 60)
-SMALL_FONT = pygame.font.SysFont("arial", 16)  # Used for deep space messages
+from utils import WIDTH, HEIGHT, WHITE, DARK_GRAY, MINI_MAP_WIDTH, MINI_MAP_HEIGHT, STAR_FIELD_RANGE, FPS
+from dirty_rects import DirtyRectTracker
+from widgets import WidgetGroup, Label, Button, ButtonList, TextInput, ProgressBar
+from text_service import render_text
+from classes.sprite_cache import minimap_cache
+from quality import governor
+
+# Common fonts as (face, size) specs; the text service creates each font once, on first use.
+TITLE_FONT = (None, 80)
+MAIN_MENU_FONT = (None, 60)
+BUTTON_FONT = (None, 40)
+PROGRESS_FONT = (None, 48)
+INPUT_FONT = (None, 72)
+PROMPT_FONT = (None, 60)
+SMALL_FONT = ("arial", 16)  # Used for deep space messages
 
 # Define the world region (in game units) that the mini-map displays.
 MINIMAP_WORLD_WIDTH = 3840
 MINIMAP_WORLD_HEIGHT = 3840
 
+# Orbiting planets move even when the player does not, so the background is also refreshed on a timer.
+# Under load the quality governor also sets a minimum interval between refreshes while the player moves.
+MINI_MAP_REFRESH_MS = 500
+
 # Global variables for caching the mini-map background.
 _cached_mini_map_bg = None
 _cached_mini_map_center = None
+_cached_mini_map_time = 0
 
-def get_custom_save_name(screen):
-    """Prompt the user to enter a custom save name using cached fonts."""
-    input_box = pygame.Rect(100, HEIGHT // 2 - 50, WIDTH - 200, 100)
-    active = True
-    user_text = ""
-    clock = pygame.time.Clock()
-    prompt_text = PROMPT_FONT.render("Enter a custom save name:", True, WHITE)
-
-    while active:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN:
-                    active = False
-                elif event.key == pygame.K_BACKSPACE:
-                    user_text = user_text[:-1]
-                else:
-                    user_text += event.unicode
-
-        screen.fill((0, 0, 0))
-        prompt_rect = prompt_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 80))
-        screen.blit(prompt_text, prompt_rect)
-        pygame.draw.rect(screen, (50, 50, 50), input_box)
-        pygame.draw.rect(screen, WHITE, input_box, 2)
-        text_surface = INPUT_FONT.render(user_text, True, WHITE)
-        screen.blit(text_surface, (input_box.x + 10, input_box.y + 20))
-        pygame.display.flip()
-        clock.tick(FPS)
-    return user_text.strip()
-
-def draw_button(surface, rect, text, font, text_color=WHITE, button_color=GRAY):
-    """Draw a button with text on the given surface using a cached font."""
-    pygame.draw.rect(surface, button_color, rect)
-    pygame.draw.rect(surface, WHITE, rect, 2)
-    text_surf = font.render(text, True, text_color)
-    text_rect = text_surf.get_rect(center=rect.center)
-    surface.blit(text_surf, text_rect)
+def run_menu(screen, menu, duration=None):
+    """
+    Show a widget group until one of its widgets produces a result.
 
-def draw_progress_bar(surface, progress):
-    """Draw a progress bar to indicate loading or saving progress using a cached font."""
-    bar_width = 400
-    bar_height = 50
-    x = WIDTH // 2 - bar_width // 2
-    y = HEIGHT // 2 - bar_height // 2
-    pygame.draw.rect(surface, GRAY, (x, y, bar_width, bar_height))
-    pygame.draw.rect(surface, (0, 0, 255), (x, y, int(bar_width * progress), bar_height))
-    pygame.draw.rect(surface, WHITE, (x, y, bar_width, bar_height), 2)
-    progress_text = PROGRESS_FONT.render(f"Progress... {int(progress * 100)}%", True, WHITE)
-    text_rect = progress_text.get_rect(center=(WIDTH // 2, y - 30))
-    surface.blit(progress_text, text_rect)
+    Only widgets whose state changed are redrawn, and only their rects are sent to the display.
 
-def show_loading_screen(screen, message="Loading... Please wait"):
-    """Display a loading screen with a message using a cached font."""
+    :param menu: WidgetGroup to show.
+    :param duration: If given, return None after this many milliseconds.
+    :return: The result of the activated widget.
+    """
     clock = pygame.time.Clock()
+    tracker = DirtyRectTracker()
     start_time = pygame.time.get_ticks()
-    loading = True
-    while loading:
+    while True:
         for event in pygame.event.get():
+            tracker.handle_event(event)
             if event.type == pygame.QUIT:
                 pygame.quit()
                 exit()
-        screen.fill((0, 0, 0))
-        loading_text = PROGRESS_FONT.render(message, True, WHITE)
-        text_rect = loading_text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
-        screen.blit(loading_text, text_rect)
-        pygame.display.flip()
+            result = menu.handle_event(event)
+            if result is not None:
+                return result
+        menu.draw(screen, tracker)
+        tracker.present()
         clock.tick(FPS)
-        if (pygame.time.get_ticks() - start_time) > 1000:
-            loading = False
+        if duration is not None and pygame.time.get_ticks() - start_time > duration:
+            return None
 
-def show_main_menu(screen):
-    """Display the main menu and return the user's choice (new game or load game) using cached fonts."""
-    clock = pygame.time.Clock()
-    menu_active = True
-    choice = None
+def create_progress_bar():
+    """
+    Create the loading and saving progress bar, centered on the screen.
+    It clears the area behind its label, so it can be redrawn without clearing the screen.
+    """
+    return ProgressBar((WIDTH // 2, HEIGHT // 2), PROGRESS_FONT)
 
-    new_game_rect = pygame.Rect(WIDTH // 2 - 150, HEIGHT // 2 - 50, 300, 60)
-    load_game_rect = pygame.Rect(WIDTH // 2 - 150, HEIGHT // 2 + 30, 300, 60)
-    
-    while menu_active:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                mouse_pos = event.pos
-                if new_game_rect.collidepoint(mouse_pos):
-                    choice = "n"
-                    menu_active = False
-                elif load_game_rect.collidepoint(mouse_pos):
-                    choice = "l"
-                    menu_active = False
+def get_custom_save_name(screen):
+    """Prompt the user to enter a custom save name."""
+    menu = WidgetGroup([
+        Label("Enter a custom save name:", PROMPT_FONT, center=(WIDTH // 2, HEIGHT // 2 - 80)),
+        TextInput((100, HEIGHT // 2 - 50, WIDTH - 200, 100), INPUT_FONT),
+    ])
+    return run_menu(screen, menu)
 
-        screen.fill((0, 0, 0))
-        title_text = TITLE_FONT.render("Infinite Horizons", True, WHITE)
-        title_rect = title_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 150))
-        screen.blit(title_text, title_rect)
+def show_loading_screen(screen, message="Loading... Please wait"):
+    """Display a loading screen with a message for a second."""
+    menu = WidgetGroup([Label(message, PROGRESS_FONT, center=(WIDTH // 2, HEIGHT // 2))])
+    run_menu(screen, menu, duration=1000)
 
-        draw_button(screen, new_game_rect, "New Game", MAIN_MENU_FONT)
-        draw_button(screen, load_game_rect, "Load Game", MAIN_MENU_FONT)
-        pygame.display.flip()
-        clock.tick(FPS)
-    return choice
+def show_main_menu(screen):
+    """Display the main menu and return the user's choice (new game or load game)."""
+    menu = WidgetGroup([
+        Label("Infinite Horizons", TITLE_FONT, center=(WIDTH // 2, HEIGHT // 2 - 150)),
+        Button((WIDTH // 2 - 150, HEIGHT // 2 - 50, 300, 60), "New Game", MAIN_MENU_FONT, value="n"),
+        Button((WIDTH // 2 - 150, HEIGHT // 2 + 30, 300, 60), "Load Game", MAIN_MENU_FONT, value="l"),
+    ])
+    return run_menu(screen, menu)
 
 def show_save_selection_menu(screen, save_files):
-    """Display a menu to select a save file from the available options using a cached font."""
-    clock = pygame.time.Clock()
-    menu_active = True
-    selected_file = None
-
-    button_rects = []
-    start_y = 150
-    button_height = 50
-    spacing = 20
-    for i in range(len(save_files)):
-        rect = pygame.Rect(100, start_y + i * (button_height + spacing), WIDTH - 200, button_height)
-        button_rects.append(rect)
-    
-    while menu_active:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                mouse_pos = event.pos
-                for i, rect in enumerate(button_rects):
-                    if rect.collidepoint(mouse_pos):
-                        selected_file = save_files[i]
-                        menu_active = False
-
-        screen.fill((0, 0, 0))
-        title_text = MAIN_MENU_FONT.render("Select a Save File", True, WHITE)
-        screen.blit(title_text, (100, 50))
-        for i, rect in enumerate(button_rects):
-            label = os.path.basename(save_files[i])
-            draw_button(screen, rect, label, BUTTON_FONT)
-        pygame.display.flip()
-        clock.tick(FPS)
-    return selected_file
+    """Display a menu to select a save file from the available options."""
+    menu = WidgetGroup([
+        Label("Select a Save File", MAIN_MENU_FONT, topleft=(100, 50)),
+        ButtonList((100, 150, WIDTH - 200, HEIGHT - 200), [os.path.basename(path) for path in save_files],
+                   BUTTON_FONT, item_height=50, spacing=20, values=save_files),
+    ])
+    return run_menu(screen, menu)
 
 def create_star_field(width, height, stars, camera_offset):
     """Create a Surface with the star field drawn on it."""
@@ -200,7 +132,7 @@ def pre_render_star_field(total_width, total_height, stars):
             star_field.set_at((int(x), int(y)), WHITE)
     return star_field
 
-def pre_render_mini_map_background(center, stars, planets):
+def pre_render_mini_map_background(center, stars, catalog, star_systems=None, explored=None):
     """
     Pre-render the mini-map background for a zoomed-in section of the world.
     The region displayed is centered at 'center' (a tuple (x,y)) with dimensions defined by
@@ -225,43 +157,67 @@ def pre_render_mini_map_background(center, stars, planets):
             mini_y = world_to_mini(sy, cy, MINIMAP_WORLD_HEIGHT, MINI_MAP_HEIGHT)
             mini_map_bg.set_at((mini_x, mini_y), WHITE)
     
-    # Draw planets that are within the region extended by the margin.
+    # Draw the suns of the star systems.
     DOWNSCALE_FACTOR = 20
-    for planet in planets:
-        px, py = planet.x, planet.y
-        if (cx - MINIMAP_WORLD_WIDTH/2 - margin <= px <= cx + MINIMAP_WORLD_WIDTH/2 + margin and
-            cy - MINIMAP_WORLD_HEIGHT/2 - margin <= py <= cy + MINIMAP_WORLD_HEIGHT/2 + margin):
-            mini_x = world_to_mini(px, cx, MINIMAP_WORLD_WIDTH, MINI_MAP_WIDTH)
-            mini_y = world_to_mini(py, cy, MINIMAP_WORLD_HEIGHT, MINI_MAP_HEIGHT)
-            desired_width = max(2, int(planet.sprite.get_width() * planet.scale) // DOWNSCALE_FACTOR)
-            desired_height = max(2, int(planet.sprite.get_height() * planet.scale) // DOWNSCALE_FACTOR)
-            if (not hasattr(planet, 'cached_mini_sprite') or 
-                planet.cached_mini_sprite is None or 
-                planet.cached_mini_scale != (desired_width, desired_height)):
-                planet.cached_mini_sprite = pygame.transform.scale(planet.sprite, (desired_width, desired_height))
-                planet.cached_mini_scale = (desired_width, desired_height)
-            mini_sprite = planet.cached_mini_sprite
-            sprite_rect = mini_sprite.get_rect(center=(mini_x, mini_y))
-            mini_map_bg.blit(mini_sprite, sprite_rect)
+    if star_systems is not None:
+        for sx, sy, radius, color in zip(star_systems.star_x, star_systems.star_y,
+                                         star_systems.star_radius, star_systems.star_color):
+            if (abs(sx - cx) <= MINIMAP_WORLD_WIDTH/2 + margin and
+                abs(sy - cy) <= MINIMAP_WORLD_HEIGHT/2 + margin):
+                mini_x = world_to_mini(sx, cx, MINIMAP_WORLD_WIDTH, MINI_MAP_WIDTH)
+                mini_y = world_to_mini(sy, cy, MINIMAP_WORLD_HEIGHT, MINI_MAP_HEIGHT)
+                pygame.draw.circle(mini_map_bg, color, (mini_x, mini_y), max(2, int(radius) // DOWNSCALE_FACTOR))
+
+    # Draw planets that are within the region extended by the margin.
+    for index in catalog.indices_in_rect(cx - MINIMAP_WORLD_WIDTH/2 - margin, cy - MINIMAP_WORLD_HEIGHT/2 - margin,
+                                         cx + MINIMAP_WORLD_WIDTH/2 + margin, cy + MINIMAP_WORLD_HEIGHT/2 + margin):
+        mini_x = world_to_mini(catalog.planet_x(index), cx, MINIMAP_WORLD_WIDTH, MINI_MAP_WIDTH)
+        mini_y = world_to_mini(catalog.planet_y(index), cy, MINIMAP_WORLD_HEIGHT, MINI_MAP_HEIGHT)
+        scale = float(catalog.scale[index])
+        # Planets near the view already have a Planet view; the rest are drawn from their theme placeholder.
+        planet = catalog.views.get(index)
+        sprite = planet.sprite if planet is not None else catalog.placeholder(index)
+        desired_width = max(2, int(sprite.get_width() * scale) // DOWNSCALE_FACTOR)
+        desired_height = max(2, int(sprite.get_height() * scale) // DOWNSCALE_FACTOR)
+        if planet is None:
+            mini_sprite = minimap_cache.get_scaled(catalog.placeholder_key(index), sprite, (desired_width, desired_height))
+        else:
+            mini_sprite = planet.get_sized_sprite((desired_width, desired_height), minimap_cache)
+        sprite_rect = mini_sprite.get_rect(center=(mini_x, mini_y))
+        mini_map_bg.blit(mini_sprite, sprite_rect)
+
+    # Darken the parts of the region that have not been explored yet.
+    if explored is not None:
+        fog = explored.fog_for_region(cx - MINIMAP_WORLD_WIDTH / 2, cy - MINIMAP_WORLD_HEIGHT / 2,
+                                      MINIMAP_WORLD_WIDTH, MINIMAP_WORLD_HEIGHT, (MINI_MAP_WIDTH, MINI_MAP_HEIGHT))
+        mini_map_bg.blit(fog, (0, 0))
     
     # Draw a border.
     pygame.draw.rect(mini_map_bg, WHITE, mini_map_bg.get_rect(), 1)
     return mini_map_bg
 
-def draw_mini_map(surface, player, planets):
+def draw_mini_map(surface, player, catalog, star_systems=None, explored=None):
     """
     Draw the mini-map by using a cached background for a zoomed-in section centered on the player.
-    The cached background is updated only if the player's position changes by more than a threshold.
+    The cached background is updated only if the player's position changes by more than a threshold,
+    (at most once per the quality level's minimap interval), or every MINI_MAP_REFRESH_MS so that
+    orbiting planets keep moving on the map.
+    Unexplored areas are masked when an ExploredMap is given.
     """
-    global _cached_mini_map_bg, _cached_mini_map_center
+    global _cached_mini_map_bg, _cached_mini_map_center, _cached_mini_map_time
     center = (player.x, player.y)
     threshold = 5  # Update if player moves more than 5 units.
+    now = pygame.time.get_ticks()
+    since_refresh = now - _cached_mini_map_time
     if (_cached_mini_map_bg is None or _cached_mini_map_center is None or
-        abs(center[0] - _cached_mini_map_center[0]) > threshold or
-        abs(center[1] - _cached_mini_map_center[1]) > threshold):
+        ((abs(center[0] - _cached_mini_map_center[0]) > threshold or
+          abs(center[1] - _cached_mini_map_center[1]) > threshold) and
+         since_refresh >= governor.settings["minimap_interval_ms"]) or
+        since_refresh > MINI_MAP_REFRESH_MS):
         from utils import stars  # ensure stars are imported
-        _cached_mini_map_bg = pre_render_mini_map_background(center, stars, planets)
+        _cached_mini_map_bg = pre_render_mini_map_background(center, stars, catalog, star_systems, explored)
         _cached_mini_map_center = center
+        _cached_mini_map_time = now
 
     # Copy the cached background to overlay the dynamic player marker.
     mini_map_surface = _cached_mini_map_bg.copy()
@@ -280,8 +236,8 @@ def draw_mini_map(surface, player, planets):
         overlay = pygame.Surface((MINI_MAP_WIDTH, MINI_MAP_HEIGHT), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 150))  # dark translucent overlay
         mini_map_surface.blit(overlay, (0, 0))
-        text1 = SMALL_FONT.render("ENTERING DEEPSPACE", True, (0, 255, 0))
-        text2 = SMALL_FONT.render("NO RECORDS FOUND", True, (0, 255, 0))
+        text1 = render_text("ENTERING DEEPSPACE", SMALL_FONT, (0, 255, 0))
+        text2 = render_text("NO RECORDS FOUND", SMALL_FONT, (0, 255, 0))
         rect1 = text1.get_rect(center=(MINI_MAP_WIDTH // 2, MINI_MAP_HEIGHT // 2 - 10))
         rect2 = text2.get_rect(center=(MINI_MAP_WIDTH // 2, MINI_MAP_HEIGHT // 2 + 10))
         mini_map_surface.blit(text1, rect1)
@@ -21,9 +21,6 @@ NUM_STARS = 5000
 FPS = 60
 PLANET_COUNT = 25
 
-# Global dictionary to cache scaled sprites.
-sprite_cache = {}
-
 # Pre-generate a list of stars.
 stars = [
     (random.randint(-STAR_FIELD_RANGE, STAR_FIELD_RANGE),
@@ -57,18 +54,3 @@ def get_save_filename(custom_name=None):
         formatted = now.strftime("%m%d%y%H%M")
         filename = f"save_{formatted}"
     return os.path.join(save_dir, filename)
-
-def get_cached_sprite(original, scale):
-    """
-    Return a cached, scaled version of the original sprite.
-    If not cached, scale it, cache it, and return the result.
-
-    :param original: Original pygame.Surface.
-    :param scale: Scale factor (e.g., 1.5 for 150% size).
-    :return: Scaled pygame.Surface.
-    """
-    key = (id(original), scale)
-    if key not in sprite_cache:
-        new_size = (int(original.get_width() * scale), int(original.get_height() * scale))
-        sprite_cache[key] = pygame.transform.scale(original, new_size)
-    return sprite_cache[key]
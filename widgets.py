@@ -0,0 +1,286 @@
+"""
+Module: widgets
+Retained-mode widgets for the menus: buttons, button lists, text input, labels and progress bars.
+
+Each widget keeps its rendered surface and renders it again only when its state (hover, text,
+value) changes; a widget group then redraws just the widgets that changed and reports their
+rects for dirty-rect updates.
+"""
+
+import pygame
+from utils import WHITE, GRAY
+from text_service import get_font, render_text
+
+HOVER_GRAY = (80, 80, 80)        # Button color under the mouse
+PROGRESS_BLUE = (0, 0, 255)
+
+
+class Widget:
+    def __init__(self, rect):
+        """
+        Initialize a widget covering `rect` on the screen.
+
+        :param rect: Screen area the widget draws in; it paints all of it.
+        """
+        self.rect = pygame.Rect(rect)
+        self.surface = None  # Rendered widget, None until rendered or after its state changed
+        self.dirty = True    # Changed since it was last drawn
+
+    def invalidate(self):
+        """Render the widget again and redraw it on the next frame."""
+        self.surface = None
+        self.dirty = True
+
+    def render(self):
+        """Return a surface of the widget's size showing its current state."""
+        raise NotImplementedError
+
+    def get_surface(self):
+        """Return the rendered widget, rendering it if its state changed."""
+        if self.surface is None:
+            self.surface = self.render()
+        return self.surface
+
+    def handle_event(self, event):
+        """
+        Handle an input event.
+
+        :return: The widget's result if the event activated it (a click, Enter), otherwise None.
+        """
+        return None
+
+    def draw(self, screen, force=False):
+        """
+        Blit the widget's cached surface if it changed.
+
+        :param force: Draw even if unchanged, e.g. when the whole screen is redrawn.
+        :return: Rect drawn, or None if nothing was drawn.
+        """
+        if not (self.dirty or force):
+            return None
+        self.dirty = False
+        return screen.blit(self.get_surface(), self.rect)
+
+
+class Label(Widget):
+    def __init__(self, text, font, color=WHITE, center=None, topleft=None):
+        """
+        Initialize a line of static text.
+
+        :param font: (face, size) spec for the text service.
+        :param center: Position of the label's center; or give `topleft`.
+        """
+        self.text_surface = render_text(text, font, color)
+        rect = self.text_surface.get_rect()
+        if center is not None:
+            rect.center = center
+        else:
+            rect.topleft = topleft
+        super().__init__(rect)
+
+    def render(self):
+        return self.text_surface
+
+
+class Button(Widget):
+    def __init__(self, rect, text, font, value=None, text_color=WHITE, color=GRAY, hover_color=HOVER_GRAY):
+        """
+        Initialize a button with a centered label.
+
+        :param value: Returned by handle_event when the button is clicked; defaults to the text.
+        """
+        super().__init__(rect)
+        self.text = text
+        self.font = font
+        self.value = text if value is None else value
+        self.text_color = text_color
+        self.color = color
+        self.hover_color = hover_color
+        self.hovered = False
+
+    def render(self):
+        surface = pygame.Surface(self.rect.size)
+        surface.fill(self.hover_color if self.hovered else self.color)
+        pygame.draw.rect(surface, WHITE, surface.get_rect(), 2)
+        text_surf = render_text(self.text, self.font, self.text_color)
+        surface.blit(text_surf, text_surf.get_rect(center=surface.get_rect().center))
+        return surface
+
+    def set_hovered(self, hovered):
+        """Highlight the button, re-rendering it only if the highlight changed."""
+        if hovered != self.hovered:
+            self.hovered = hovered
+            self.invalidate()
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEMOTION:
+            self.set_hovered(self.rect.collidepoint(event.pos))
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and self.rect.collidepoint(event.pos):
+            return self.value
+        return None
+
+
+class ButtonList(Widget):
+    def __init__(self, rect, labels, font, item_height=50, spacing=20, values=None):
+        """
+        Initialize a vertical list of buttons, scrolled with the mouse wheel if it is longer than `rect`.
+
+        :param labels: Button texts.
+        :param values: Results of the buttons when clicked; defaults to the labels.
+        """
+        super().__init__(rect)
+        self.item_height = item_height
+        self.spacing = spacing
+        values = labels if values is None else values
+        self.buttons = [Button((0, 0, self.rect.width, item_height), label, font, value)
+                        for label, value in zip(labels, values)]
+        self.first = 0  # Index of the topmost visible button
+        self.visible = max(1, (self.rect.height + spacing) // (item_height + spacing))
+        self._layout()
+
+    def _layout(self):
+        """Place the visible buttons in the list's area."""
+        for i, button in enumerate(self.buttons):
+            row = i - self.first
+            button.rect.topleft = (self.rect.x, self.rect.y + row * (self.item_height + self.spacing))
+
+    def visible_buttons(self):
+        return self.buttons[self.first:self.first + self.visible]
+
+    def render(self):
+        # The buttons keep their own cached surfaces; the list just arranges them
+        surface = pygame.Surface(self.rect.size)
+        surface.fill((0, 0, 0))
+        for button in self.visible_buttons():
+            surface.blit(button.get_surface(), button.rect.move(-self.rect.x, -self.rect.y))
+            button.dirty = False
+        return surface
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEWHEEL and len(self.buttons) > self.visible:
+            first = min(max(0, self.first - event.y), len(self.buttons) - self.visible)
+            if first != self.first:
+                self.first = first
+                self._layout()
+                self.invalidate()
+            return None
+        for button in self.visible_buttons():
+            result = button.handle_event(event)
+            if result is not None:
+                return result
+        return None
+
+    def draw(self, screen, force=False):
+        if self.dirty or force:
+            return super().draw(screen, force)
+        # Only some buttons changed (hover): draw just those
+        drawn = None
+        for button in self.visible_buttons():
+            if button.dirty:
+                rect = button.draw(screen)
+                self.surface = None  # The list's own composed surface is stale now
+                drawn = rect if drawn is None else drawn.union(rect)
+        return drawn
+
+
+class TextInput(Widget):
+    def __init__(self, rect, font, text=""):
+        """
+        Initialize a single-line text box; Enter submits the text.
+
+        :param font: (face, size) spec of the typed text.
+        """
+        super().__init__(rect)
+        self.font = font
+        self.text = text
+
+    def render(self):
+        surface = pygame.Surface(self.rect.size)
+        surface.fill((50, 50, 50))
+        pygame.draw.rect(surface, WHITE, surface.get_rect(), 2)
+        text_surface = get_font(*self.font).render(self.text, True, WHITE)
+        surface.blit(text_surface, (10, 20), (0, 0, self.rect.width - 20, self.rect.height))
+        return surface
+
+    def handle_event(self, event):
+        if event.type != pygame.KEYDOWN:
+            return None
+        if event.key == pygame.K_RETURN:
+            return self.text.strip()
+        if event.key == pygame.K_BACKSPACE:
+            text = self.text[:-1]
+        else:
+            text = self.text + event.unicode
+        if text != self.text:
+            self.text = text
+            self.invalidate()
+        return None
+
+
+class ProgressBar(Widget):
+    def __init__(self, center, font, size=(400, 50), label="Progress..."):
+        """
+        Initialize a progress bar with a percentage label above it.
+
+        :param center: Center of the bar.
+        :param font: (face, size) spec of the label.
+        """
+        bar = pygame.Rect((0, 0), size)
+        bar.center = center
+        # The widget covers the label and clears behind it
+        super().__init__((bar.x - 100, bar.y - 60, bar.width + 200, bar.height + 60))
+        self.bar = bar.move(-self.rect.x, -self.rect.y)
+        self.font = font
+        self.label = label
+        self.percent = 0
+
+    def set_value(self, progress):
+        """Set the progress (0-1); the bar is only redrawn when the shown percentage changes."""
+        percent = int(progress * 100)
+        if percent != self.percent:
+            self.percent = percent
+            self.invalidate()
+
+    def render(self):
+        surface = pygame.Surface(self.rect.size)
+        surface.fill((0, 0, 0))
+        pygame.draw.rect(surface, GRAY, self.bar)
+        filled = self.bar.copy()
+        filled.width = int(self.bar.width * self.percent / 100)
+        pygame.draw.rect(surface, PROGRESS_BLUE, filled)
+        pygame.draw.rect(surface, WHITE, self.bar, 2)
+        text = render_text(f"{self.label} {self.percent}%", self.font, WHITE)
+        surface.blit(text, text.get_rect(center=(self.bar.centerx, self.bar.y - 30)))
+        return surface
+
+
+class WidgetGroup:
+    def __init__(self, widgets=(), background=(0, 0, 0)):
+        """
+        Initialize a group of widgets shown together on a plain background.
+
+        :param background: Color the screen is cleared to when the whole group is redrawn.
+        """
+        self.widgets = list(widgets)
+        self.background = background
+
+    def handle_event(self, event):
+        """Pass an event to the widgets; return the first result it produced, or None."""
+        for widget in self.widgets:
+            result = widget.handle_event(event)
+            if result is not None:
+                return result
+        return None
+
+    def draw(self, screen, tracker):
+        """
+        Draw the group: everything when the tracker wants a full frame, otherwise only the
+        widgets that changed, marking their rects on the tracker.
+        """
+        if tracker.full:
+            screen.fill(self.background)
+            for widget in self.widgets:
+                widget.draw(screen, force=True)
+        else:
+            for widget in self.widgets:
+                tracker.mark(widget.draw(screen))